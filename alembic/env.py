@@ -2,7 +2,7 @@ from logging.config import fileConfig
 from sqlalchemy import engine_from_config, pool
 from alembic import context
 from app.database import Base
-from app.models import user, audio, recipe
+from app.models import user, audio, recipe, cache, pipeline, rate_limit
 from app.config import settings
 
 # this is the Alembic Config object, which provides
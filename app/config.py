@@ -7,7 +7,113 @@ class Settings(BaseSettings):
     secret_key: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+
+    # 비밀번호 해시 설정
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 32
+    password_hash_queue_timeout_seconds: float = 5.0
     openai_api_key: str
+
+    # OpenAI API 주소 (부하 테스트 시 loadtest/mock_openai.py 주소, 없으면 api.openai.com)
+    openai_base_url: Optional[str] = None
+
+    # OpenAI HTTP 커넥션 풀 설정
+    openai_max_connections: int = 20
+    openai_max_keepalive_connections: int = 10
+    openai_keepalive_expiry_seconds: float = 30.0
+
+    # OpenAI 요청 한도 (분당 요청/토큰 수, 0이면 제한 없음)
+    # local은 프로세스마다 따로, postgres는 모든 프로세스가 한도를 공유
+    openai_rate_limit_backend: str = "local"
+    openai_chat_rpm: int = 3500
+    openai_chat_tpm: int = 90000
+    openai_transcription_rpm: int = 50
+    openai_batch_reserve_ratio: float = 0.2  # 배치 작업이 쓰지 않고 대화형 요청에 남겨 두는 몫
+    openai_queue_timeout_seconds: float = 300.0
+
+    # OpenAI 호출 제한 시간/재시도 (timeout은 시도 한 번, deadline은 재시도 포함 전체)
+    openai_chat_timeout_seconds: float = 60.0
+    openai_chat_deadline_seconds: float = 120.0
+    openai_transcription_timeout_seconds: float = 300.0
+    openai_transcription_deadline_seconds: float = 600.0
+    openai_max_retries: int = 3
+    openai_retry_base_seconds: float = 0.5
+    openai_retry_max_seconds: float = 20.0
+    # 연속 실패가 threshold번이면 reset_seconds 동안 호출을 바로 실패시킴
+    openai_circuit_failure_threshold: int = 5
+    openai_circuit_reset_seconds: float = 30.0
+    # 짧은 GPT 호출(레시피 설명 생성)이 이 시간 안에 안 끝나면 같은 요청을 하나 더 보냄 (0이면 끔)
+    openai_hedge_after_seconds: float = 0.0
+
+    # 오디오 업로드 설정
+    max_audio_upload_bytes: int = 100 * 1024 * 1024
+    upload_chunk_size: int = 1024 * 1024
+    # 이어받기 업로드 (PATCH 한 번에 받는 최대 크기, 미완료 세션 보관 기간)
+    resumable_max_chunk_bytes: int = 8 * 1024 * 1024
+    resumable_session_ttl_seconds: int = 24 * 60 * 60
+
+    # 파일 저장소 설정 (local 또는 s3)
+    storage_backend: str = "local"
+    storage_presign_expires_seconds: int = 900
+    public_base_url: str = "http://localhost:8000"  # 로컬 저장소 업로드/다운로드 URL 생성용
+    s3_bucket: Optional[str] = None
+    s3_endpoint_url: Optional[str] = None  # MinIO 등 S3 호환 저장소 주소
+    s3_region: Optional[str] = None
+    s3_access_key_id: Optional[str] = None
+    s3_secret_access_key: Optional[str] = None
+    s3_public_base_url: Optional[str] = None  # 공개 버킷/CDN 주소 (없으면 presigned GET)
+    s3_max_connections: int = 20
+
+    # 이미지 처리 설정
+    image_workers: int = 2
+    max_image_pixels: int = 40_000_000
+    # 앞단 프록시로 이미지 전송 위임 (예: X-Accel-Redirect + /protected/images/)
+    image_offload_header: Optional[str] = None
+    image_offload_prefix: str = ""
+
+    # 백그라운드 STT 작업 설정
+    stt_worker_count: int = 2
+    job_poll_interval_seconds: float = 2.0
+    job_stale_after_seconds: int = 1800  # 이 시간 동안 heartbeat가 없으면 죽은 워커의 작업으로 보고 회수
+    job_heartbeat_seconds: float = 60.0
+
+    # 업로드 -> STT -> 레시피 파이프라인 (단계별 동시 처리 수, STT 단계는 stt_worker_count)
+    pipeline_upload_concurrency: int = 8
+    pipeline_organize_workers: int = 4
+
+    # 레시피 일괄 생성 (요청당 최대 오디오 수, 동시 GPT 호출 수)
+    recipe_batch_max_items: int = 50
+    recipe_batch_concurrency: int = 4
+
+    # STT 엔진 설정 (openai 또는 local)
+    stt_backend: str = "openai"
+    local_stt_model: str = "small"
+    local_stt_compute_type: str = "int8"
+    local_stt_workers: int = 2
+    local_stt_cpu_threads: int = 4
+    local_stt_batch_size: int = 8
+
+    # 긴 녹음 분할 변환 설정
+    stt_long_audio_threshold_bytes: int = 20 * 1024 * 1024  # Whisper 업로드 한도(25MB)보다 작게
+    stt_long_audio_threshold_seconds: int = 600
+    stt_chunk_target_seconds: int = 300
+    stt_chunk_max_seconds: int = 420
+    stt_chunk_overlap_seconds: float = 2.0
+    stt_chunk_concurrency: int = 4
+
+    # 처리 상태 이벤트 (SSE)
+    sse_heartbeat_seconds: float = 15.0
+    sse_max_duration_seconds: int = 900
+    event_listener_reconnect_seconds: float = 5.0
+    event_listener_ping_seconds: float = 60.0
+
+    # 캐시 설정
+    transcript_cache_size: int = 256
+    recipe_cache_size: int = 256
+    # 다른 워커 프로세스에서 비활성화/삭제된 사용자가 최대 이 시간 동안 인증될 수 있음
+    auth_cache_ttl_seconds: int = 60
+    auth_cache_size: int = 10000
     
     class Config:
         env_file = ".env"
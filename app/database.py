@@ -1,14 +1,31 @@
+import time
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import settings
+from app.utils.metrics import DB_POOL_CHECKOUT_SECONDS, instrument_engine
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """커넥션을 얻기까지 기다린 시간을 기록하는 풀"""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - start)
+
 
 # Async engine for FastAPI
 async_engine = create_async_engine(
     settings.database_url.replace("postgresql://", "postgresql+asyncpg://"),
-    echo=True
+    echo=True,
+    poolclass=InstrumentedPool
 )
+instrument_engine(async_engine)
 
 AsyncSessionLocal = sessionmaker(
     async_engine, class_=AsyncSession, expire_on_commit=False
@@ -1,11 +1,39 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auth, audio, recipes, uploads
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from app.routers import auth, audio, recipes, uploads, storage, pipeline
+from app.services.jobs import start_workers, stop_workers
+from app.services.events import start_event_listener, stop_event_listener
+from app.services.pipeline import start_pipeline_workers, stop_pipeline_workers
+from app.services.openai_client import init_openai_client, close_openai_client
+from app.services.stt_backends import close_stt_backends
+from app.services.images import close_image_pool
+from app.utils.pagination import NEXT_CURSOR_HEADER, NEXT_OFFSET_HEADER
+from app.utils.metrics import MetricsMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 공유 클라이언트, 워커 풀, 백그라운드 워커 시작/종료
+    init_openai_client()
+    start_event_listener()
+    start_workers()
+    start_pipeline_workers()
+    yield
+    await stop_pipeline_workers()
+    await stop_workers()
+    await stop_event_listener()
+    await close_stt_backends()
+    close_image_pool()
+    await close_openai_client()
+
 
 app = FastAPI(
     title="MOMENTO API",
     description="엄마의 요리법을 음성으로 기록하고 AI로 정리하는 감성 요리 아카이빙 앱",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -14,12 +42,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, NEXT_OFFSET_HEADER, "Location", "Upload-Offset", "Upload-Length"],
 )
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(auth.router, prefix="/auth", tags=["authentication"])
 app.include_router(audio.router, prefix="/audio", tags=["audio"])
 app.include_router(recipes.router, prefix="/recipes", tags=["recipes"])
+app.include_router(pipeline.router, prefix="/pipeline", tags=["pipeline"])
 app.include_router(uploads.router)
+app.include_router(storage.router, prefix="/storage", tags=["storage"])
 
 
 @app.get("/")
@@ -29,4 +61,9 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -1,25 +1,81 @@
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Integer
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Integer, Index, JSON, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 import uuid
 from app.database import Base
 
 
 class AudioFile(Base):
     __tablename__ = "audio_files"
+    __table_args__ = (
+        # STT 작업 큐 폴링용 부분 인덱스
+        Index(
+            "ix_audio_files_job_queue",
+            "updated_at",
+            postgresql_where=text("processing_status IN ('queued', 'processing')")
+        ),
+        # 목록 키셋 페이지네이션용 복합 인덱스
+        Index("ix_audio_files_user_created_id", "user_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     file_path = Column(String, nullable=False)
     file_name = Column(String, nullable=False)
     file_size = Column(Integer, nullable=True)  # bytes
+    content_hash = Column(String(64), nullable=True, index=True)  # SHA-256 hex
     duration = Column(Integer, nullable=True)  # seconds
     transcript_text = Column(Text, nullable=True)
-    processing_status = Column(String, default="uploaded")  # uploaded, processing, completed, failed
+    processing_status = Column(String, default="uploaded")  # uploaded, queued, processing, completed, failed
+    stt_backend = Column(String, nullable=True)  # 요청별 STT 엔진 (없으면 배포 기본값)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     user = relationship("User", back_populates="audio_files")
-    recipes = relationship("Recipe", back_populates="source_audio")
\ No newline at end of file
+    recipes = relationship("Recipe", back_populates="source_audio")
+    chunks = relationship(
+        "AudioChunk",
+        back_populates="audio_file",
+        cascade="all, delete-orphan",
+        order_by="AudioChunk.chunk_index"
+    )
+
+
+class AudioChunk(Base):
+    """긴 녹음을 나눠 변환할 때의 구간별 처리 기록"""
+    __tablename__ = "audio_chunks"
+    __table_args__ = (
+        UniqueConstraint("audio_file_id", "chunk_index", name="uq_audio_chunks_file_index"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    audio_file_id = Column(UUID(as_uuid=True), ForeignKey("audio_files.id", ondelete="CASCADE"), nullable=False)
+    chunk_index = Column(Integer, nullable=False)
+    start_ms = Column(Integer, nullable=False)
+    end_ms = Column(Integer, nullable=False)
+    transcript_text = Column(Text, nullable=True)
+    status = Column(String, default="pending")  # pending, completed, failed
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    audio_file = relationship("AudioFile", back_populates="chunks")
+
+class UploadSession(Base):
+    """이어받기 가능한 오디오 업로드 (tus 방식: 생성 -> 청크 PATCH -> 완료)"""
+    __tablename__ = "upload_sessions"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    file_name = Column(String, nullable=False)
+    content_type = Column(String, nullable=True)
+    upload_length = Column(Integer, nullable=False)  # 전체 크기 (bytes)
+    upload_offset = Column(Integer, nullable=False, default=0)  # 지금까지 받은 크기
+    part_offsets = Column(JSON, nullable=False, default=list)  # 저장소에 올린 청크들의 시작 위치 (순서대로)
+    status = Column(String, default="uploading")  # uploading, completed
+    audio_file_id = Column(UUID(as_uuid=True), ForeignKey("audio_files.id", ondelete="SET NULL"), nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, DateTime, Text, JSON
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class TranscriptCache(Base):
+    __tablename__ = "transcript_cache"
+
+    # (콘텐츠 해시, STT 모델, 언어) 조합이 키
+    content_hash = Column(String(64), primary_key=True)
+    model = Column(String, primary_key=True)
+    language = Column(String, primary_key=True)
+    transcript_text = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class RecipeCache(Base):
+    __tablename__ = "recipe_cache"
+
+    # sha256(변환 텍스트, 모델, 온도, 프롬프트 버전)
+    cache_key = Column(String(64), primary_key=True)
+    recipe_data = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
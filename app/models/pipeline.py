@@ -0,0 +1,43 @@
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, JSON, Boolean, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func, text
+import uuid
+from app.database import Base
+
+
+class PipelineJob(Base):
+    """
+    업로드 -> STT -> 레시피 정리를 한 번에 처리하는 작업
+
+    STT 단계는 기존 audio_files 큐를 그대로 사용하고,
+    정리(organize) 단계는 이 테이블 자체가 큐가 된다.
+    """
+    __tablename__ = "pipeline_jobs"
+    __table_args__ = (
+        # 정리 단계 큐 폴링용 부분 인덱스
+        Index(
+            "ix_pipeline_jobs_organize_queue",
+            "stage_enqueued_at",
+            postgresql_where=text("stage = 'organize' AND status IN ('pending', 'running')")
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    audio_file_id = Column(
+        UUID(as_uuid=True), ForeignKey("audio_files.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    recipe_id = Column(UUID(as_uuid=True), ForeignKey("recipes.id", ondelete="SET NULL"), nullable=True)
+    stage = Column(String, nullable=False, default="transcribe")  # transcribe, organize, done
+    status = Column(String, nullable=False, default="pending")  # pending, running, completed, failed
+    force_regenerate = Column(Boolean, nullable=False, default=False)
+    error = Column(Text, nullable=True)
+    # 단계별 소요 시간(초): {"upload": .., "transcribe_wait": .., "transcribe": .., ...}
+    timings = Column(JSON, nullable=False, default=dict)
+    stage_enqueued_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    audio_file = relationship("AudioFile")
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, DateTime, Float
+from app.database import Base
+
+
+class OpenAIRateBucket(Base):
+    """
+    OpenAI 요청 한도 토큰 버킷 (postgres 백엔드)
+
+    모든 API 프로세스와 워커가 행을 FOR UPDATE로 잠그고 차감하므로
+    분당 요청/토큰 한도를 배포 전체가 함께 나눠 쓴다.
+    """
+    __tablename__ = "openai_rate_buckets"
+
+    name = Column(String, primary_key=True)  # chat, transcription
+    requests = Column(Float, nullable=False)  # 남은 요청 수
+    tokens = Column(Float, nullable=False)  # 남은 토큰 수
+    updated_at = Column(DateTime(timezone=True), nullable=False)  # 마지막으로 채운 시각
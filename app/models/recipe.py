@@ -1,13 +1,30 @@
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, JSON, Index, Computed
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 import uuid
 from app.database import Base
 
 
 class Recipe(Base):
     __tablename__ = "recipes"
+    __table_args__ = (
+        # 목록 키셋 페이지네이션용 복합 인덱스
+        Index("ix_recipes_user_created_id", "user_id", "created_at", "id"),
+        # 검색용 인덱스: 한국어 부분 일치/오타 대응 trigram + 단어 접두어 검색용 tsvector
+        # (pg_trgm 확장 필요)
+        Index(
+            "ix_recipes_search_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"}
+        ),
+        Index(
+            "ix_recipes_search_tsv",
+            text("to_tsvector('simple'::regconfig, search_text)"),
+            postgresql_using="gin"
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -24,9 +41,45 @@ class Recipe(Base):
     category = Column(String, nullable=True)  # "한식", "중식", "양식" 등
     image_url = Column(String, nullable=True)  # 레시피 이미지 URL
     
+    # 검색 대상 텍스트 (제목, 설명, 재료명, 조리 단계) - DB가 자동 계산
+    search_text = Column(
+        Text,
+        Computed(
+            "coalesce(title, '') || ' ' || coalesce(description, '') || ' ' || "
+            "coalesce(jsonb_path_query_array(ingredients::jsonb, '$[*].name')::text, '') || ' ' || "
+            "coalesce(jsonb_path_query_array(steps::jsonb, '$[*].instruction')::text, '')",
+            persisted=True
+        )
+    )
+    
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     user = relationship("User", back_populates="recipes")
-    source_audio = relationship("AudioFile", back_populates="recipes")
\ No newline at end of file
+    source_audio = relationship("AudioFile", back_populates="recipes")
+    ingredient_entries = relationship(
+        "RecipeIngredient",
+        back_populates="recipe",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+
+
+class RecipeIngredient(Base):
+    """재료 기반 검색용 정규화 인덱스 (Recipe.ingredients JSON에서 생성)"""
+    __tablename__ = "recipe_ingredients"
+    __table_args__ = (
+        # "이 재료들로 만들 수 있는 요리" 조회용
+        Index("ix_recipe_ingredients_user_name", "user_id", "canonical_name"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    recipe_id = Column(UUID(as_uuid=True), ForeignKey("recipes.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    canonical_name = Column(String, nullable=False)  # "다진 마늘(국산)" -> "마늘"
+    name = Column(String, nullable=False)  # 원래 표기
+    amount = Column(String, nullable=True)
+
+    # Relationships
+    recipe = relationship("Recipe", back_populates="ingredient_entries")
\ No newline at end of file
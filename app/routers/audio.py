@@ -1,14 +1,47 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
+import asyncio
+from fastapi import APIRouter, Depends, UploadFile, File, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List
+from sqlalchemy.orm import load_only
+from typing import List, Literal, Optional, Union
 from app.database import get_db
-from app.models.user import User
 from app.models.audio import AudioFile
-from app.schemas.audio import AudioFileResponse, AudioProcessRequest, AudioProcessResponse
-from app.utils.dependencies import get_current_active_user
-from app.services.storage import save_uploaded_file
-from app.services.stt import transcribe_audio, get_audio_duration
+from app.schemas.audio import (
+    AudioFileResponse,
+    AudioFileSummaryResponse,
+    AudioProcessRequest,
+    AudioProcessResponse,
+    AudioUploadUrlRequest,
+    AudioUploadCompleteRequest,
+    UploadSessionCreate,
+    UploadSessionResponse
+)
+from app.models.audio import UploadSession
+from app.schemas.storage import PresignedUploadResponse
+from app.config import settings
+from app.utils.dependencies import CurrentUser, get_current_active_user
+from app.utils.sse import SSE_HEADERS, SSE_HEARTBEAT, format_sse
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page, split_page
+from app.services.storage import save_uploaded_file, FileTooLargeError, audio_key, is_user_audio_key
+from app.services.object_storage import get_storage
+from app.services.resumable_uploads import (
+    UploadChecksumError,
+    UploadIncompleteError,
+    UploadOffsetMismatchError,
+    append_chunk,
+    cleanup_expired_sessions,
+    create_upload_session,
+    delete_upload_session,
+    finalize_upload,
+    get_upload_session,
+    verify_checksum
+)
+from app.services.stt import estimate_audio_duration
+from app.services.jobs import enqueue_transcription
+from app.services.events import subscribe, unsubscribe
+from app.services.stt_backends import get_stt_backend
 
 router = APIRouter()
 
@@ -16,7 +49,7 @@ router = APIRouter()
 @router.post("/upload", response_model=AudioFileResponse)
 async def upload_audio_file(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """오디오 파일 업로드"""
@@ -30,10 +63,10 @@ async def upload_audio_file(
     
     try:
         # 파일 저장
-        file_path, file_name, file_size = await save_uploaded_file(file, str(current_user.id))
+        file_path, file_name, file_size, content_hash = await save_uploaded_file(file, str(current_user.id))
         
         # 오디오 길이 추정
-        duration = get_audio_duration(file_path)
+        duration = estimate_audio_duration(file_size)
         
         # 데이터베이스에 저장
         audio_file = AudioFile(
@@ -41,6 +74,7 @@ async def upload_audio_file(
             file_path=file_path,
             file_name=file_name,
             file_size=file_size,
+            content_hash=content_hash,
             duration=duration,
             processing_status="uploaded"
         )
@@ -60,6 +94,11 @@ async def upload_audio_file(
             created_at=audio_file.created_at
         )
         
+    except FileTooLargeError:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Audio file is too large"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -67,13 +106,310 @@ async def upload_audio_file(
         )
 
 
-@router.post("/process", response_model=AudioProcessResponse)
+def _audio_file_response(audio_file: AudioFile) -> AudioFileResponse:
+    return AudioFileResponse(
+        id=str(audio_file.id),
+        user_id=str(audio_file.user_id),
+        file_name=audio_file.file_name,
+        file_size=audio_file.file_size,
+        duration=audio_file.duration,
+        transcript_text=audio_file.transcript_text,
+        processing_status=audio_file.processing_status,
+        created_at=audio_file.created_at
+    )
+
+
+@router.post("/upload-url", response_model=PresignedUploadResponse)
+async def create_audio_upload_url(
+    request: AudioUploadUrlRequest,
+    current_user: CurrentUser = Depends(get_current_active_user)
+):
+    """
+    저장소 직접 업로드용 URL 발급
+    
+    클라이언트는 받은 URL로 파일을 PUT한 뒤 /upload-complete로 key를 보내 등록한다.
+    """
+    
+    if not request.content_type.startswith("audio/"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only audio files are allowed"
+        )
+    
+    if request.file_size is not None and request.file_size > settings.max_audio_upload_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Audio file is too large"
+        )
+    
+    key = audio_key(str(current_user.id), request.file_name)
+    upload = get_storage().presigned_put(key, request.content_type, settings.max_audio_upload_bytes)
+    
+    return PresignedUploadResponse(key=key, **upload)
+
+
+@router.post("/upload-complete", response_model=AudioFileResponse)
+async def complete_audio_upload(
+    request: AudioUploadCompleteRequest,
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """저장소에 직접 올린 오디오 파일 등록 (같은 key로 다시 호출해도 한 번만 등록)"""
+    
+    if not is_user_audio_key(request.key, str(current_user.id)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid upload key"
+        )
+    
+    result = await db.execute(
+        select(AudioFile).where(
+            AudioFile.user_id == current_user.id,
+            AudioFile.file_path == request.key
+        )
+    )
+    audio_file = result.scalar_one_or_none()
+    if audio_file:
+        return _audio_file_response(audio_file)
+    
+    storage = get_storage()
+    file_size = await storage.size(request.key)
+    if file_size is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Uploaded file not found"
+        )
+    
+    # presigned PUT은 크기를 강제할 수 없으므로 여기서 검사
+    if file_size > settings.max_audio_upload_bytes:
+        await storage.delete(request.key)
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Audio file is too large"
+        )
+    
+    content_hash = await storage.sha256(request.key)
+    
+    audio_file = AudioFile(
+        user_id=current_user.id,
+        file_path=request.key,
+        file_name=request.file_name,
+        file_size=file_size,
+        content_hash=content_hash,
+        duration=estimate_audio_duration(file_size),
+        processing_status="uploaded"
+    )
+    
+    db.add(audio_file)
+    await db.commit()
+    await db.refresh(audio_file)
+    
+    return _audio_file_response(audio_file)
+
+
+def _upload_session_response(upload: UploadSession) -> UploadSessionResponse:
+    return UploadSessionResponse(
+        id=str(upload.id),
+        file_name=upload.file_name,
+        upload_length=upload.upload_length,
+        upload_offset=upload.upload_offset,
+        status=upload.status,
+        expires_at=upload.expires_at,
+        audio_file_id=str(upload.audio_file_id) if upload.audio_file_id else None
+    )
+
+
+_upload_not_found = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND,
+    detail="Upload session not found or expired"
+)
+
+
+@router.post("/uploads", response_model=UploadSessionResponse, status_code=status.HTTP_201_CREATED)
+async def create_resumable_upload(
+    request: UploadSessionCreate,
+    response: Response,
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    이어받기 업로드 세션 생성 (tus 방식)
+    
+    이후 PATCH /uploads/{id}로 Upload-Offset 헤더와 함께 청크를 순서대로 보내고,
+    끊기면 HEAD /uploads/{id}의 Upload-Offset부터 다시 보낸 뒤
+    POST /uploads/{id}/finalize로 AudioFile을 만든다.
+    """
+    
+    if not request.content_type.startswith("audio/"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only audio files are allowed"
+        )
+    
+    if request.upload_length <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Upload length must be positive"
+        )
+    
+    if request.upload_length > settings.max_audio_upload_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Audio file is too large"
+        )
+    
+    # 버려진 세션은 새 세션을 만들 때 조금씩 정리
+    try:
+        await cleanup_expired_sessions(db)
+    except Exception as e:
+        await db.rollback()
+        print(f"Upload session cleanup error: {e}")
+    
+    upload = await create_upload_session(
+        db,
+        current_user.id,
+        request.file_name,
+        request.content_type,
+        request.upload_length
+    )
+    
+    response.headers["Location"] = f"/audio/uploads/{upload.id}"
+    response.headers["Upload-Offset"] = "0"
+    return _upload_session_response(upload)
+
+
+@router.head("/uploads/{upload_id}")
+async def get_resumable_upload_offset(
+    upload_id: str,
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """이어서 보낼 위치 조회 (Upload-Offset / Upload-Length 헤더)"""
+    
+    upload = await get_upload_session(db, upload_id, current_user.id)
+    if not upload:
+        raise _upload_not_found
+    
+    return Response(headers={
+        "Upload-Offset": str(upload.upload_offset),
+        "Upload-Length": str(upload.upload_length),
+        "Cache-Control": "no-store"
+    })
+
+
+@router.patch("/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def upload_resumable_chunk(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset"),
+    upload_checksum: Optional[str] = Header(None, alias="Upload-Checksum"),
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    청크 업로드 (본문 전체가 청크 내용)
+    
+    Upload-Checksum("sha256 <base64>")이 있으면 기록 전에 검증한다.
+    응답의 Upload-Offset이 다음 청크의 시작 위치다.
+    """
+    
+    # 본문은 세션을 잠그기 전에 받아 둠 (느린 네트워크 동안 행 잠금을 잡지 않도록)
+    chunks = []
+    received = 0
+    async for part in request.stream():
+        received += len(part)
+        if received > settings.resumable_max_chunk_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Chunk exceeds {settings.resumable_max_chunk_bytes} bytes"
+            )
+        chunks.append(part)
+    data = b"".join(chunks)
+    
+    try:
+        verify_checksum(upload_checksum, data)
+    except UploadChecksumError as e:
+        # tus 프로토콜의 체크섬 불일치 상태 코드
+        raise HTTPException(status_code=460, detail=str(e))
+    
+    upload = await get_upload_session(db, upload_id, current_user.id, for_update=True)
+    if not upload:
+        raise _upload_not_found
+    
+    if upload.status != "uploading":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Upload is already finalized"
+        )
+    
+    if upload_offset + len(data) > upload.upload_length:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Chunk exceeds declared upload length"
+        )
+    
+    try:
+        new_offset = await append_chunk(db, upload, upload_offset, data)
+    except UploadOffsetMismatchError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload-Offset mismatch, expected {e.expected}",
+            headers={"Upload-Offset": str(e.expected)}
+        )
+    
+    return Response(
+        status_code=status.HTTP_204_NO_CONTENT,
+        headers={"Upload-Offset": str(new_offset)}
+    )
+
+
+@router.post("/uploads/{upload_id}/finalize", response_model=AudioFileResponse)
+async def finalize_resumable_upload(
+    upload_id: str,
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """다 받은 업로드로 AudioFile 생성 (다시 호출해도 같은 AudioFile 반환)"""
+    
+    upload = await get_upload_session(db, upload_id, current_user.id, for_update=True)
+    if not upload:
+        raise _upload_not_found
+    
+    try:
+        audio_file = await finalize_upload(db, upload)
+    except UploadIncompleteError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+            headers={"Upload-Offset": str(upload.upload_offset)}
+        )
+    
+    return _audio_file_response(audio_file)
+
+
+@router.delete("/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def cancel_resumable_upload(
+    upload_id: str,
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """진행 중인 업로드 취소"""
+    
+    upload = await get_upload_session(db, upload_id, current_user.id, for_update=True)
+    if not upload:
+        raise _upload_not_found
+    
+    await delete_upload_session(db, upload)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post("/process", response_model=AudioProcessResponse, status_code=status.HTTP_202_ACCEPTED)
 async def process_audio_file(
     request: AudioProcessRequest,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """오디오 파일을 STT로 처리"""
+    """오디오 파일 STT 처리 작업 등록 (결과는 /{audio_id}/transcript로 조회)"""
     
     # 오디오 파일 조회
     result = await db.execute(
@@ -90,63 +426,72 @@ async def process_audio_file(
             detail="Audio file not found"
         )
     
-    if audio_file.processing_status == "processing":
+    if audio_file.processing_status in ("queued", "processing"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Audio file is already being processed"
         )
     
-    try:
-        # 처리 상태 업데이트
-        audio_file.processing_status = "processing"
-        await db.commit()
-        
-        # STT 처리
-        transcript_text = await transcribe_audio(audio_file.file_path)
-        
-        if not transcript_text:
-            audio_file.processing_status = "failed"
-            await db.commit()
+    if request.stt_backend is not None:
+        try:
+            get_stt_backend(request.stt_backend)
+        except ValueError:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to transcribe audio"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"STT backend not available: {request.stt_backend}"
             )
-        
-        # 결과 저장
-        audio_file.transcript_text = transcript_text
-        audio_file.processing_status = "completed"
-        await db.commit()
-        
-        return AudioProcessResponse(
-            audio_id=str(audio_file.id),
-            transcript_text=transcript_text,
-            processing_status="completed"
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        audio_file.processing_status = "failed"
-        await db.commit()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Processing failed: {str(e)}"
-        )
+    
+    # STT 작업 큐에 등록
+    await enqueue_transcription(db, audio_file, request.stt_backend)
+    
+    return AudioProcessResponse(
+        audio_id=str(audio_file.id),
+        transcript_text=None,
+        processing_status=audio_file.processing_status
+    )
 
 
-@router.get("/", response_model=List[AudioFileResponse])
+@router.get("/", response_model=Union[List[AudioFileResponse], List[AudioFileSummaryResponse]])
 async def get_user_audio_files(
-    current_user: User = Depends(get_current_active_user),
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    view: Literal["full", "summary"] = "full",
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """사용자의 오디오 파일 목록 조회"""
+    """
+    사용자의 오디오 파일 목록 조회 (다음 페이지 커서는 X-Next-Cursor 헤더)
     
-    result = await db.execute(
-        select(AudioFile)
-        .where(AudioFile.user_id == current_user.id)
-        .order_by(AudioFile.created_at.desc())
-    )
-    audio_files = result.scalars().all()
+    view=summary이면 변환 텍스트를 읽지 않고 요약 형태로 반환
+    """
+    
+    query = select(AudioFile).where(AudioFile.user_id == current_user.id)
+    if view == "summary":
+        query = query.options(
+            load_only(
+                AudioFile.id,
+                AudioFile.file_name,
+                AudioFile.duration,
+                AudioFile.processing_status,
+                AudioFile.created_at
+            )
+        )
+    
+    result = await db.execute(keyset_page(query, AudioFile, cursor, limit))
+    audio_files = split_page(result.scalars().all(), limit, response)
+    
+    if view == "summary":
+        return [
+            AudioFileSummaryResponse(
+                id=str(af.id),
+                file_name=af.file_name,
+                duration=af.duration,
+                processing_status=af.processing_status,
+                created_at=af.created_at
+            )
+            for af in audio_files
+        ]
     
     return [
         AudioFileResponse(
@@ -166,7 +511,7 @@ async def get_user_audio_files(
 @router.get("/{audio_id}/transcript")
 async def get_audio_transcript(
     audio_id: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """오디오 파일의 변환된 텍스트 조회"""
@@ -189,4 +534,69 @@ async def get_audio_transcript(
         "audio_id": str(audio_file.id),
         "transcript_text": audio_file.transcript_text,
         "processing_status": audio_file.processing_status
-    }
\ No newline at end of file
+    }
+
+@router.get("/{audio_id}/events")
+async def stream_audio_events(
+    audio_id: str,
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    처리 상태 변화를 Server-Sent Events로 전달 (폴링 대신 사용)
+    
+    연결하면 현재 상태를 status 이벤트로 먼저 보내고, 이후
+    status(queued/processing/completed/failed), progress(긴 녹음 구간 진행률),
+    recipe_ready 이벤트를 보낸다. 연결은 최대 sse_max_duration_seconds 동안 유지되며
+    끊기면 다시 연결하면 된다.
+    """
+    
+    # 현재 상태를 읽기 전에 구독해야 그 사이의 변화를 놓치지 않음
+    queue = subscribe(audio_id)
+    
+    try:
+        result = await db.execute(
+            select(AudioFile.id, AudioFile.processing_status).where(
+                AudioFile.id == audio_id,
+                AudioFile.user_id == current_user.id
+            )
+        )
+        row = result.one_or_none()
+    except BaseException:
+        unsubscribe(audio_id, queue)
+        raise
+    
+    # 스트리밍하는 동안 DB 커넥션을 잡고 있지 않도록 바로 반환
+    await db.close()
+    
+    if row is None:
+        unsubscribe(audio_id, queue)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Audio file not found"
+        )
+    
+    async def event_stream():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.sse_max_duration_seconds
+        try:
+            yield format_sse("status", {"audio_id": audio_id, "type": "status", "status": row.processing_status})
+            while loop.time() < deadline:
+                timeout = min(settings.sse_heartbeat_seconds, deadline - loop.time())
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    # 프록시가 유휴 연결을 끊지 않도록 주석 줄 전송
+                    yield SSE_HEARTBEAT
+                    continue
+                yield format_sse(event["type"], event)
+        finally:
+            unsubscribe(audio_id, queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+        # 스트림이 시작되기 전에 끊긴 경우에도 구독 해제
+        background=BackgroundTask(unsubscribe, audio_id, queue)
+    )
@@ -6,14 +6,27 @@ from sqlalchemy import select
 from app.database import get_db
 from app.models.user import User
 from app.schemas.auth import UserCreate, UserLogin, UserResponse, Token
-from app.utils.security import verify_password, get_password_hash, create_access_token
-from app.utils.dependencies import get_current_active_user
+from app.utils.security import (
+    get_password_hash_async,
+    verify_and_update_password,
+    create_access_token,
+    PasswordHashBusyError
+)
+from app.utils.dependencies import CurrentUser, get_current_active_user
 from app.config import settings
 
 router = APIRouter()
 security = HTTPBearer()
 
 
+def _hash_busy_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many concurrent sign-in requests, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/signup", response_model=UserResponse)
 async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
     # Check if user already exists
@@ -25,7 +38,11 @@ async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user.password)
+    try:
+        hashed_password = await get_password_hash_async(user.password)
+    except PasswordHashBusyError:
+        raise _hash_busy_exception()
+    
     db_user = User(
         email=user.email,
         password_hash=hashed_password,
@@ -49,13 +66,27 @@ async def login_for_access_token(user_credentials: UserLogin, db: AsyncSession =
     result = await db.execute(select(User).where(User.email == user_credentials.email))
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(user_credentials.password, user.password_hash):
+    verified, new_hash = False, None
+    if user:
+        try:
+            verified, new_hash = await verify_and_update_password(
+                user_credentials.password, user.password_hash
+            )
+        except PasswordHashBusyError:
+            raise _hash_busy_exception()
+    
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # work factor가 바뀐 해시는 로그인 시 새 설정으로 다시 저장
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+    
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
         data={"sub": str(user.id)}, expires_delta=access_token_expires
@@ -65,7 +96,7 @@ async def login_for_access_token(user_credentials: UserLogin, db: AsyncSession =
 
 
 @router.get("/me", response_model=UserResponse)
-async def read_users_me(current_user: User = Depends(get_current_active_user)):
+async def read_users_me(current_user: CurrentUser = Depends(get_current_active_user)):
     return UserResponse(
         id=str(current_user.id),
         email=current_user.email,
@@ -0,0 +1,144 @@
+import time
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.database import get_db
+from app.models.audio import AudioFile
+from app.models.pipeline import PipelineJob
+from app.schemas.pipeline import PipelineJobResponse
+from app.utils.dependencies import CurrentUser, get_current_active_user
+from app.services.storage import stage_uploaded_file, store_staged_file, FileTooLargeError
+from app.services.stt import estimate_audio_duration
+from app.services.stt_backends import get_stt_backend
+from app.services.jobs import enqueue_transcription
+from app.services.pipeline import record_stage_time, upload_slots
+
+router = APIRouter()
+
+
+def _pipeline_job_response(job: PipelineJob) -> PipelineJobResponse:
+    return PipelineJobResponse(
+        id=str(job.id),
+        audio_id=str(job.audio_file_id),
+        recipe_id=str(job.recipe_id) if job.recipe_id else None,
+        stage=job.stage,
+        status=job.status,
+        error=job.error,
+        timings=job.timings or {},
+        created_at=job.created_at,
+        updated_at=job.updated_at
+    )
+
+
+@router.post("/", response_model=PipelineJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_pipeline(
+    file: UploadFile = File(...),
+    stt_backend: Optional[str] = Form(None),
+    force_regenerate: bool = Form(False),
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    오디오 업로드부터 레시피 정리까지 한 번에 처리
+    
+    파일을 저장한 뒤 바로 작업 ID를 반환하고, STT와 레시피 정리는 단계별 큐에서
+    이어서 처리된다. 진행 상황은 GET /pipeline/{job_id} 또는
+    /audio/{audio_id}/events(SSE)로 확인한다.
+    """
+    
+    # 파일 타입 검증
+    if not file.content_type or not file.content_type.startswith("audio/"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only audio files are allowed"
+        )
+    
+    if stt_backend is not None:
+        try:
+            get_stt_backend(stt_backend)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"STT backend not available: {stt_backend}"
+            )
+    
+    # 본문 수신은 슬롯 밖에서 임시 파일로 받아둠 (느린 클라이언트가 슬롯을 붙잡지 않도록)
+    receive_start = time.perf_counter()
+    try:
+        temp_path, file_size = await stage_uploaded_file(file)
+    except FileTooLargeError:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Audio file is too large"
+        )
+    
+    # 해시 계산과 저장소 업로드만 동시 처리 수 제한
+    wait_start = time.perf_counter()
+    try:
+        async with upload_slots():
+            upload_start = time.perf_counter()
+            file_path, file_name, content_hash = await store_staged_file(
+                temp_path, str(current_user.id), file.filename, file.content_type
+            )
+    except BaseException:
+        # 슬롯을 기다리다 취소된 경우에도 임시 파일을 남기지 않음
+        temp_path.unlink(missing_ok=True)
+        raise
+    upload_end = time.perf_counter()
+    
+    audio_file = AudioFile(
+        user_id=current_user.id,
+        file_path=file_path,
+        file_name=file_name,
+        file_size=file_size,
+        content_hash=content_hash,
+        duration=estimate_audio_duration(file_size),
+        processing_status="uploaded"
+    )
+    db.add(audio_file)
+    await db.flush()
+    
+    job = PipelineJob(
+        user_id=current_user.id,
+        audio_file_id=audio_file.id,
+        stage="transcribe",
+        status="pending",
+        force_regenerate=force_regenerate,
+        timings={}
+    )
+    record_stage_time(job, "upload", "receive", wait_start - receive_start)
+    record_stage_time(job, "upload", "wait", upload_start - wait_start)
+    record_stage_time(job, "upload", "run", upload_end - upload_start)
+    db.add(job)
+    
+    # STT 단계 큐에 등록 (AudioFile과 작업이 함께 커밋됨)
+    await enqueue_transcription(db, audio_file, stt_backend)
+    await db.refresh(job)
+    
+    return _pipeline_job_response(job)
+
+
+@router.get("/{job_id}", response_model=PipelineJobResponse)
+async def get_pipeline_job(
+    job_id: str,
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """파이프라인 작업 상태와 단계별 소요 시간 조회"""
+    
+    result = await db.execute(
+        select(PipelineJob).where(
+            PipelineJob.id == job_id,
+            PipelineJob.user_id == current_user.id
+        )
+    )
+    job = result.scalar_one_or_none()
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Pipeline job not found"
+        )
+    
+    return _pipeline_job_response(job)
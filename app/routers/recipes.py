@@ -1,14 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
-from app.database import get_db
-from app.models.user import User
+from sqlalchemy import select, func
+from sqlalchemy.orm import load_only
+import uuid
+from typing import Dict, List, Literal, Optional, Union
+from app.config import settings
+from app.database import AsyncSessionLocal, get_db
 from app.models.audio import AudioFile
-from app.models.recipe import Recipe
-from app.schemas.recipe import RecipeCreate, RecipeResponse, RecipeUpdate
-from app.utils.dependencies import get_current_active_user
-from app.services.gpt import organize_recipe_from_text, improve_recipe_description
+from app.models.recipe import Recipe, RecipeIngredient
+from app.schemas.recipe import (
+    RecipeCreate,
+    RecipeBatchCreate,
+    RecipeBatchItemResult,
+    RecipeBatchResponse,
+    RecipeResponse,
+    RecipeSummaryResponse,
+    RecipeSearchResult,
+    RecipeIngredientMatch,
+    RecipeUpdate
+)
+from app.utils.dependencies import CurrentUser, get_current_active_user
+from app.services.search import recipe_search_query
+from app.services.ingredients import canonicalize_ingredient_names, replace_recipe_ingredients
+from app.services.recipes import build_recipe, organize_recipes
+from app.services.events import publish_event
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    MAX_SEARCH_OFFSET,
+    NEXT_OFFSET_HEADER,
+    keyset_page,
+    split_page
+)
+from app.services.gpt import organize_recipe_from_text, improve_recipe_description, stream_recipe_from_text
+from app.utils.sse import SSE_HEADERS, format_sse
 
 router = APIRouter()
 
@@ -16,7 +42,7 @@ router = APIRouter()
 @router.post("/", response_model=RecipeResponse)
 async def create_recipe_from_audio(
     recipe_data: RecipeCreate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """오디오 파일로부터 레시피 생성"""
@@ -44,7 +70,10 @@ async def create_recipe_from_audio(
     
     try:
         # GPT로 레시피 정리
-        organized_recipe = await organize_recipe_from_text(audio_file.transcript_text)
+        organized_recipe = await organize_recipe_from_text(
+            audio_file.transcript_text,
+            force_refresh=recipe_data.force_regenerate
+        )
         
         if not organized_recipe:
             raise HTTPException(
@@ -52,22 +81,12 @@ async def create_recipe_from_audio(
                 detail="Failed to organize recipe"
             )
         
-        # 레시피 생성
-        recipe = Recipe(
-            user_id=current_user.id,
-            source_audio_id=audio_file.id,
-            title=organized_recipe.get("title", "정리된 레시피"),
-            description=organized_recipe.get("description"),
-            ingredients=organized_recipe.get("ingredients"),
-            steps=organized_recipe.get("steps"),
-            tips=organized_recipe.get("tips"),
-            servings=organized_recipe.get("servings"),
-            cooking_time=organized_recipe.get("cooking_time"),
-            difficulty=organized_recipe.get("difficulty"),
-            category=organized_recipe.get("category")
-        )
+        # 레시피 생성 (재료 인덱스 포함)
+        recipe = build_recipe(current_user.id, audio_file.id, organized_recipe)
         
         db.add(recipe)
+        await db.flush()
+        await publish_event(db, audio_file.id, "recipe_ready", recipe_id=str(recipe.id))
         await db.commit()
         await db.refresh(recipe)
         
@@ -96,19 +115,256 @@ async def create_recipe_from_audio(
         )
 
 
-@router.get("/", response_model=List[RecipeResponse])
-async def get_user_recipes(
-    current_user: User = Depends(get_current_active_user),
+@router.post("/stream")
+async def create_recipe_from_audio_stream(
+    recipe_data: RecipeCreate,
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """사용자의 레시피 목록 조회"""
+    """
+    오디오 파일로부터 레시피 생성 (Server-Sent Events 스트리밍)
     
+    GPT 응답이 생성되는 동안 title, field, ingredient, step 이벤트를 차례로 보내고,
+    레시피를 저장한 뒤 저장된 레시피(RecipeResponse)를 done 이벤트로 보낸다.
+    실패하면 error 이벤트를 보내고 종료한다.
+    """
+    
+    # 오디오 파일 조회
     result = await db.execute(
-        select(Recipe)
-        .where(Recipe.user_id == current_user.id)
-        .order_by(Recipe.created_at.desc())
+        select(AudioFile.id, AudioFile.transcript_text).where(
+            AudioFile.id == recipe_data.source_audio_id,
+            AudioFile.user_id == current_user.id
+        )
+    )
+    audio_file = result.one_or_none()
+    
+    if not audio_file:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Audio file not found"
+        )
+    
+    if not audio_file.transcript_text:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Audio file has not been transcribed yet"
+        )
+    
+    # GPT 응답을 기다리는 동안 DB 커넥션을 잡고 있지 않도록 반환
+    await db.close()
+    user_id = current_user.id
+    
+    async def event_stream():
+        organized_recipe = None
+        async for event in stream_recipe_from_text(
+            audio_file.transcript_text,
+            force_refresh=recipe_data.force_regenerate
+        ):
+            if event["type"] == "recipe":
+                organized_recipe = event["recipe"]
+                continue
+            yield format_sse(event["type"], event)
+            if event["type"] == "error":
+                return
+        
+        try:
+            # 레시피 생성 (재료 인덱스 포함)
+            async with AsyncSessionLocal() as session:
+                recipe = build_recipe(user_id, audio_file.id, organized_recipe)
+                session.add(recipe)
+                await session.flush()
+                await publish_event(session, audio_file.id, "recipe_ready", recipe_id=str(recipe.id))
+                await session.commit()
+                await session.refresh(recipe)
+        except Exception as e:
+            print(f"Recipe save error: {e}")
+            yield format_sse("error", {"type": "error", "message": "Failed to save recipe"})
+            return
+        
+        response = RecipeResponse(
+            id=str(recipe.id),
+            user_id=str(recipe.user_id),
+            source_audio_id=str(recipe.source_audio_id) if recipe.source_audio_id else None,
+            title=recipe.title,
+            description=recipe.description,
+            ingredients=recipe.ingredients,
+            steps=recipe.steps,
+            tips=recipe.tips,
+            servings=recipe.servings,
+            cooking_time=recipe.cooking_time,
+            difficulty=recipe.difficulty,
+            category=recipe.category,
+            image_url=recipe.image_url,
+            created_at=recipe.created_at,
+            updated_at=recipe.updated_at
+        )
+        yield format_sse("done", {"type": "done", "recipe": response.model_dump(mode="json")})
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@router.post("/batch", response_model=RecipeBatchResponse)
+async def create_recipes_from_audio_batch(
+    batch_data: RecipeBatchCreate,
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    여러 오디오 파일로부터 레시피 일괄 생성
+    
+    오디오는 한 번의 쿼리로 불러오고, GPT 정리는 recipe_batch_concurrency만큼 동시에 실행한 뒤
+    성공한 레시피를 한 트랜잭션으로 저장한다. 결과는 요청한 순서대로 항목별 성공/실패를 담는다.
+    """
+    
+    # 중복 제거 (요청 순서 유지)
+    source_audio_ids = list(dict.fromkeys(batch_data.source_audio_ids))
+    if len(source_audio_ids) > settings.recipe_batch_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.recipe_batch_max_items} audio files per batch"
+        )
+    
+    # 형식이 잘못된 ID는 조회하지 않고 없는 오디오로 처리
+    parsed_ids: Dict[str, Optional[uuid.UUID]] = {}
+    for audio_id in source_audio_ids:
+        try:
+            parsed_ids[audio_id] = uuid.UUID(audio_id)
+        except ValueError:
+            parsed_ids[audio_id] = None
+    
+    # 오디오 파일 일괄 조회
+    transcripts: Dict[uuid.UUID, Optional[str]] = {}
+    valid_ids = [parsed for parsed in parsed_ids.values() if parsed is not None]
+    if valid_ids:
+        result = await db.execute(
+            select(AudioFile.id, AudioFile.transcript_text).where(
+                AudioFile.id.in_(valid_ids),
+                AudioFile.user_id == current_user.id
+            )
+        )
+        transcripts = {row.id: row.transcript_text for row in result}
+    
+    # GPT 응답을 기다리는 동안 DB 커넥션을 잡고 있지 않도록 반환
+    await db.close()
+    
+    errors: Dict[str, str] = {}
+    ready_ids = []
+    for audio_id, parsed in parsed_ids.items():
+        if parsed not in transcripts:
+            errors[audio_id] = "Audio file not found"
+        elif not transcripts[parsed]:
+            errors[audio_id] = "Audio file has not been transcribed yet"
+        else:
+            ready_ids.append(audio_id)
+    
+    organized_recipes = await organize_recipes(
+        [transcripts[parsed_ids[audio_id]] for audio_id in ready_ids],
+        force_refresh=batch_data.force_regenerate
+    )
+    
+    recipes: Dict[str, Recipe] = {}
+    for audio_id, organized_recipe in zip(ready_ids, organized_recipes):
+        if organized_recipe:
+            recipes[audio_id] = build_recipe(current_user.id, parsed_ids[audio_id], organized_recipe)
+        else:
+            errors[audio_id] = "Failed to organize recipe"
+    
+    if recipes:
+        try:
+            # 성공한 레시피를 한 트랜잭션으로 저장 (재료 인덱스 포함)
+            db.add_all(recipes.values())
+            await db.flush()
+            for recipe in recipes.values():
+                await publish_event(db, recipe.source_audio_id, "recipe_ready", recipe_id=str(recipe.id))
+            await db.commit()
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to create recipes: {str(e)}"
+            )
+        
+        # created_at 등 DB 기본값을 레시피마다 refresh하지 않고 한 번에 다시 읽음
+        await db.execute(
+            select(Recipe)
+            .where(Recipe.id.in_([recipe.id for recipe in recipes.values()]))
+            .execution_options(populate_existing=True)
+        )
+    
+    results = []
+    for audio_id in source_audio_ids:
+        recipe = recipes.get(audio_id)
+        if recipe is None:
+            results.append(RecipeBatchItemResult(
+                source_audio_id=audio_id,
+                status="failed",
+                error=errors[audio_id]
+            ))
+            continue
+        
+        results.append(RecipeBatchItemResult(
+            source_audio_id=audio_id,
+            status="created",
+            recipe=RecipeResponse(
+                id=str(recipe.id),
+                user_id=str(recipe.user_id),
+                source_audio_id=str(recipe.source_audio_id) if recipe.source_audio_id else None,
+                title=recipe.title,
+                description=recipe.description,
+                ingredients=recipe.ingredients,
+                steps=recipe.steps,
+                tips=recipe.tips,
+                servings=recipe.servings,
+                cooking_time=recipe.cooking_time,
+                difficulty=recipe.difficulty,
+                category=recipe.category,
+                image_url=recipe.image_url,
+                created_at=recipe.created_at,
+                updated_at=recipe.updated_at
+            )
+        ))
+    
+    return RecipeBatchResponse(
+        created_count=len(recipes),
+        failed_count=len(results) - len(recipes),
+        results=results
     )
-    recipes = result.scalars().all()
+
+
+@router.get("/", response_model=Union[List[RecipeResponse], List[RecipeSummaryResponse]])
+async def get_user_recipes(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    view: Literal["full", "summary"] = "full",
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    사용자의 레시피 목록 조회 (다음 페이지 커서는 X-Next-Cursor 헤더)
+    
+    view=summary이면 목록 화면에 필요한 컬럼만 조회해 요약 형태로 반환
+    """
+    
+    query = select(Recipe).where(Recipe.user_id == current_user.id)
+    if view == "summary":
+        query = query.options(
+            load_only(Recipe.id, Recipe.title, Recipe.category, Recipe.image_url, Recipe.created_at)
+        )
+    
+    result = await db.execute(keyset_page(query, Recipe, cursor, limit))
+    recipes = split_page(result.scalars().all(), limit, response)
+    
+    if view == "summary":
+        return [
+            RecipeSummaryResponse(
+                id=str(recipe.id),
+                title=recipe.title,
+                category=recipe.category,
+                image_url=recipe.image_url,
+                created_at=recipe.created_at
+            )
+            for recipe in recipes
+        ]
     
     return [
         RecipeResponse(
@@ -132,10 +388,126 @@ async def get_user_recipes(
     ]
 
 
+@router.get("/search", response_model=List[RecipeSearchResult])
+async def search_recipes(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0, le=MAX_SEARCH_OFFSET),
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    레시피 검색 (제목, 설명, 재료명, 조리 단계)
+    
+    관련도 순으로 정렬되며 다음 페이지 offset은 X-Next-Offset 헤더로 전달
+    """
+    
+    result = await db.execute(recipe_search_query(current_user.id, q.strip(), limit, offset))
+    rows = result.all()
+    
+    if len(rows) > limit:
+        response.headers[NEXT_OFFSET_HEADER] = str(offset + limit)
+    
+    return [
+        RecipeSearchResult(
+            id=str(recipe.id),
+            title=recipe.title,
+            category=recipe.category,
+            image_url=recipe.image_url,
+            created_at=recipe.created_at,
+            score=score
+        )
+        for recipe, score in rows[:limit]
+    ]
+
+
+@router.get("/by-ingredients", response_model=List[RecipeIngredientMatch])
+async def find_recipes_by_ingredients(
+    ingredients: List[str] = Query(..., min_length=1, max_length=30),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    가진 재료로 만들 수 있는 레시피 조회
+    
+    겹치는 재료가 많은 순, 같으면 부족한 재료가 적은 순으로 정렬
+    """
+    
+    names = canonicalize_ingredient_names(ingredients)
+    if not names:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No valid ingredient names"
+        )
+    
+    # 재료가 하나라도 겹치는 레시피 (user_id, canonical_name 인덱스 사용)
+    candidate_ids = (
+        select(RecipeIngredient.recipe_id)
+        .where(
+            RecipeIngredient.user_id == current_user.id,
+            RecipeIngredient.canonical_name.in_(names)
+        )
+    )
+    matched = func.count().filter(RecipeIngredient.canonical_name.in_(names))
+    total = func.count()
+    
+    result = await db.execute(
+        select(RecipeIngredient.recipe_id, matched.label("matched"), total.label("total"))
+        .where(RecipeIngredient.recipe_id.in_(candidate_ids))
+        .group_by(RecipeIngredient.recipe_id)
+        .order_by(matched.desc(), (total - matched).asc())
+        .limit(limit)
+    )
+    ranking = result.all()
+    if not ranking:
+        return []
+    
+    recipe_ids = [row.recipe_id for row in ranking]
+    
+    recipes_result = await db.execute(
+        select(Recipe)
+        .options(load_only(Recipe.id, Recipe.title, Recipe.category, Recipe.image_url, Recipe.created_at))
+        .where(Recipe.id.in_(recipe_ids))
+    )
+    recipes = {recipe.id: recipe for recipe in recipes_result.scalars().all()}
+    
+    entries_result = await db.execute(
+        select(RecipeIngredient.recipe_id, RecipeIngredient.canonical_name, RecipeIngredient.name)
+        .where(RecipeIngredient.recipe_id.in_(recipe_ids))
+    )
+    entries = {}
+    for recipe_id, canonical_name, name in entries_result.all():
+        entries.setdefault(recipe_id, []).append((canonical_name, name))
+    
+    matches = []
+    for row in ranking:
+        recipe = recipes.get(row.recipe_id)
+        if recipe is None:
+            continue
+        recipe_entries = entries.get(recipe.id, [])
+        matches.append(
+            RecipeIngredientMatch(
+                id=str(recipe.id),
+                title=recipe.title,
+                category=recipe.category,
+                image_url=recipe.image_url,
+                created_at=recipe.created_at,
+                matched_count=row.matched,
+                total_count=row.total,
+                matched_ingredients=[name for canonical, name in recipe_entries if canonical in names],
+                missing_ingredients=[name for canonical, name in recipe_entries if canonical not in names]
+            )
+        )
+    
+    return matches
+
+
 @router.get("/{recipe_id}", response_model=RecipeResponse)
 async def get_recipe(
     recipe_id: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """특정 레시피 상세 조회"""
@@ -176,7 +548,7 @@ async def get_recipe(
 async def update_recipe(
     recipe_id: str,
     recipe_update: RecipeUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """레시피 수정"""
@@ -200,6 +572,10 @@ async def update_recipe(
     for field, value in update_data.items():
         setattr(recipe, field, value)
     
+    # 재료가 바뀌면 재료 인덱스도 갱신
+    if "ingredients" in update_data:
+        await replace_recipe_ingredients(db, recipe)
+    
     await db.commit()
     await db.refresh(recipe)
     
@@ -224,7 +600,7 @@ async def update_recipe(
 @router.delete("/{recipe_id}")
 async def delete_recipe(
     recipe_id: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """레시피 삭제"""
@@ -252,7 +628,7 @@ async def delete_recipe(
 @router.post("/{recipe_id}/improve-description")
 async def improve_recipe_description_endpoint(
     recipe_id: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """레시피 설명을 AI로 개선"""
@@ -0,0 +1,58 @@
+import asyncio
+import uuid
+from fastapi import APIRouter, HTTPException, Request, status
+from app.config import settings
+from app.services.object_storage import StorageError, get_storage, normalize_key, verify_local_upload
+from app.services.storage import STAGING_DIR, ensure_upload_dir
+
+router = APIRouter()
+
+
+@router.put("/{key:path}")
+async def put_object(
+    key: str,
+    request: Request,
+    max_bytes: int,
+    expires: int,
+    signature: str
+):
+    """
+    로컬 저장소용 presigned 업로드 엔드포인트
+
+    S3 presigned PUT과 같은 방식으로 요청 본문 전체를 파일 내용으로 받는다.
+    S3 저장소를 쓰는 배포에서는 사용하지 않는다.
+    """
+    if settings.storage_backend != "local":
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+    try:
+        key = normalize_key(key)
+    except StorageError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid key")
+
+    if not verify_local_upload(key, max_bytes, expires, signature):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or expired signature")
+
+    ensure_upload_dir()
+    temp_path = STAGING_DIR / f"{uuid.uuid4().hex}.part"
+    received = 0
+
+    buffer = await asyncio.to_thread(open, temp_path, "wb")
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail="File is too large"
+                )
+            await asyncio.to_thread(buffer.write, chunk)
+
+        await asyncio.to_thread(buffer.close)
+        await get_storage().put_file(key, temp_path)
+    except BaseException:
+        buffer.close()
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    return {"key": key, "size": received}
@@ -1,16 +1,24 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Request
+from fastapi.responses import RedirectResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from PIL import Image
-import os
+import asyncio
+import hashlib
+import re
 import uuid
-import shutil
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
+from app.config import settings
 from app.database import get_db
-from app.utils.dependencies import get_current_user
-from app.models.user import User
+from app.utils.dependencies import CurrentUser, get_current_user
+from app.models.recipe import Recipe
+from app.utils.metrics import UPLOAD_BYTES
+from app.schemas.storage import PresignedUploadResponse, UploadUrlRequest, UploadCompleteRequest
+from app.services.images import IMAGE_FORMATS, IMAGE_VARIANTS, process_image_async, InvalidImageError
+from app.services.object_storage import get_storage
+from app.utils.file_response import serve_file, stat_etag
 
 router = APIRouter(prefix="/uploads", tags=["uploads"])
 
@@ -25,51 +33,125 @@ IMAGES_DIR.mkdir(exist_ok=True)
 # 허용된 이미지 확장자
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+MEDIA_TYPES = {".jpg": "image/jpeg", ".webp": "image/webp"}
+
+# 내용 해시로 이름 붙인 파일은 내용이 바뀌지 않으므로 영구 캐시
+CONTENT_ID_LENGTH = 32
+# 파일 ID 앞부분은 업로드한 사용자 표시 (같은 이미지라도 사용자마다 다른 파일)
+OWNER_TAG_LENGTH = 12
+_CONTENT_ID_RE = re.compile(rf"^[0-9a-f]{{{CONTENT_ID_LENGTH}}}$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+LEGACY_CACHE_CONTROL = "public, max-age=86400"  # 이전 UUID 이름 파일: 1일 캐시
+
+
+def is_safe_filename(filename: str) -> bool:
+    """경로 이동 문자 없이 이미지 디렉토리 안의 파일만 가리키는지 확인"""
+    return Path(filename).name == filename and not filename.startswith(".")
 
 
 def validate_image(file: UploadFile) -> bool:
     """이미지 파일 유효성 검사"""
+    return validate_image_type(file.filename, file.content_type)
+
+
+def validate_image_type(filename: Optional[str], content_type: Optional[str]) -> bool:
     # 파일 확장자 검사
-    if not file.filename:
+    if not filename:
         return False
     
-    ext = Path(file.filename).suffix.lower()
+    ext = Path(filename).suffix.lower()
     if ext not in ALLOWED_EXTENSIONS:
         return False
     
     # MIME 타입 검사
-    if not file.content_type or not file.content_type.startswith("image/"):
+    if not content_type or not content_type.startswith("image/"):
         return False
     
     return True
 
 
-def resize_image(image_path: Path, max_size: tuple = (1024, 1024)) -> None:
-    """이미지 크기 조정"""
+def image_key(filename: str) -> str:
+    return f"images/{filename}"
+
+
+def incoming_image_prefix(user_id: str) -> str:
+    """직접 업로드된 원본 이미지가 처리 전까지 머무는 위치"""
+    return f"images/incoming/{user_id}/"
+
+
+def image_file_keys(file_id: str) -> List[str]:
+    """업로드 하나에 속한 모든 파일의 저장소 키 (대표 JPEG + 변형들)"""
+    return [
+        image_key(variant_filename(file_id, variant, extension))
+        for variant in IMAGE_VARIANTS
+        for extension in IMAGE_FORMATS
+    ]
+
+
+def variant_filename(file_id: str, variant: str, extension: str) -> str:
+    # 상세 JPEG는 기존 URL 형식({id}.jpg)을 그대로 사용
+    if variant == "detail" and extension == "jpg":
+        return f"{file_id}.jpg"
+    return f"{file_id}_{variant}.{extension}"
+
+
+async def read_upload_limited(file: UploadFile, max_size: int) -> Optional[bytes]:
+    """업로드를 최대 크기까지만 메모리로 읽음 (초과하면 None)"""
+    chunks = []
+    total = 0
+    while True:
+        chunk = await file.read(1024 * 1024)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > max_size:
+            return None
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def write_image_files(files: dict) -> None:
+    """변형 파일 저장 (실패하면 이번에 새로 쓴 파일만 삭제)"""
+    storage = get_storage()
+    written = []
     try:
-        with Image.open(image_path) as img:
-            # EXIF 회전 정보 적용
-            img = img.rotate(0, expand=True)
-            
-            # 크기 조정 (비율 유지)
-            img.thumbnail(max_size, Image.LANCZOS)
-            
-            # JPEG로 저장 (용량 최적화)
-            if img.mode in ("RGBA", "P"):
-                img = img.convert("RGB")
-            
-            img.save(image_path, "JPEG", quality=85, optimize=True)
-    except Exception as e:
-        print(f"이미지 리사이징 오류: {e}")
+        for key, data in files.items():
+            # 같은 내용은 같은 이름이므로 이미 있으면 다시 쓰지 않음
+            if await storage.size(key) is not None:
+                continue
+            await storage.put_bytes(key, data, MEDIA_TYPES.get(Path(key).suffix))
+            written.append(key)
+    except Exception:
+        for key in written:
+            await storage.delete(key)
         raise
 
 
+def owner_tag(user_id) -> str:
+    return hashlib.sha256(str(user_id).encode()).hexdigest()[:OWNER_TAG_LENGTH]
+
+
+def content_file_id(user_id, data: bytes) -> str:
+    """
+    업로드한 사용자와 원본 이미지 내용으로 정한 파일 ID
+
+    같은 사용자가 같은 이미지를 올리면 같은 URL이 되고, 다른 사용자와는
+    파일을 공유하지 않으므로 한 사람이 삭제해도 다른 사람의 이미지는 남는다.
+    """
+    content_hash = hashlib.sha256(data).hexdigest()[:CONTENT_ID_LENGTH - OWNER_TAG_LENGTH]
+    return owner_tag(user_id) + content_hash
+
+
+def is_content_addressed(filename: str) -> bool:
+    return bool(_CONTENT_ID_RE.match(Path(filename).stem.split("_")[0]))
+
+
 @router.post("/recipe-image")
 async def upload_recipe_image(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
-    """레시피 이미지 업로드"""
+    """레시피 이미지 업로드 (썸네일/목록/상세 크기의 JPEG, WebP 생성)"""
     
     # 파일 유효성 검사
     if not validate_image(file):
@@ -78,77 +160,216 @@ async def upload_recipe_image(
             detail="지원하지 않는 파일 형식입니다. JPG, PNG, WEBP 파일만 업로드 가능합니다."
         )
     
+    too_large = HTTPException(
+        status_code=400,
+        detail="파일 크기가 너무 큽니다. 10MB 이하의 파일만 업로드 가능합니다."
+    )
+    
     # 파일 크기 검사
     if file.size and file.size > MAX_FILE_SIZE:
+        raise too_large
+    
+    data = await read_upload_limited(file, MAX_FILE_SIZE)
+    if data is None:
+        raise too_large
+    UPLOAD_BYTES.labels("image").inc(len(data))
+    
+    try:
+        return await store_image_variants(current_user.id, data)
+    except InvalidImageError as e:
+        print(f"이미지 디코딩 오류: {e}")
+        raise HTTPException(
+            status_code=400,
+            detail="이미지 파일을 읽을 수 없습니다."
+        )
+    except Exception as e:
+        print(f"이미지 업로드 오류: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="이미지 업로드 중 오류가 발생했습니다."
+        )
+
+
+async def store_image_variants(user_id, data: bytes) -> dict:
+    """
+    원본 이미지로 변형들을 만들어 저장하고 업로드 응답을 반환
+    
+    Raises:
+        InvalidImageError: 디코딩할 수 없는 이미지
+    """
+    file_id = content_file_id(user_id, data)
+    files = {}
+    
+    # 디코딩/리사이즈/인코딩은 프로세스 풀에서 한 번에 처리
+    outputs = await process_image_async(data)
+    
+    variants = {}
+    for variant, encoded in outputs.items():
+        variants[variant] = {}
+        for extension, content in encoded.items():
+            filename = variant_filename(file_id, variant, extension)
+            files[image_key(filename)] = content
+            variants[variant][extension] = f"/uploads/images/{filename}"
+    
+    await write_image_files(files)
+    
+    filename = variant_filename(file_id, "detail", "jpg")
+    
+    return {
+        "success": True,
+        "image_url": f"/uploads/images/{filename}",
+        "filename": filename,
+        "variants": variants,
+        "message": "이미지가 성공적으로 업로드되었습니다."
+    }
+
+
+@router.post("/recipe-image/upload-url", response_model=PresignedUploadResponse)
+async def create_recipe_image_upload_url(
+    request: UploadUrlRequest,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """레시피 이미지 직접 업로드용 URL 발급 (업로드 후 /recipe-image/complete 호출)"""
+    
+    if not validate_image_type(request.file_name, request.content_type):
+        raise HTTPException(
+            status_code=400,
+            detail="지원하지 않는 파일 형식입니다. JPG, PNG, WEBP 파일만 업로드 가능합니다."
+        )
+    
+    if request.file_size is not None and request.file_size > MAX_FILE_SIZE:
         raise HTTPException(
             status_code=400,
             detail="파일 크기가 너무 큽니다. 10MB 이하의 파일만 업로드 가능합니다."
         )
     
+    extension = Path(request.file_name).suffix.lower()
+    key = f"{incoming_image_prefix(str(current_user.id))}{uuid.uuid4().hex}{extension}"
+    upload = get_storage().presigned_put(key, request.content_type, MAX_FILE_SIZE)
+    
+    return PresignedUploadResponse(key=key, **upload)
+
+
+@router.post("/recipe-image/complete")
+async def complete_recipe_image_upload(
+    request: UploadCompleteRequest,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """직접 업로드한 원본 이미지를 변형들로 처리 (응답은 /recipe-image와 같음)"""
+    
+    prefix = incoming_image_prefix(str(current_user.id))
+    if not request.key.startswith(prefix) or "/" in request.key[len(prefix):]:
+        raise HTTPException(status_code=400, detail="잘못된 업로드 키입니다.")
+    
+    storage = get_storage()
+    file_size = await storage.size(request.key)
+    if file_size is None:
+        raise HTTPException(status_code=404, detail="업로드된 이미지를 찾을 수 없습니다.")
+    
     try:
-        # 고유한 파일명 생성
-        file_id = str(uuid.uuid4())
-        file_extension = ".jpg"  # 모든 이미지를 JPEG로 저장
-        filename = f"{file_id}{file_extension}"
-        file_path = IMAGES_DIR / filename
-        
-        # 파일 저장
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # 이미지 리사이징
-        resize_image(file_path)
-        
-        # 파일 URL 생성
-        image_url = f"/uploads/images/{filename}"
-        
-        return {
-            "success": True,
-            "image_url": image_url,
-            "filename": filename,
-            "message": "이미지가 성공적으로 업로드되었습니다."
-        }
+        if file_size > MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=400,
+                detail="파일 크기가 너무 큽니다. 10MB 이하의 파일만 업로드 가능합니다."
+            )
         
+        data = await storage.get_bytes(request.key)
+        UPLOAD_BYTES.labels("image").inc(len(data))
+        return await store_image_variants(current_user.id, data)
+    except InvalidImageError as e:
+        print(f"이미지 디코딩 오류: {e}")
+        raise HTTPException(
+            status_code=400,
+            detail="이미지 파일을 읽을 수 없습니다."
+        )
+    except HTTPException:
+        raise
     except Exception as e:
-        # 업로드 실패 시 파일 삭제
-        if file_path.exists():
-            file_path.unlink()
-        
         print(f"이미지 업로드 오류: {e}")
         raise HTTPException(
             status_code=500,
             detail="이미지 업로드 중 오류가 발생했습니다."
         )
+    finally:
+        # 원본은 변형을 만든 뒤(또는 거부된 뒤) 필요 없음
+        await storage.delete(request.key)
 
 
 @router.get("/images/{filename}")
-async def get_image(filename: str):
-    """이미지 파일 조회"""
-    file_path = IMAGES_DIR / filename
+async def get_image(filename: str, request: Request):
+    """이미지 파일 조회 (ETag/Last-Modified 조건부 요청, Range 요청 지원)"""
+    if not is_safe_filename(filename):
+        raise HTTPException(status_code=404, detail="이미지를 찾을 수 없습니다.")
+    
+    file_path = get_storage().local_path(image_key(filename))
+    if file_path is None:
+        # 원격 저장소는 클라이언트가 저장소(또는 CDN)에서 바로 받도록 넘김
+        return RedirectResponse(get_storage().download_url(image_key(filename)), status_code=307)
     
-    if not file_path.exists():
+    if not file_path.is_file():
         raise HTTPException(status_code=404, detail="이미지를 찾을 수 없습니다.")
     
-    return FileResponse(
-        path=file_path, 
-        media_type="image/jpeg",
-        headers={"Cache-Control": "max-age=86400"}  # 1일 캐시
+    if is_content_addressed(filename):
+        # 파일 이름이 곧 내용의 해시이므로 그대로 강한 ETag로 사용
+        etag = f'"{Path(filename).stem}{file_path.suffix}"'
+        cache_control = IMMUTABLE_CACHE_CONTROL
+    else:
+        etag = stat_etag(await asyncio.to_thread(file_path.stat))
+        cache_control = LEGACY_CACHE_CONTROL
+    
+    offload_path = None
+    if settings.image_offload_header:
+        offload_path = f"{settings.image_offload_prefix}{filename}"
+    
+    return await serve_file(
+        request,
+        file_path,
+        media_type=MEDIA_TYPES.get(file_path.suffix, "image/jpeg"),
+        etag=etag,
+        cache_control=cache_control,
+        offload_header=settings.image_offload_header,
+        offload_path=offload_path
+    )
+
+
+async def is_image_owner(db: AsyncSession, user_id, filename: str) -> bool:
+    """
+    사용자가 지울 수 있는 이미지인지 확인
+
+    사용자 표시가 들어간 파일 ID면 그것으로 판단하고, 그 전에 올린 파일(UUID 이름,
+    사용자 표시 없는 내용 해시)은 이 사용자의 레시피만 참조하고 있을 때만 허용한다.
+    """
+    file_id = Path(filename).stem.split("_")[0]
+    if file_id.startswith(owner_tag(user_id)):
+        return True
+
+    result = await db.execute(
+        select(Recipe.user_id)
+        .where(Recipe.image_url.endswith(f"/images/{filename}", autoescape=True))
+        .distinct()
     )
+    return set(result.scalars().all()) == {user_id}
 
 
 @router.delete("/images/{filename}")
 async def delete_image(
     filename: str,
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    """이미지 파일 삭제"""
-    file_path = IMAGES_DIR / filename
+    """이미지 파일 삭제 (같은 업로드의 모든 변형 포함, 본인 이미지만)"""
+    storage = get_storage()
     
-    if not file_path.exists():
+    if not is_safe_filename(filename) or await storage.size(image_key(filename)) is None:
         raise HTTPException(status_code=404, detail="이미지를 찾을 수 없습니다.")
     
+    if not await is_image_owner(db, current_user.id, filename):
+        raise HTTPException(status_code=403, detail="이미지를 삭제할 권한이 없습니다.")
+    
     try:
-        file_path.unlink()
+        file_id = Path(filename).stem.split("_")[0]
+        for key in image_file_keys(file_id):
+            await storage.delete(key)
         return {"success": True, "message": "이미지가 삭제되었습니다."}
     except Exception as e:
         print(f"이미지 삭제 오류: {e}")
@@ -17,11 +17,50 @@ class AudioFileResponse(BaseModel):
         from_attributes = True
 
 
+class AudioFileSummaryResponse(BaseModel):
+    """목록 화면용 요약 (변환 텍스트 제외)"""
+    id: str
+    file_name: str
+    duration: Optional[int] = None
+    processing_status: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class AudioProcessRequest(BaseModel):
     audio_id: str
+    stt_backend: Optional[str] = None  # "openai" 또는 "local" (없으면 서버 기본값)
 
 
 class AudioProcessResponse(BaseModel):
     audio_id: str
-    transcript_text: str
-    processing_status: str
\ No newline at end of file
+    transcript_text: Optional[str] = None
+    processing_status: str
+
+class AudioUploadUrlRequest(BaseModel):
+    file_name: str
+    content_type: str
+    file_size: Optional[int] = None  # bytes (알면 미리 크기 제한 검사)
+
+
+class AudioUploadCompleteRequest(BaseModel):
+    key: str
+    file_name: str
+
+
+class UploadSessionCreate(BaseModel):
+    file_name: str
+    content_type: str
+    upload_length: int  # 전체 파일 크기 (bytes)
+
+
+class UploadSessionResponse(BaseModel):
+    id: str
+    file_name: str
+    upload_length: int
+    upload_offset: int
+    status: str
+    expires_at: datetime
+    audio_file_id: Optional[str] = None
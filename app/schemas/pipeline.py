@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import Dict, Optional
+from datetime import datetime
+
+
+class PipelineJobResponse(BaseModel):
+    id: str
+    audio_id: str
+    recipe_id: Optional[str] = None
+    stage: str  # transcribe, organize, done
+    status: str  # pending, running, completed, failed
+    error: Optional[str] = None
+    timings: Dict[str, float] = {}  # 단계별 소요 시간(초), *_wait는 큐 대기 시간, upload_receive는 본문 수신 시간
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
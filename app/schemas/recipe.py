@@ -1,10 +1,16 @@
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional, Dict, Any
 from datetime import datetime
 
 
 class RecipeCreate(BaseModel):
     source_audio_id: str
+    force_regenerate: bool = False  # True이면 캐시를 무시하고 GPT로 다시 정리
+
+
+class RecipeBatchCreate(BaseModel):
+    source_audio_ids: List[str] = Field(..., min_length=1)
+    force_regenerate: bool = False
 
 
 class RecipeIngredient(BaseModel):
@@ -42,6 +48,42 @@ class RecipeResponse(BaseModel):
         from_attributes = True
 
 
+class RecipeBatchItemResult(BaseModel):
+    source_audio_id: str
+    status: Literal["created", "failed"]
+    recipe: Optional[RecipeResponse] = None
+    error: Optional[str] = None
+
+
+class RecipeBatchResponse(BaseModel):
+    created_count: int
+    failed_count: int
+    results: List[RecipeBatchItemResult]  # 요청한 source_audio_ids 순서
+
+
+class RecipeSummaryResponse(BaseModel):
+    """목록 화면용 요약 (재료/조리 단계 등 큰 필드 제외)"""
+    id: str
+    title: str
+    category: Optional[str] = None
+    image_url: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class RecipeSearchResult(RecipeSummaryResponse):
+    score: float
+
+
+class RecipeIngredientMatch(RecipeSummaryResponse):
+    matched_count: int
+    total_count: int
+    matched_ingredients: List[str] = []
+    missing_ingredients: List[str] = []
+
+
 class RecipeUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from typing import Dict, Optional
+
+
+class PresignedUploadResponse(BaseModel):
+    """저장소로 직접 업로드할 URL (업로드 후 확인 요청에 key를 보냄)"""
+    key: str
+    url: str
+    method: str = "PUT"
+    headers: Dict[str, str] = {}
+    expires_at: int  # unix timestamp
+
+
+class UploadUrlRequest(BaseModel):
+    file_name: str
+    content_type: str
+    file_size: Optional[int] = None  # bytes (알면 미리 크기 제한 검사)
+
+
+class UploadCompleteRequest(BaseModel):
+    key: str
@@ -0,0 +1,20 @@
+"""
+재료 인덱스(recipe_ingredients)가 생기기 전에 만든 레시피에 인덱스를 채우는 일회성 작업
+
+실행:
+    python -m app.scripts.backfill_ingredients
+"""
+import asyncio
+from app.database import AsyncSessionLocal, async_engine
+from app.services.ingredients import backfill_recipe_ingredients
+
+
+async def main():
+    async with AsyncSessionLocal() as db:
+        count = await backfill_recipe_ingredients(db)
+    await async_engine.dispose()
+    print(f"Backfilled ingredient index for {count} recipes")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
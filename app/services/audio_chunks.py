@@ -0,0 +1,170 @@
+import asyncio
+import re
+import shutil
+from pathlib import Path
+from typing import List, Optional, Tuple
+from app.services.storage import UPLOAD_DIR
+
+# 분할된 구간 오디오가 임시로 저장되는 위치
+CHUNK_DIR = UPLOAD_DIR / "chunks"
+
+# 무음 판정 기준 (ffmpeg silencedetect)
+SILENCE_NOISE_DB = -35
+SILENCE_MIN_SECONDS = 0.5
+
+_SILENCE_START_RE = re.compile(r"silence_start: (-?[\d.]+)")
+_SILENCE_END_RE = re.compile(r"silence_end: (-?[\d.]+)")
+
+
+async def _run(*args: str) -> Tuple[int, str, str]:
+    """외부 프로세스를 이벤트 루프를 막지 않고 실행"""
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await process.communicate()
+    return process.returncode, stdout.decode(errors="ignore"), stderr.decode(errors="ignore")
+
+
+async def probe_duration(file_path: str) -> Optional[float]:
+    """ffprobe로 오디오 길이(초) 조회, 실패시 None"""
+    try:
+        code, stdout, _ = await _run(
+            "ffprobe", "-v", "error",
+            "-show_entries", "format=duration",
+            "-of", "default=noprint_wrappers=1:nokey=1",
+            file_path
+        )
+    except FileNotFoundError:
+        return None
+    if code != 0:
+        return None
+    try:
+        return float(stdout.strip())
+    except ValueError:
+        return None
+
+
+async def detect_silences(file_path: str) -> List[Tuple[float, float]]:
+    """ffmpeg silencedetect로 무음 구간 (시작, 끝) 목록 조회"""
+    code, _, stderr = await _run(
+        "ffmpeg", "-hide_banner", "-nostats",
+        "-i", file_path,
+        "-af", f"silencedetect=noise={SILENCE_NOISE_DB}dB:d={SILENCE_MIN_SECONDS}",
+        "-f", "null", "-"
+    )
+    if code != 0:
+        return []
+
+    starts = [float(m) for m in _SILENCE_START_RE.findall(stderr)]
+    ends = [float(m) for m in _SILENCE_END_RE.findall(stderr)]
+    return list(zip(starts, ends))
+
+
+def plan_chunks(
+    duration: float,
+    silences: List[Tuple[float, float]],
+    target_seconds: float,
+    max_seconds: float,
+    overlap_seconds: float
+) -> List[Tuple[float, float]]:
+    """
+    무음 경계를 기준으로 분할 구간 계산
+
+    각 구간은 target_seconds 근처의 무음 중앙에서 끊고, 적당한 무음이 없으면
+    max_seconds에서 강제로 끊는다. 다음 구간은 경계 단어 유실을 막기 위해
+    overlap_seconds만큼 앞에서 시작한다.
+    """
+    cut_points = [(start + end) / 2 for start, end in silences]
+    spans = []
+    start = 0.0
+
+    while duration - start > max_seconds:
+        desired = start + target_seconds
+        candidates = [
+            point for point in cut_points
+            if start + target_seconds / 2 <= point <= start + max_seconds
+        ]
+        if candidates:
+            cut = min(candidates, key=lambda point: abs(point - desired))
+        else:
+            cut = start + max_seconds
+
+        spans.append((start, cut))
+        start = max(cut - overlap_seconds, start + 1)
+
+    spans.append((start, duration))
+    return spans
+
+
+def chunk_path(audio_id: str, chunk_index: int) -> Path:
+    return CHUNK_DIR / str(audio_id) / f"{chunk_index:04d}.mp3"
+
+
+async def extract_chunk(file_path: str, audio_id: str, chunk_index: int, start: float, end: float) -> Path:
+    """
+    구간을 16kHz 모노 mp3로 잘라 저장 (이미 있으면 재사용)
+
+    Raises:
+        RuntimeError: ffmpeg 실패
+    """
+    output_path = chunk_path(audio_id, chunk_index)
+    if output_path.exists():
+        return output_path
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = output_path.with_name(output_path.name + ".part")
+
+    code, _, stderr = await _run(
+        "ffmpeg", "-hide_banner", "-nostats", "-y",
+        "-ss", f"{start:.3f}", "-to", f"{end:.3f}",
+        "-i", file_path,
+        "-ac", "1", "-ar", "16000",
+        "-c:a", "libmp3lame", "-b:a", "64k",
+        "-f", "mp3", str(temp_path)
+    )
+    if code != 0:
+        temp_path.unlink(missing_ok=True)
+        raise RuntimeError(f"ffmpeg failed: {stderr[-500:]}")
+
+    temp_path.replace(output_path)
+    return output_path
+
+
+def remove_chunk_files(audio_id: str) -> None:
+    """분할 임시 파일 삭제"""
+    shutil.rmtree(CHUNK_DIR / str(audio_id), ignore_errors=True)
+
+
+def _normalize_word(word: str) -> str:
+    return re.sub(r"[^\w]", "", word).lower()
+
+
+def stitch_transcripts(texts: List[str], max_overlap_words: int = 30) -> str:
+    """
+    구간별 변환 텍스트를 순서대로 이어붙이며 겹치는 구간의 중복 단어 제거
+
+    앞 구간의 끝 단어들과 다음 구간의 첫 단어들이 (문장부호를 무시하고)
+    가장 길게 일치하는 부분을 찾아 다음 구간에서 잘라낸다.
+    """
+    merged: List[str] = []
+
+    for text in texts:
+        words = text.split()
+        if not words:
+            continue
+
+        limit = min(max_overlap_words, len(merged), len(words))
+        tail = [_normalize_word(w) for w in merged[-limit:]] if limit else []
+        head = [_normalize_word(w) for w in words[:limit]]
+
+        overlap = 0
+        for size in range(limit, 0, -1):
+            if tail[-size:] == head[:size] and any(head[:size]):
+                overlap = size
+                break
+
+        merged.extend(words[overlap:])
+
+    return " ".join(merged)
@@ -0,0 +1,91 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+# 이름별로 등록된 캐시 (통계 조회용)
+_registry: Dict[str, "LRUCache"] = {}
+
+
+class LRUCache:
+    """
+    프로세스 내 LRU 캐시
+    
+    Postgres 영속 캐시 앞단에 두는 용도이며,
+    영속 캐시에서 찾은 경우는 record_durable_hit()로 따로 집계한다.
+    """
+
+    def __init__(self, name: str, max_size: int):
+        self.name = name
+        self.max_size = max_size
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.durable_hits = 0
+        _registry[name] = self
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def record_durable_hit(self) -> None:
+        self.durable_hits += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        total_hits = self.hits + self.durable_hits
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "memory_hits": self.hits,
+            "durable_hits": self.durable_hits,
+            "misses": lookups - total_hits,
+            "hit_rate": round(total_hits / lookups, 4) if lookups else 0.0
+        }
+
+
+class TTLCache(LRUCache):
+    """
+    항목별 만료 시각을 갖는 LRU 캐시
+
+    만료 시각은 유닉스 시간(초)이며, 지정하지 않으면 기본 TTL을 적용한다.
+    """
+
+    def __init__(self, name: str, max_size: int, ttl_seconds: float):
+        super().__init__(name, max_size)
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = super().get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            # 만료된 항목은 미스로 집계
+            self._data.pop(key, None)
+            self.hits -= 1
+            self.misses += 1
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any, expires_at: Optional[float] = None) -> None:
+        default_expiry = time.time() + self.ttl_seconds
+        expires_at = min(expires_at, default_expiry) if expires_at else default_expiry
+        super().set(key, (expires_at, value))
+
+    def invalidate(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """등록된 모든 캐시의 통계 반환"""
+    return {name: cache.stats() for name, cache in _registry.items()}
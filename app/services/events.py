@@ -0,0 +1,110 @@
+import asyncio
+import json
+from typing import Dict, Optional, Set
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+
+# Postgres NOTIFY 채널 (모든 API 프로세스가 LISTEN)
+EVENT_CHANNEL = "momento_events"
+
+# 구독자 하나가 밀린 이벤트를 최대 몇 개까지 들고 있을지
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# audio_id -> 이 프로세스에서 해당 오디오를 구독 중인 큐들
+_subscribers: Dict[str, Set[asyncio.Queue]] = {}
+_listener_task: Optional[asyncio.Task] = None
+
+
+async def publish_event(db: AsyncSession, audio_id, event_type: str, **data) -> None:
+    """
+    오디오 처리 이벤트 발행
+
+    pg_notify는 호출한 트랜잭션이 커밋될 때 전달되므로, 상태 변경과 같은
+    세션에서 커밋 전에 호출하면 커밋된 상태만 알려진다.
+    """
+    payload = json.dumps({"audio_id": str(audio_id), "type": event_type, **data}, default=str)
+    await db.execute(select(func.pg_notify(EVENT_CHANNEL, payload)))
+
+
+def _dispatch(payload: str) -> None:
+    try:
+        event = json.loads(payload)
+    except ValueError:
+        print(f"Invalid event payload: {payload[:200]}")
+        return
+
+    for queue in list(_subscribers.get(event.get("audio_id"), ())):
+        if queue.full():
+            # 느린 구독자는 오래된 이벤트부터 버림 (재연결 시 현재 상태를 다시 받음)
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+
+def subscribe(audio_id: str) -> asyncio.Queue:
+    """오디오 하나의 이벤트를 받는 큐 등록 (다 쓰면 unsubscribe 호출)"""
+    queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+    _subscribers.setdefault(audio_id, set()).add(queue)
+    return queue
+
+
+def unsubscribe(audio_id: str, queue: asyncio.Queue) -> None:
+    queues = _subscribers.get(audio_id)
+    if queues is not None:
+        queues.discard(queue)
+        if not queues:
+            del _subscribers[audio_id]
+
+
+def subscriber_count() -> int:
+    return sum(len(queues) for queues in _subscribers.values())
+
+
+async def _listen_loop():
+    """
+    전용 asyncpg 커넥션으로 LISTEN하며 받은 알림을 로컬 구독자에게 전달
+
+    커넥션이 끊기면 잠시 후 다시 연결한다. 끊긴 동안의 알림은 유실되므로
+    SSE 엔드포인트는 연결 시 항상 현재 상태를 먼저 보낸다.
+    """
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(settings.database_url)
+            await connection.add_listener(
+                EVENT_CHANNEL,
+                lambda _conn, _pid, _channel, payload: _dispatch(payload)
+            )
+
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _conn: closed.set())
+            while not closed.is_set():
+                try:
+                    await asyncio.wait_for(closed.wait(), timeout=settings.event_listener_ping_seconds)
+                except asyncio.TimeoutError:
+                    # 조용히 끊긴 커넥션은 종료 알림이 오지 않으므로 주기적으로 확인
+                    await connection.execute("SELECT 1")
+            print("Event listener connection closed, reconnecting")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Event listener error: {e}")
+        finally:
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+
+        await asyncio.sleep(settings.event_listener_reconnect_seconds)
+
+
+def start_event_listener():
+    global _listener_task
+    _listener_task = asyncio.create_task(_listen_loop())
+
+
+async def stop_event_listener():
+    global _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        await asyncio.gather(_listener_task, return_exceptions=True)
+        _listener_task = None
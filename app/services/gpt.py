@@ -1,25 +1,28 @@
-from openai import OpenAI
+import asyncio
+import copy
+import hashlib
 import json
-from typing import Dict, Any, Optional
+from contextlib import AsyncExitStack
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.cache import RecipeCache
+from app.services.cache import LRUCache
+from app.services.openai_client import get_openai_client
+from app.services.rate_limiter import estimate_chat_tokens, openai_rate_limit
+from app.services.resilience import call_openai
+from app.utils.json_stream import IncrementalJSONObjectParser
+from app.utils.metrics import track_openai_call, record_openai_usage
 
-# OpenAI 클라이언트 초기화 (lazy initialization)
-def get_openai_client():
-    return OpenAI(api_key=settings.openai_api_key)
+GPT_MODEL = "gpt-3.5-turbo"
+RECIPE_TEMPERATURE = 0.3  # 일관성을 위해 낮은 온도 설정
+RECIPE_MAX_TOKENS = 2000
 
-
-async def organize_recipe_from_text(transcript_text: str) -> Optional[Dict[str, Any]]:
-    """
-    GPT를 사용하여 음성 텍스트를 구조화된 요리법으로 정리
-    
-    Args:
-        transcript_text: STT로 변환된 텍스트
-        
-    Returns:
-        구조화된 레시피 데이터 또는 None (실패시)
-    """
-    
-    system_prompt = """
+# 시스템 프롬프트를 바꾸면 버전도 올려 기존 캐시가 재사용되지 않도록 함
+RECIPE_PROMPT_VERSION = "v1"
+RECIPE_SYSTEM_PROMPT = """
 당신은 한국의 요리 전문가입니다. 사용자가 말로 설명한 요리법을 듣고, 이를 체계적이고 따라하기 쉬운 레시피로 정리해주세요.
 
 다음 JSON 형식으로 응답해주세요:
@@ -58,26 +61,152 @@ async def organize_recipe_from_text(transcript_text: str) -> Optional[Dict[str,
 5. JSON 형식을 정확히 지켜주세요
 """
 
-    user_prompt = f"""
+
+# cache_key -> 정리된 레시피
+recipe_cache = LRUCache("recipe", settings.recipe_cache_size)
+
+
+def recipe_cache_key(transcript_text: str) -> str:
+    """변환 텍스트, 모델, 온도, 프롬프트 버전으로 캐시 키 생성"""
+    payload = json.dumps(
+        [transcript_text, GPT_MODEL, RECIPE_TEMPERATURE, RECIPE_PROMPT_VERSION],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def get_cached_recipe(cache_key: str) -> Optional[Dict[str, Any]]:
+    """메모리 LRU -> Postgres 순으로 캐시된 레시피 조회"""
+    cached = recipe_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(RecipeCache.recipe_data).where(RecipeCache.cache_key == cache_key)
+            )
+            cached = result.scalar_one_or_none()
+    except Exception as e:
+        print(f"Recipe cache lookup error: {e}")
+        return None
+    
+    if cached is not None:
+        recipe_cache.record_durable_hit()
+        recipe_cache.set(cache_key, cached)
+    return cached
+
+
+async def store_cached_recipe(cache_key: str, recipe_data: Dict[str, Any]) -> None:
+    """정리된 레시피를 메모리 LRU와 Postgres에 저장"""
+    recipe_cache.set(cache_key, copy.deepcopy(recipe_data))
+    
+    try:
+        async with AsyncSessionLocal() as db:
+            stmt = insert(RecipeCache).values(cache_key=cache_key, recipe_data=recipe_data)
+            await db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[RecipeCache.cache_key],
+                    set_={"recipe_data": stmt.excluded.recipe_data}
+                )
+            )
+            await db.commit()
+    except Exception as e:
+        print(f"Recipe cache store error: {e}")
+
+
+async def organize_recipe_from_text(transcript_text: str, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    GPT를 사용하여 음성 텍스트를 구조화된 요리법으로 정리
+    
+    같은 변환 텍스트에 대한 결과는 캐시에서 재사용하며,
+    force_refresh=True이면 캐시를 건너뛰고 새로 생성한다.
+    
+    Args:
+        transcript_text: STT로 변환된 텍스트
+        force_refresh: 캐시 무시 여부
+        
+    Returns:
+        구조화된 레시피 데이터 또는 None (실패시)
+    """
+    cache_key = recipe_cache_key(transcript_text)
+    
+    if not force_refresh:
+        cached = await get_cached_recipe(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+    
+    recipe_data, cacheable = await _organize_with_gpt(transcript_text)
+    
+    # GPT 응답을 JSON으로 파싱한 경우만 캐시 (기본 구조 대체 결과는 제외)
+    if recipe_data is not None and cacheable:
+        await store_cached_recipe(cache_key, recipe_data)
+    
+    return recipe_data
+
+
+def _recipe_user_prompt(transcript_text: str) -> str:
+    return f"""
 다음은 어머니가 설명해주신 요리법입니다. 이를 체계적인 레시피로 정리해주세요:
 
 "{transcript_text}"
 """
 
+
+def _recipe_messages(transcript_text: str) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": RECIPE_SYSTEM_PROMPT},
+        {"role": "user", "content": _recipe_user_prompt(transcript_text)}
+    ]
+
+
+async def _organize_with_gpt(transcript_text: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """
+    GPT 호출 및 응답 파싱
+    
+    Returns:
+        Tuple[레시피 데이터 또는 None, 캐시 가능 여부]
+    """
+
     try:
         client = get_openai_client()
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.3,  # 일관성을 위해 낮은 온도 설정
-            max_tokens=2000
-        )
+        messages = _recipe_messages(transcript_text)
+        
+        async def attempt(timeout: float):
+            async with openai_rate_limit("chat", estimate_chat_tokens(messages, RECIPE_MAX_TOKENS)) as slot:
+                async with track_openai_call("organize_recipe", GPT_MODEL):
+                    response = await asyncio.wait_for(
+                        client.chat.completions.create(
+                            model=GPT_MODEL,
+                            messages=messages,
+                            temperature=RECIPE_TEMPERATURE,
+                            max_tokens=RECIPE_MAX_TOKENS
+                        ),
+                        timeout
+                    )
+                slot.record_usage(response.usage)
+            return response
+        
+        response = await call_openai("organize_recipe", "chat", attempt)
+        record_openai_usage("organize_recipe", GPT_MODEL, response.usage)
         
+        return _parse_recipe_content(response.choices[0].message.content, transcript_text)
+        
+    except Exception as e:
+        print(f"GPT processing error: {e}")
+        return None, False
+
+
+def _parse_recipe_content(content: str, transcript_text: str) -> Tuple[Dict[str, Any], bool]:
+    """
+    GPT 응답 텍스트에서 레시피 JSON 추출
+    
+    Returns:
+        Tuple[레시피 데이터, 캐시 가능 여부 (JSON으로 파싱된 경우만 True)]
+    """
+    try:
         # GPT 응답에서 JSON 추출
-        content = response.choices[0].message.content.strip()
+        content = content.strip()
         
         # JSON 부분만 추출 (```json ... ``` 형태로 감싸져있을 수 있음)
         if "```json" in content:
@@ -88,7 +217,7 @@ async def organize_recipe_from_text(transcript_text: str) -> Optional[Dict[str,
             json_content = content
         else:
             # JSON 형태가 아닌 경우 기본 구조로 래핑
-            return {
+            return ({
                 "title": "정리된 레시피",
                 "description": content,
                 "ingredients": [],
@@ -98,7 +227,7 @@ async def organize_recipe_from_text(transcript_text: str) -> Optional[Dict[str,
                 "cooking_time": "30분",
                 "difficulty": "보통",
                 "category": "기타"
-            }
+            }, False)
         
         recipe_data = json.loads(json_content)
         
@@ -119,12 +248,12 @@ async def organize_recipe_from_text(transcript_text: str) -> Optional[Dict[str,
             if field not in recipe_data:
                 recipe_data[field] = default_value
         
-        return recipe_data
+        return recipe_data, True
         
     except json.JSONDecodeError as e:
         print(f"JSON parsing error: {e}")
         # JSON 파싱 실패시 기본 구조 반환
-        return {
+        return ({
             "title": "정리된 레시피",
             "description": transcript_text[:200] + "..." if len(transcript_text) > 200 else transcript_text,
             "ingredients": [],
@@ -134,11 +263,125 @@ async def organize_recipe_from_text(transcript_text: str) -> Optional[Dict[str,
             "cooking_time": "30분",
             "difficulty": "보통",
             "category": "기타"
-        }
+        }, False)
+
+
+# 스트리밍 중 배열 원소 하나마다 보내는 이벤트 이름
+STREAM_ITEM_EVENTS = {"ingredients": "ingredient", "steps": "step"}
+
+
+def _stream_event(kind: str, key: str, index: Optional[int], value: Any) -> Optional[Dict[str, Any]]:
+    """파서 결과를 클라이언트 이벤트로 변환 (배열 전체 완료는 원소로 이미 보냈으므로 생략)"""
+    if kind == "item":
+        event_type = STREAM_ITEM_EVENTS.get(key)
+        if event_type is None:
+            return None
+        return {"type": event_type, "index": index, event_type: value}
+    
+    if key in STREAM_ITEM_EVENTS:
+        return None
+    if key == "title":
+        return {"type": "title", "title": value}
+    return {"type": "field", "name": key, "value": value}
+
+
+def _replay_events(recipe_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """캐시된 레시피를 스트리밍과 같은 이벤트 순서로 변환"""
+    for key, value in recipe_data.items():
+        if key in STREAM_ITEM_EVENTS and isinstance(value, list):
+            for index, item in enumerate(value):
+                yield _stream_event("item", key, index, item)
+        else:
+            event = _stream_event("field", key, None, value)
+            if event is not None:
+                yield event
+
+
+async def stream_recipe_from_text(
+    transcript_text: str,
+    force_refresh: bool = False
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    organize_recipe_from_text의 스트리밍 버전
+    
+    GPT 토큰 스트림을 읽으며 JSON을 점진적으로 해석해
+    title, field, ingredient, step 이벤트를 완성되는 즉시 내보내고,
+    마지막에 전체 레시피를 담은 recipe 이벤트(실패시 error 이벤트)를 낸다.
+    캐시 적중 시에는 같은 이벤트들을 바로 재생한다.
+    """
+    cache_key = recipe_cache_key(transcript_text)
+    
+    if not force_refresh:
+        cached = await get_cached_recipe(cache_key)
+        if cached is not None:
+            recipe_data = copy.deepcopy(cached)
+            for event in _replay_events(recipe_data):
+                yield event
+            yield {"type": "recipe", "recipe": recipe_data}
+            return
+    
+    parser = IncrementalJSONObjectParser()
+    parts: List[str] = []
+    
+    try:
+        client = get_openai_client()
+        messages = _recipe_messages(transcript_text)
+        
+        async def attempt(timeout: float):
+            # 시도마다 한도를 따로 배정받고, 성공한 시도의 배정은 스트림을 다 읽을 때까지 유지
+            stack = AsyncExitStack()
+            slot = await stack.enter_async_context(
+                openai_rate_limit("chat", estimate_chat_tokens(messages, RECIPE_MAX_TOKENS))
+            )
+            try:
+                # timeout은 스트림 청크 사이의 최대 대기 시간으로도 적용됨
+                stream = await asyncio.wait_for(
+                    client.chat.completions.create(
+                        model=GPT_MODEL,
+                        messages=messages,
+                        temperature=RECIPE_TEMPERATURE,
+                        max_tokens=RECIPE_MAX_TOKENS,
+                        stream=True,
+                        stream_options={"include_usage": True},
+                        timeout=settings.openai_chat_timeout_seconds
+                    ),
+                    timeout
+                )
+            except BaseException:
+                await stack.aclose()
+                raise
+            return stream, slot, stack
         
+        async with track_openai_call("organize_recipe_stream", GPT_MODEL):
+            # 첫 응답을 받기 전까지만 재시도 (이벤트를 내보낸 뒤에는 다시 보낼 수 없음)
+            stream, slot, stack = await call_openai("organize_recipe_stream", "chat", attempt)
+            async with stack:
+                async for chunk in stream:
+                    if chunk.usage is not None:
+                        slot.record_usage(chunk.usage)
+                        record_openai_usage("organize_recipe_stream", GPT_MODEL, chunk.usage)
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if not delta:
+                        continue
+                    
+                    parts.append(delta)
+                    for kind, key, index, value in parser.feed(delta):
+                        event = _stream_event(kind, key, index, value)
+                        if event is not None:
+                            yield event
     except Exception as e:
-        print(f"GPT processing error: {e}")
-        return None
+        print(f"GPT streaming error: {e}")
+        yield {"type": "error", "message": "Failed to organize recipe"}
+        return
+    
+    # 최종 결과는 비스트리밍과 같은 규칙으로 파싱 (누락 필드 기본값, 대체 구조)
+    recipe_data, cacheable = _parse_recipe_content("".join(parts), transcript_text)
+    if cacheable:
+        await store_cached_recipe(cache_key, recipe_data)
+    
+    yield {"type": "recipe", "recipe": recipe_data}
 
 
 async def improve_recipe_description(recipe_data: Dict[str, Any]) -> Optional[str]:
@@ -157,12 +400,31 @@ async def improve_recipe_description(recipe_data: Dict[str, Any]) -> Optional[st
 
     try:
         client = get_openai_client()
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.7,
-            max_tokens=200
+        messages = [{"role": "user", "content": prompt}]
+        
+        async def attempt(timeout: float):
+            async with openai_rate_limit("chat", estimate_chat_tokens(messages, 200)) as slot:
+                async with track_openai_call("improve_description", GPT_MODEL):
+                    response = await asyncio.wait_for(
+                        client.chat.completions.create(
+                            model=GPT_MODEL,
+                            messages=messages,
+                            temperature=0.7,
+                            max_tokens=200
+                        ),
+                        timeout
+                    )
+                slot.record_usage(response.usage)
+            return response
+        
+        # 응답이 짧아 느린 꼬리 응답은 같은 요청을 하나 더 보내 줄임
+        response = await call_openai(
+            "improve_description",
+            "chat",
+            attempt,
+            hedge_after=settings.openai_hedge_after_seconds
         )
+        record_openai_usage("improve_description", GPT_MODEL, response.usage)
         
         return response.choices[0].message.content.strip()
         
@@ -0,0 +1,38 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+from sqlalchemy import func, update
+from app.config import settings
+from app.database import AsyncSessionLocal
+
+
+@asynccontextmanager
+async def job_heartbeat(model, row_id, status_column, running_status: str) -> AsyncIterator[None]:
+    """
+    작업을 처리하는 동안 updated_at을 주기적으로 갱신
+
+    큐는 updated_at이 job_stale_after_seconds보다 오래된 실행 중 작업을
+    죽은 워커의 것으로 보고 회수하므로, 살아 있는 워커는 긴 작업 중에도
+    계속 갱신해 중복 실행을 막는다. 상태가 바뀐 행(완료/회수됨)은 건드리지 않는다.
+    """
+
+    async def beat():
+        while True:
+            await asyncio.sleep(settings.job_heartbeat_seconds)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(
+                        update(model)
+                        .where(model.id == row_id, status_column == running_status)
+                        .values(updated_at=func.now())
+                    )
+                    await db.commit()
+            except Exception as e:
+                print(f"Job heartbeat error ({row_id}): {e}")
+
+    task = asyncio.create_task(beat())
+    try:
+        yield
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
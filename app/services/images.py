@@ -0,0 +1,102 @@
+import asyncio
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+from PIL import Image, ImageOps, UnidentifiedImageError
+from app.config import settings
+
+# 변형 이름 -> 최대 크기 (큰 것부터 처리해 다음 변형의 원본으로 재사용)
+IMAGE_VARIANTS = {
+    "detail": (1024, 1024),
+    "list": (480, 480),
+    "thumbnail": (200, 200),
+}
+
+# 확장자 -> (PIL 포맷, 저장 옵션)
+IMAGE_FORMATS = {
+    "jpg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+}
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+class InvalidImageError(Exception):
+    """디코딩할 수 없거나 허용 픽셀 수를 넘는 이미지"""
+
+
+def _to_rgb(img: Image.Image) -> Image.Image:
+    # 투명 배경은 흰색으로 합성 (그냥 convert하면 검게 나옴)
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.getchannel("A"))
+        return background
+    if img.mode != "RGB":
+        return img.convert("RGB")
+    return img
+
+
+def process_image(data: bytes, max_pixels: int) -> Dict[str, Dict[str, bytes]]:
+    """
+    업로드된 이미지 바이트를 한 번 디코딩해 모든 변형/포맷으로 인코딩
+
+    프로세스 풀에서 실행된다.
+
+    Returns:
+        {변형 이름: {확장자: 인코딩된 바이트}}
+
+    Raises:
+        InvalidImageError: 이미지가 아니거나 픽셀 수 초과 (decompression bomb)
+    """
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            width, height = img.size
+            if width * height > max_pixels:
+                raise InvalidImageError(f"Image too large: {width}x{height}")
+
+            # JPEG는 디코딩 단계에서 바로 축소 (메모리/시간 절약)
+            img.draft("RGB", IMAGE_VARIANTS["detail"])
+            img = ImageOps.exif_transpose(img)
+            source = _to_rgb(img)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise InvalidImageError(str(e))
+
+    outputs: Dict[str, Dict[str, bytes]] = {}
+    for variant, max_size in IMAGE_VARIANTS.items():
+        source = source.copy()
+        source.thumbnail(max_size, Image.LANCZOS)
+
+        outputs[variant] = {}
+        for extension, (pil_format, options) in IMAGE_FORMATS.items():
+            buffer = io.BytesIO()
+            source.save(buffer, pil_format, **options)
+            outputs[variant][extension] = buffer.getvalue()
+
+    return outputs
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.image_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+async def process_image_async(data: bytes) -> Dict[str, Dict[str, bytes]]:
+    """이벤트 루프를 막지 않도록 프로세스 풀에서 이미지 처리"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pool(), process_image, data, settings.max_image_pixels)
+
+
+def close_image_pool():
+    """이미지 처리 프로세스 풀 종료"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -0,0 +1,124 @@
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import delete, exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.recipe import Recipe, RecipeIngredient
+
+# 재료명 앞에 붙는 손질 방법 (정규화 시 제거)
+PREPARATION_PREFIXES = (
+    "다진", "간", "썬", "채썬", "송송썬", "으깬", "삶은", "볶은", "데친", "불린", "손질한", "깐"
+)
+
+_PARENTHETICAL_RE = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+_NON_WORD_RE = re.compile(r"[^\w\s]")
+
+
+def canonicalize_ingredient_name(name: str) -> Optional[str]:
+    """
+    재료명을 비교 가능한 형태로 정규화
+
+    "다진 마늘 (국산)" -> "마늘", "Green  Onion" -> "greenonion"
+    """
+    if not name:
+        return None
+
+    normalized = unicodedata.normalize("NFKC", name).lower()
+    normalized = _PARENTHETICAL_RE.sub(" ", normalized)
+    normalized = _NON_WORD_RE.sub(" ", normalized)
+
+    words = normalized.split()
+    while len(words) > 1 and words[0] in PREPARATION_PREFIXES:
+        words = words[1:]
+
+    canonical = "".join(words)
+    return canonical or None
+
+
+def canonicalize_ingredient_names(names: Iterable[str]) -> List[str]:
+    """여러 재료명을 정규화하고 중복 제거 (순서 유지)"""
+    seen = []
+    for name in names:
+        canonical = canonicalize_ingredient_name(name)
+        if canonical and canonical not in seen:
+            seen.append(canonical)
+    return seen
+
+
+def build_ingredient_entries(user_id, ingredients: Optional[List[Dict[str, Any]]]) -> List[RecipeIngredient]:
+    """레시피 재료 JSON으로 정규화 인덱스 행 생성 (같은 재료는 한 번만)"""
+    entries = []
+    seen = set()
+
+    for ingredient in ingredients or []:
+        if not isinstance(ingredient, dict):
+            continue
+        # GPT 응답이라 이름이 없거나 숫자/객체로 올 수 있음
+        name = ingredient.get("name")
+        if not isinstance(name, str) or not name.strip():
+            continue
+        name = name.strip()
+        canonical = canonicalize_ingredient_name(name)
+        if not canonical or canonical in seen:
+            continue
+        seen.add(canonical)
+
+        # 분량도 200 같은 숫자로 오면 문자열 컬럼에 맞게 변환
+        amount = ingredient.get("amount")
+        if amount is not None:
+            amount = str(amount).strip() or None
+        entries.append(
+            RecipeIngredient(
+                user_id=user_id,
+                canonical_name=canonical,
+                name=name,
+                amount=amount
+            )
+        )
+
+    return entries
+
+
+async def replace_recipe_ingredients(db: AsyncSession, recipe: Recipe) -> None:
+    """저장된 레시피의 재료 인덱스를 현재 ingredients 값으로 교체 (커밋은 호출자가)"""
+    await db.execute(delete(RecipeIngredient).where(RecipeIngredient.recipe_id == recipe.id))
+    entries = build_ingredient_entries(recipe.user_id, recipe.ingredients)
+    for entry in entries:
+        entry.recipe_id = recipe.id
+    db.add_all(entries)
+
+
+async def backfill_recipe_ingredients(db: AsyncSession, batch_size: int = 500) -> int:
+    """
+    재료 인덱스 행이 없는 기존 레시피에 인덱스 생성 (여러 번 실행해도 안전)
+
+    Returns:
+        인덱스를 만든 레시피 수
+    """
+    has_entries = exists().where(RecipeIngredient.recipe_id == Recipe.id)
+    backfilled = 0
+    last_id = None
+
+    while True:
+        query = (
+            select(Recipe.id, Recipe.user_id, Recipe.ingredients)
+            .where(~has_entries, Recipe.ingredients.isnot(None))
+            .order_by(Recipe.id)
+            .limit(batch_size)
+        )
+        if last_id is not None:
+            query = query.where(Recipe.id > last_id)
+        rows = (await db.execute(query)).all()
+        if not rows:
+            return backfilled
+
+        for recipe_id, user_id, ingredients in rows:
+            entries = build_ingredient_entries(user_id, ingredients)
+            for entry in entries:
+                entry.recipe_id = recipe_id
+            db.add_all(entries)
+            if entries:
+                backfilled += 1
+
+        await db.commit()
+        last_id = rows[-1].id
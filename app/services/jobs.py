@@ -0,0 +1,157 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from sqlalchemy import select, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.audio import AudioFile
+from app.services.events import publish_event
+from app.services.heartbeat import job_heartbeat
+from app.services.rate_limiter import batch_priority
+from app.services.pipeline import advance_after_transcription, notify_organize_workers
+from app.services.object_storage import get_storage
+from app.services.stt import transcribe_audio
+
+# 워커 태스크와 새 작업 알림용 이벤트 (프로세스 단위)
+_workers: List[asyncio.Task] = []
+_wakeup: Optional[asyncio.Event] = None
+
+
+def notify_workers():
+    """대기 중인 워커를 깨워 큐를 즉시 확인하도록 함"""
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+async def enqueue_transcription(
+    db: AsyncSession,
+    audio_file: AudioFile,
+    stt_backend: Optional[str] = None
+) -> None:
+    """
+    오디오 파일을 STT 작업 큐에 등록
+
+    큐는 audio_files.processing_status 컬럼 자체이며,
+    'queued' 상태의 행을 워커가 SKIP LOCKED로 가져가 처리한다.
+    """
+    audio_file.stt_backend = stt_backend
+    audio_file.processing_status = "queued"
+    await publish_event(db, audio_file.id, "status", status="queued")
+    await db.commit()
+    notify_workers()
+
+
+async def claim_next_job(db: AsyncSession) -> Optional[AudioFile]:
+    """
+    대기 중인 STT 작업 하나를 가져와 'processing' 상태로 변경
+
+    FOR UPDATE SKIP LOCKED를 사용하므로 여러 프로세스의 워커가
+    동시에 폴링해도 같은 작업을 중복으로 가져가지 않는다.
+    처리 중인 워커는 heartbeat로 updated_at을 갱신하므로, 오래 갱신되지 않은
+    'processing' 작업(워커 비정상 종료)만 다시 가져간다.
+    """
+    stale_before = datetime.now(timezone.utc) - timedelta(seconds=settings.job_stale_after_seconds)
+
+    result = await db.execute(
+        select(AudioFile)
+        .where(
+            or_(
+                AudioFile.processing_status == "queued",
+                and_(
+                    AudioFile.processing_status == "processing",
+                    AudioFile.updated_at < stale_before
+                )
+            )
+        )
+        .order_by(AudioFile.updated_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    audio_file = result.scalar_one_or_none()
+
+    if audio_file is None:
+        await db.rollback()
+        return None
+
+    audio_file.processing_status = "processing"
+    await publish_event(db, audio_file.id, "status", status="processing")
+    await db.commit()
+    return audio_file
+
+
+async def run_transcription_job(db: AsyncSession, audio_file: AudioFile) -> Optional[str]:
+    """
+    하나의 STT 작업을 실행하고 결과를 저장
+
+    Returns:
+        변환된 텍스트 또는 None (실패시)
+    """
+    start = time.perf_counter()
+    try:
+        # 원격 저장소면 처리하는 동안만 임시 파일로 내려받음
+        async with job_heartbeat(AudioFile, audio_file.id, AudioFile.processing_status, "processing"):
+            async with get_storage().local_copy(audio_file.file_path) as local_path:
+                transcript_text = await transcribe_audio(
+                    str(local_path),
+                    audio_file.content_hash,
+                    audio_id=audio_file.id,
+                    backend_name=audio_file.stt_backend
+                )
+    except Exception as e:
+        print(f"STT job error ({audio_file.id}): {e}")
+        transcript_text = None
+
+    if transcript_text:
+        audio_file.transcript_text = transcript_text
+        audio_file.processing_status = "completed"
+    else:
+        audio_file.processing_status = "failed"
+
+    await publish_event(db, audio_file.id, "status", status=audio_file.processing_status)
+    # 파이프라인으로 들어온 작업이면 정리 단계로 넘김
+    await advance_after_transcription(db, audio_file, time.perf_counter() - start)
+    await db.commit()
+    notify_organize_workers()
+    return transcript_text
+
+
+async def _worker_loop(worker_id: int):
+    """큐에서 작업을 가져와 처리하는 워커 루프"""
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                audio_file = await claim_next_job(db)
+                if audio_file is not None:
+                    await run_transcription_job(db, audio_file)
+                    continue
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"STT worker {worker_id} error: {e}")
+
+        # 새 작업 알림 또는 폴링 주기까지 대기
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=settings.job_poll_interval_seconds)
+        except asyncio.TimeoutError:
+            pass
+        _wakeup.clear()
+
+
+def start_workers():
+    """설정된 개수만큼 STT 워커 시작"""
+    global _wakeup
+    _wakeup = asyncio.Event()
+    # 태스크는 생성 시점의 컨텍스트를 복사하므로 워커의 OpenAI 호출은 모두 배치 우선순위
+    with batch_priority():
+        for worker_id in range(settings.stt_worker_count):
+            _workers.append(asyncio.create_task(_worker_loop(worker_id)))
+
+
+async def stop_workers():
+    """실행 중인 STT 워커 종료"""
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
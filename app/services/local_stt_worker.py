@@ -0,0 +1,46 @@
+"""
+로컬 CPU STT 워커 프로세스에서 실행되는 함수들
+
+프로세스 풀(spawn)에서 가볍게 import 되도록 앱 설정이나 DB 모듈에 의존하지 않는다.
+"""
+from typing import List, Optional
+
+# 워커 프로세스마다 한 번만 로드되는 모델
+_model = None
+_pipeline = None
+_batch_size = 1
+
+
+def init_worker(model_size: str, compute_type: str, cpu_threads: int, batch_size: int):
+    """프로세스 시작 시 모델을 메모리에 올려둠 (warm model)"""
+    global _model, _pipeline, _batch_size
+    from faster_whisper import WhisperModel
+
+    _model = WhisperModel(
+        model_size,
+        device="cpu",
+        compute_type=compute_type,
+        cpu_threads=cpu_threads
+    )
+    _batch_size = batch_size
+
+    # 구간 단위 배치 추론 지원 버전이면 사용
+    try:
+        from faster_whisper import BatchedInferencePipeline
+        _pipeline = BatchedInferencePipeline(model=_model)
+    except ImportError:
+        _pipeline = None
+
+
+def transcribe_file(file_path: str, language: Optional[str]) -> str:
+    """워커 프로세스에서 파일 하나를 변환"""
+    if _pipeline is not None and _batch_size > 1:
+        segments, _ = _pipeline.transcribe(file_path, language=language, batch_size=_batch_size)
+    else:
+        segments, _ = _model.transcribe(file_path, language=language, vad_filter=True)
+    return " ".join(segment.text.strip() for segment in segments).strip()
+
+
+def transcribe_files(file_paths: List[str], language: Optional[str]) -> List[str]:
+    """워커 프로세스에서 여러 파일을 순서대로 변환"""
+    return [transcribe_file(path, language) for path in file_paths]
@@ -0,0 +1,318 @@
+import asyncio
+import hashlib
+import hmac
+import importlib.util
+import os
+import shutil
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import quote, urlencode
+from app.config import settings
+
+# 로컬 저장소 루트 (키 "audio/..." -> uploads/audio/...)
+LOCAL_ROOT = Path("uploads")
+
+_READ_CHUNK_SIZE = 1024 * 1024
+
+
+class StorageError(Exception):
+    """저장소 설정 오류 또는 잘못된 키"""
+
+
+def normalize_key(key: str) -> str:
+    """
+    저장소 키 정규화
+
+    예전에는 audio_files.file_path에 "uploads/audio/..." 형태의 로컬 경로를
+    저장했으므로 앞의 "uploads/"를 떼어 같은 키로 취급한다.
+    """
+    key = key.replace("\\", "/").lstrip("/")
+    if key.startswith(f"{LOCAL_ROOT.as_posix()}/"):
+        key = key[len(LOCAL_ROOT.as_posix()) + 1:]
+    if not key or any(part in ("", ".", "..") for part in key.split("/")):
+        raise StorageError(f"Invalid storage key: {key!r}")
+    return key
+
+
+def _sign(*parts: str) -> str:
+    message = "\n".join(parts).encode()
+    return hmac.new(settings.secret_key.encode(), message, hashlib.sha256).hexdigest()
+
+
+def sign_local_upload(key: str, max_bytes: int, expires: int) -> str:
+    """로컬 저장소 업로드 URL 서명 (키, 최대 크기, 만료 시각)"""
+    return _sign("PUT", key, str(max_bytes), str(expires))
+
+
+def verify_local_upload(key: str, max_bytes: int, expires: int, signature: str) -> bool:
+    if expires < time.time():
+        return False
+    return hmac.compare_digest(sign_local_upload(key, max_bytes, expires), signature)
+
+
+class ObjectStorage(ABC):
+    """파일 저장소 인터페이스 (키는 "audio/...", "images/..." 형태)"""
+
+    name: str = ""
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """디스크에서 바로 읽을 수 있으면 경로, 원격 저장소면 None"""
+        return None
+
+    @abstractmethod
+    async def put_file(self, key: str, source: Path, content_type: Optional[str] = None) -> None:
+        """로컬 파일을 저장소로 옮김 (원본 파일은 이동 또는 삭제됨)"""
+
+    @abstractmethod
+    async def put_bytes(self, key: str, data: bytes, content_type: Optional[str] = None) -> None:
+        """바이트 내용을 객체로 저장"""
+
+    @abstractmethod
+    async def get_bytes(self, key: str) -> bytes:
+        """객체 내용 전체를 읽음"""
+
+    @abstractmethod
+    async def size(self, key: str) -> Optional[int]:
+        """객체 크기 (없으면 None)"""
+
+    @abstractmethod
+    async def sha256(self, key: str) -> str:
+        """객체 내용을 스트리밍으로 읽어 SHA-256 계산"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """객체 삭제 (없으면 무시)"""
+
+    @abstractmethod
+    def presigned_put(self, key: str, content_type: str, max_bytes: int) -> Dict:
+        """클라이언트가 직접 업로드할 URL과 함께 보낼 헤더"""
+
+    @abstractmethod
+    def download_url(self, key: str) -> str:
+        """클라이언트가 직접 내려받을 URL"""
+
+    @abstractmethod
+    def local_copy(self, key: str):
+        """ffmpeg/STT처럼 로컬 파일이 필요한 처리를 위한 경로 (async with, 원격이면 임시 파일)"""
+
+
+class LocalStorage(ObjectStorage):
+    """
+    로컬 디스크 저장소 (단일 서버 / 개발용)
+
+    presigned 업로드는 API의 PUT /storage/{key} 엔드포인트로 향하는
+    HMAC 서명 URL로 흉내낸다.
+    """
+
+    name = "local"
+
+    def __init__(self, root: Path = LOCAL_ROOT):
+        self.root = root
+
+    def local_path(self, key: str) -> Path:
+        return self.root / normalize_key(key)
+
+    def _put_file(self, path: Path, source: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(source), str(path))
+
+    async def put_file(self, key: str, source: Path, content_type: Optional[str] = None) -> None:
+        await asyncio.to_thread(self._put_file, self.local_path(key), source)
+
+    def _put_bytes(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(path.name + ".part")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+
+    async def put_bytes(self, key: str, data: bytes, content_type: Optional[str] = None) -> None:
+        await asyncio.to_thread(self._put_bytes, self.local_path(key), data)
+
+    async def get_bytes(self, key: str) -> bytes:
+        return await asyncio.to_thread(self.local_path(key).read_bytes)
+
+    async def size(self, key: str) -> Optional[int]:
+        try:
+            stat = await asyncio.to_thread(self.local_path(key).stat)
+        except FileNotFoundError:
+            return None
+        return stat.st_size
+
+    def _sha256(self, path: Path) -> str:
+        hasher = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(_READ_CHUNK_SIZE):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    async def sha256(self, key: str) -> str:
+        return await asyncio.to_thread(self._sha256, self.local_path(key))
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self.local_path(key).unlink, missing_ok=True)
+
+    def presigned_put(self, key: str, content_type: str, max_bytes: int) -> Dict:
+        key = normalize_key(key)
+        expires = int(time.time()) + settings.storage_presign_expires_seconds
+        query = urlencode({
+            "max_bytes": max_bytes,
+            "expires": expires,
+            "signature": sign_local_upload(key, max_bytes, expires)
+        })
+        return {
+            "url": f"{settings.public_base_url.rstrip('/')}/storage/{quote(key)}?{query}",
+            "method": "PUT",
+            "headers": {"Content-Type": content_type},
+            "expires_at": expires
+        }
+
+    def download_url(self, key: str) -> str:
+        return f"{settings.public_base_url.rstrip('/')}/{self.local_path(key).as_posix()}"
+
+    @asynccontextmanager
+    async def local_copy(self, key: str) -> AsyncIterator[Path]:
+        yield self.local_path(key)
+
+
+class S3Storage(ObjectStorage):
+    """
+    S3 호환 저장소 (AWS S3, MinIO 등)
+
+    boto3 패키지가 설치된 경우에만 사용할 수 있다. boto3 호출은 동기식이므로
+    모두 스레드에서 실행한다.
+    """
+
+    name = "s3"
+
+    def __init__(self):
+        if importlib.util.find_spec("boto3") is None:
+            raise StorageError("boto3 is required for the s3 storage backend")
+        if not settings.s3_bucket:
+            raise StorageError("S3_BUCKET is not configured")
+
+        import boto3
+        from botocore.config import Config
+
+        self.bucket = settings.s3_bucket
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=settings.s3_endpoint_url,
+            region_name=settings.s3_region,
+            aws_access_key_id=settings.s3_access_key_id,
+            aws_secret_access_key=settings.s3_secret_access_key,
+            config=Config(
+                signature_version="s3v4",
+                # MinIO 등은 가상 호스트 방식 버킷 주소를 지원하지 않는 경우가 많음
+                s3={"addressing_style": "path" if settings.s3_endpoint_url else "auto"},
+                max_pool_connections=settings.s3_max_connections
+            )
+        )
+
+    async def put_file(self, key: str, source: Path, content_type: Optional[str] = None) -> None:
+        extra_args = {"ContentType": content_type} if content_type else None
+        try:
+            await asyncio.to_thread(
+                self.client.upload_file, str(source), self.bucket, normalize_key(key), ExtraArgs=extra_args
+            )
+        finally:
+            source.unlink(missing_ok=True)
+
+    async def put_bytes(self, key: str, data: bytes, content_type: Optional[str] = None) -> None:
+        params = {"Bucket": self.bucket, "Key": normalize_key(key), "Body": data}
+        if content_type:
+            params["ContentType"] = content_type
+        await asyncio.to_thread(self.client.put_object, **params)
+
+    def _get_bytes(self, key: str) -> bytes:
+        response = self.client.get_object(Bucket=self.bucket, Key=key)
+        return response["Body"].read()
+
+    async def get_bytes(self, key: str) -> bytes:
+        return await asyncio.to_thread(self._get_bytes, normalize_key(key))
+
+    def _size(self, key: str) -> Optional[int]:
+        try:
+            response = self.client.head_object(Bucket=self.bucket, Key=key)
+        except self.client.exceptions.ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return response["ContentLength"]
+
+    async def size(self, key: str) -> Optional[int]:
+        return await asyncio.to_thread(self._size, normalize_key(key))
+
+    def _sha256(self, key: str) -> str:
+        hasher = hashlib.sha256()
+        response = self.client.get_object(Bucket=self.bucket, Key=key)
+        for chunk in response["Body"].iter_chunks(_READ_CHUNK_SIZE):
+            hasher.update(chunk)
+        return hasher.hexdigest()
+
+    async def sha256(self, key: str) -> str:
+        return await asyncio.to_thread(self._sha256, normalize_key(key))
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket, Key=normalize_key(key))
+
+    def presigned_put(self, key: str, content_type: str, max_bytes: int) -> Dict:
+        # S3 presigned PUT은 크기를 강제할 수 없으므로 업로드 확인 단계에서 검사
+        expires_in = settings.storage_presign_expires_seconds
+        url = self.client.generate_presigned_url(
+            "put_object",
+            Params={"Bucket": self.bucket, "Key": normalize_key(key), "ContentType": content_type},
+            ExpiresIn=expires_in
+        )
+        return {
+            "url": url,
+            "method": "PUT",
+            "headers": {"Content-Type": content_type},
+            "expires_at": int(time.time()) + expires_in
+        }
+
+    def download_url(self, key: str) -> str:
+        key = normalize_key(key)
+        if settings.s3_public_base_url:
+            return f"{settings.s3_public_base_url.rstrip('/')}/{quote(key)}"
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=settings.storage_presign_expires_seconds
+        )
+
+    @asynccontextmanager
+    async def local_copy(self, key: str) -> AsyncIterator[Path]:
+        key = normalize_key(key)
+        fd, temp_name = tempfile.mkstemp(suffix=Path(key).suffix)
+        os.close(fd)
+        temp_path = Path(temp_name)
+        try:
+            await asyncio.to_thread(self.client.download_file, self.bucket, key, temp_name)
+            yield temp_path
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+
+_storage: Optional[ObjectStorage] = None
+
+
+def get_storage() -> ObjectStorage:
+    """
+    설정된 저장소 백엔드 (프로세스당 하나)
+
+    Raises:
+        StorageError: 알 수 없는 백엔드 또는 설정 누락
+    """
+    global _storage
+    if _storage is None:
+        if settings.storage_backend == "local":
+            _storage = LocalStorage()
+        elif settings.storage_backend == "s3":
+            _storage = S3Storage()
+        else:
+            raise StorageError(f"Unknown storage backend: {settings.storage_backend}")
+    return _storage
@@ -0,0 +1,41 @@
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from typing import Optional
+from app.config import settings
+
+# 프로세스 전역 OpenAI 클라이언트 (앱 lifespan에서 생성/종료)
+_client: Optional[AsyncOpenAI] = None
+
+
+def init_openai_client() -> AsyncOpenAI:
+    """커넥션 풀을 공유하는 AsyncOpenAI 클라이언트 생성"""
+    global _client
+    if _client is None:
+        http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=settings.openai_max_connections,
+                max_keepalive_connections=settings.openai_max_keepalive_connections,
+                keepalive_expiry=settings.openai_keepalive_expiry_seconds
+            )
+        )
+        # 재시도는 app.services.resilience에서 처리 (SDK 재시도와 겹치지 않도록 끔)
+        _client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            base_url=settings.openai_base_url,
+            http_client=http_client,
+            max_retries=0
+        )
+    return _client
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """공유 클라이언트 반환 (lifespan 밖에서 호출되면 지연 생성)"""
+    return init_openai_client()
+
+
+async def close_openai_client():
+    """공유 클라이언트와 커넥션 풀 종료"""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -0,0 +1,189 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from sqlalchemy import select, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.audio import AudioFile
+from app.models.pipeline import PipelineJob
+from app.services.events import publish_event
+from app.services.heartbeat import job_heartbeat
+from app.services.rate_limiter import batch_priority
+from app.services.gpt import organize_recipe_from_text
+from app.services.recipes import build_recipe
+from app.utils.metrics import PIPELINE_STAGE_SECONDS
+
+# 정리 단계 워커 태스크와 새 작업 알림용 이벤트 (프로세스 단위)
+_workers: List[asyncio.Task] = []
+_wakeup: Optional[asyncio.Event] = None
+
+# 업로드 단계 동시 처리 수 제한 (디스크/저장소 쓰기와 해시 계산)
+_upload_slots: Optional[asyncio.Semaphore] = None
+
+
+def upload_slots() -> asyncio.Semaphore:
+    global _upload_slots
+    if _upload_slots is None:
+        _upload_slots = asyncio.Semaphore(settings.pipeline_upload_concurrency)
+    return _upload_slots
+
+
+def notify_organize_workers():
+    """대기 중인 정리 단계 워커를 깨움"""
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+def record_stage_time(job: PipelineJob, name: str, phase: str, seconds: float) -> None:
+    """작업 행과 Prometheus에 단계 소요 시간 기록"""
+    key = name if phase == "run" else f"{name}_{phase}"
+    # JSON 컬럼은 새 dict를 대입해야 변경이 감지됨
+    job.timings = {**(job.timings or {}), key: round(seconds, 3)}
+    PIPELINE_STAGE_SECONDS.labels(name, phase).observe(seconds)
+
+
+def _stage_wait_seconds(job: PipelineJob) -> float:
+    if job.stage_enqueued_at is None:
+        return 0.0
+    return max((datetime.now(timezone.utc) - job.stage_enqueued_at).total_seconds(), 0.0)
+
+
+async def advance_after_transcription(db: AsyncSession, audio_file: AudioFile, run_seconds: float) -> None:
+    """
+    STT가 끝난 오디오에 연결된 파이프라인 작업을 정리 단계로 넘김
+
+    STT 워커가 결과를 저장한 같은 트랜잭션에서 호출한다 (커밋은 호출한 쪽에서).
+    """
+    result = await db.execute(
+        select(PipelineJob).where(
+            PipelineJob.audio_file_id == audio_file.id,
+            PipelineJob.stage == "transcribe",
+            PipelineJob.status.in_(("pending", "running"))
+        )
+    )
+    for job in result.scalars().all():
+        record_stage_time(job, "transcribe", "wait", max(_stage_wait_seconds(job) - run_seconds, 0.0))
+        record_stage_time(job, "transcribe", "run", run_seconds)
+
+        if audio_file.processing_status == "completed":
+            job.stage = "organize"
+            job.status = "pending"
+            job.stage_enqueued_at = datetime.now(timezone.utc)
+        else:
+            job.status = "failed"
+            job.error = "Transcription failed"
+
+
+async def claim_organize_job(db: AsyncSession) -> Optional[PipelineJob]:
+    """
+    대기 중인 정리 단계 작업 하나를 가져와 'running' 상태로 변경
+
+    STT 큐와 같이 FOR UPDATE SKIP LOCKED를 사용하고,
+    heartbeat가 오래 끊긴 'running' 작업(워커 비정상 종료)만 다시 가져간다.
+    """
+    stale_before = datetime.now(timezone.utc) - timedelta(seconds=settings.job_stale_after_seconds)
+
+    result = await db.execute(
+        select(PipelineJob)
+        .where(
+            PipelineJob.stage == "organize",
+            or_(
+                PipelineJob.status == "pending",
+                and_(
+                    PipelineJob.status == "running",
+                    PipelineJob.updated_at < stale_before
+                )
+            )
+        )
+        .order_by(PipelineJob.stage_enqueued_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    job = result.scalar_one_or_none()
+
+    if job is None:
+        await db.rollback()
+        return None
+
+    record_stage_time(job, "organize", "wait", _stage_wait_seconds(job))
+    job.status = "running"
+    await db.commit()
+    return job
+
+
+async def run_organize_job(db: AsyncSession, job: PipelineJob) -> None:
+    """변환 텍스트로 레시피를 정리해 저장하고 작업을 완료 처리"""
+    start = time.perf_counter()
+
+    audio_file = await db.get(AudioFile, job.audio_file_id)
+    organized_recipe = None
+    if audio_file is not None and audio_file.transcript_text:
+        # GPT 호출 동안에는 커넥션을 잡고 있지 않도록 트랜잭션을 닫아 둠
+        transcript_text = audio_file.transcript_text
+        await db.commit()
+        try:
+            async with job_heartbeat(PipelineJob, job.id, PipelineJob.status, "running"):
+                organized_recipe = await organize_recipe_from_text(
+                    transcript_text,
+                    force_refresh=job.force_regenerate
+                )
+        except Exception as e:
+            print(f"Pipeline organize error ({job.id}): {e}")
+
+    if organized_recipe:
+        recipe = build_recipe(job.user_id, job.audio_file_id, organized_recipe)
+        db.add(recipe)
+        await db.flush()
+
+        job.recipe_id = recipe.id
+        job.stage = "done"
+        job.status = "completed"
+        await publish_event(db, job.audio_file_id, "recipe_ready", recipe_id=str(recipe.id))
+    else:
+        job.status = "failed"
+        job.error = "Failed to organize recipe"
+
+    record_stage_time(job, "organize", "run", time.perf_counter() - start)
+    await db.commit()
+
+
+async def _organize_worker_loop(worker_id: int):
+    """정리 단계 큐에서 작업을 가져와 처리하는 워커 루프"""
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                job = await claim_organize_job(db)
+                if job is not None:
+                    await run_organize_job(db, job)
+                    continue
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Pipeline worker {worker_id} error: {e}")
+
+        # 새 작업 알림 또는 폴링 주기까지 대기
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=settings.job_poll_interval_seconds)
+        except asyncio.TimeoutError:
+            pass
+        _wakeup.clear()
+
+
+def start_pipeline_workers():
+    """설정된 개수만큼 정리 단계 워커 시작"""
+    global _wakeup
+    _wakeup = asyncio.Event()
+    # 태스크는 생성 시점의 컨텍스트를 복사하므로 워커의 OpenAI 호출은 모두 배치 우선순위
+    with batch_priority():
+        for worker_id in range(settings.pipeline_organize_workers):
+            _workers.append(asyncio.create_task(_organize_worker_loop(worker_id)))
+
+
+async def stop_pipeline_workers():
+    """실행 중인 정리 단계 워커 종료"""
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
@@ -0,0 +1,342 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import func, select
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.rate_limit import OpenAIRateBucket
+from app.utils.metrics import OPENAI_QUEUE_SECONDS
+
+# 우선순위 (낮을수록 먼저 배정)
+INTERACTIVE = "interactive"
+BATCH = "batch"
+_PRIORITY_RANK = {INTERACTIVE: 0, BATCH: 1}
+
+# 현재 태스크의 OpenAI 호출 우선순위 (기본은 사용자가 기다리는 대화형 요청)
+_priority: ContextVar[str] = ContextVar("openai_priority", default=INTERACTIVE)
+# 현재 태스크의 OpenAI 호출을 포기하는 시각 (time.monotonic 기준, 없으면 None)
+_deadline: ContextVar[Optional[float]] = ContextVar("openai_deadline", default=None)
+
+
+class RateLimitTimeoutError(Exception):
+    """제한 시간 안에 OpenAI 요청 한도를 배정받지 못한 경우"""
+
+
+@contextmanager
+def batch_priority() -> Iterator[None]:
+    """
+    블록 안의 OpenAI 호출을 배치 우선순위로 예약
+
+    블록 안에서 만든 태스크(asyncio.gather 등)에도 그대로 적용된다.
+    """
+    token = _priority.set(BATCH)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@contextmanager
+def call_deadline(give_up_at: float) -> Iterator[None]:
+    """블록 안의 한도 대기가 give_up_at(time.monotonic 기준)을 넘지 않도록 제한"""
+    token = _deadline.set(give_up_at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def _queue_timeout() -> float:
+    """대기열에서 기다릴 수 있는 시간 (설정값과 호출의 남은 제한 시간 중 짧은 쪽)"""
+    timeout = settings.openai_queue_timeout_seconds
+    give_up_at = _deadline.get()
+    if give_up_at is not None:
+        timeout = min(timeout, give_up_at - time.monotonic())
+    return timeout
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    텍스트의 토큰 수를 넉넉하게 추정
+
+    한글은 대략 글자(UTF-8 3바이트)당 1토큰, 영문은 4글자당 1토큰이므로
+    바이트 수 / 3이면 어느 쪽이든 실제보다 적게 잡지 않는다.
+    """
+    return len(text.encode("utf-8")) // 3 + 1
+
+
+def estimate_chat_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+    """채팅 요청 한 번이 한도에서 차지할 토큰 수 (OpenAI도 max_tokens를 미리 반영함)"""
+    return sum(estimate_tokens(message["content"]) + 4 for message in messages) + max_tokens
+
+
+@dataclass
+class _BucketState:
+    requests: float
+    tokens: float
+    updated: float  # 마지막으로 채운 시각 (초)
+
+
+def _take(state: _BucketState, now: float, rpm: int, tpm: int, cost: int, reserve_ratio: float) -> float:
+    """
+    경과 시간만큼 버킷을 채운 뒤 요청 1개와 토큰 cost를 차감
+
+    reserve_ratio만큼은 남긴 채로만 가져간다 (배치 작업이 대화형 몫까지 쓰지 않도록).
+
+    Returns:
+        0이면 차감 성공, 아니면 다시 시도하기까지 기다릴 시간(초)
+    """
+    elapsed = max(now - state.updated, 0.0)
+    state.updated = now
+    wait = 0.0
+
+    if rpm > 0:
+        state.requests = min(float(rpm), state.requests + elapsed * rpm / 60)
+        needed = 1 + rpm * reserve_ratio
+        if state.requests < needed:
+            wait = max(wait, (needed - state.requests) * 60 / rpm)
+
+    if tpm > 0:
+        # 한도보다 큰 요청도 언젠가는 통과하도록 버킷 크기로 자름
+        cost = min(cost, int(tpm * (1 - reserve_ratio)))
+        state.tokens = min(float(tpm), state.tokens + elapsed * tpm / 60)
+        needed = cost + tpm * reserve_ratio
+        if state.tokens < needed:
+            wait = max(wait, (needed - state.tokens) * 60 / tpm)
+
+    if wait > 0:
+        return wait
+
+    if rpm > 0:
+        state.requests -= 1
+    if tpm > 0:
+        state.tokens -= cost
+    return 0.0
+
+
+def _give_back(state: _BucketState, rpm: int, tpm: int, tokens: int, requests: int) -> None:
+    """차감했던 요청/토큰을 버킷 크기 안에서 되돌림"""
+    if rpm > 0 and requests > 0:
+        state.requests = min(float(rpm), state.requests + requests)
+    if tpm > 0 and tokens > 0:
+        state.tokens = min(float(tpm), state.tokens + tokens)
+
+
+class LocalRateStore:
+    """프로세스 메모리 토큰 버킷 (단일 프로세스 배포와 개발용)"""
+
+    def __init__(self):
+        self._states: Dict[str, _BucketState] = {}
+
+    def _state(self, name: str, rpm: int, tpm: int) -> _BucketState:
+        if name not in self._states:
+            self._states[name] = _BucketState(float(rpm), float(tpm), time.monotonic())
+        return self._states[name]
+
+    async def take(self, name: str, rpm: int, tpm: int, cost: int, reserve_ratio: float) -> float:
+        return _take(self._state(name, rpm, tpm), time.monotonic(), rpm, tpm, cost, reserve_ratio)
+
+    async def refund(self, name: str, rpm: int, tpm: int, tokens: int, requests: int = 0) -> None:
+        state = self._state(name, rpm, tpm)
+        _give_back(state, rpm, tpm, tokens, requests)
+
+
+class PostgresRateStore:
+    """
+    openai_rate_buckets 행에 저장된 토큰 버킷 (모든 프로세스가 공유)
+
+    행을 FOR UPDATE로 잠근 짧은 트랜잭션 안에서 채우고 차감하며,
+    시각은 DB 시계를 써서 서버 간 시계 차이의 영향을 받지 않는다.
+    DB 오류가 나면 호출을 막지 않고 통과시킨다.
+    """
+
+    async def _lock_row(self, db, name: str, rpm: int, tpm: int) -> Tuple[OpenAIRateBucket, float]:
+        now = (await db.execute(select(func.clock_timestamp()))).scalar_one()
+        row = await db.get(OpenAIRateBucket, name, with_for_update=True)
+        if row is None:
+            row = OpenAIRateBucket(name=name, requests=float(rpm), tokens=float(tpm), updated_at=now)
+            db.add(row)
+            await db.flush()
+        return row, now
+
+    async def take(self, name: str, rpm: int, tpm: int, cost: int, reserve_ratio: float) -> float:
+        try:
+            async with AsyncSessionLocal() as db:
+                row, now = await self._lock_row(db, name, rpm, tpm)
+                state = _BucketState(row.requests, row.tokens, row.updated_at.timestamp())
+                wait = _take(state, now.timestamp(), rpm, tpm, cost, reserve_ratio)
+
+                row.requests = state.requests
+                row.tokens = state.tokens
+                row.updated_at = now
+                await db.commit()
+                return wait
+        except Exception as e:
+            print(f"Rate limit store error ({name}): {e}")
+            return 0.0
+
+    async def refund(self, name: str, rpm: int, tpm: int, tokens: int, requests: int = 0) -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                row, _ = await self._lock_row(db, name, rpm, tpm)
+                state = _BucketState(row.requests, row.tokens, 0.0)
+                _give_back(state, rpm, tpm, tokens, requests)
+                row.requests = state.requests
+                row.tokens = state.tokens
+                await db.commit()
+        except Exception as e:
+            print(f"Rate limit refund error ({name}): {e}")
+
+
+_store = None
+
+
+def get_rate_store():
+    """설정된 한도 저장소 반환 (프로세스 단위 싱글턴)"""
+    global _store
+    if _store is None:
+        if settings.openai_rate_limit_backend == "postgres":
+            _store = PostgresRateStore()
+        elif settings.openai_rate_limit_backend == "local":
+            _store = LocalRateStore()
+        else:
+            raise ValueError(f"Unknown rate limit backend: {settings.openai_rate_limit_backend}")
+    return _store
+
+
+class RateLimiter:
+    """
+    분당 요청/토큰 한도 안에서 OpenAI 호출을 순서대로 배정하는 스케줄러
+
+    한도가 부족하면 실패하지 않고 대기열에 넣는다. 대기열은 우선순위(대화형 먼저),
+    같은 우선순위 안에서는 도착 순서로 처리되며, 프로세스마다 배정 태스크 하나가
+    맨 앞 요청에 한도가 생길 때까지 기다렸다가 배정한다.
+    """
+
+    def __init__(self, name: str, rpm: int, tpm: int = 0):
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+        # (우선순위, 도착 순서, 토큰 비용, 배정을 알릴 future)
+        self._waiters: List[Tuple[int, int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._changed = asyncio.Event()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.rpm > 0 or self.tpm > 0
+
+    async def acquire(self, cost: int, priority: str = INTERACTIVE) -> None:
+        """
+        한도가 배정될 때까지 대기
+
+        Raises:
+            RateLimitTimeoutError: openai_queue_timeout_seconds 또는 호출의 남은 제한 시간 안에 배정받지 못함
+        """
+        if not self.enabled:
+            return
+
+        timeout = _queue_timeout()
+        if timeout <= 0:
+            raise RateLimitTimeoutError(f"No time left to wait for {self.name} rate limit")
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (_PRIORITY_RANK[priority], next(self._sequence), cost, future))
+        self._changed.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            raise RateLimitTimeoutError(f"Timed out waiting for {self.name} rate limit")
+        finally:
+            OPENAI_QUEUE_SECONDS.labels(self.name, priority).observe(time.perf_counter() - start)
+
+    async def refund(self, tokens: int, requests: int = 0) -> None:
+        """예약한 토큰보다 실제 사용량이 적거나 배정을 쓰지 않았으면 차액 반환"""
+        if (self.tpm > 0 and tokens > 0) or (self.rpm > 0 and requests > 0):
+            await get_rate_store().refund(self.name, self.rpm, self.tpm, tokens, requests)
+            self._changed.set()
+
+    async def _dispatch(self):
+        while self._waiters:
+            entry = self._waiters[0]
+            rank, _, cost, future = entry
+            if future.done():
+                # 대기 시간 초과로 취소된 요청
+                heapq.heappop(self._waiters)
+                continue
+
+            reserve_ratio = settings.openai_batch_reserve_ratio if rank > 0 else 0.0
+            self._changed.clear()
+            wait = await get_rate_store().take(self.name, self.rpm, self.tpm, cost, reserve_ratio)
+
+            if wait <= 0:
+                # 차감하는 동안 더 앞선 요청이 들어왔을 수 있으므로 해당 항목을 직접 제거
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                if future.done():
+                    # 차감하는 사이 대기 시간 초과로 취소됨: 요청 1개와 토큰 모두 반환
+                    await self.refund(cost, requests=1)
+                else:
+                    future.set_result(None)
+                continue
+
+            # 한도가 찰 때까지, 또는 더 급한 요청이 들어오거나 반환이 생길 때까지 대기
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+
+
+class RateLimitSlot:
+    """배정받은 호출 한 번 (응답의 usage로 실제 사용량을 기록하면 남은 예약을 반환)"""
+
+    def __init__(self, reserved_tokens: int):
+        self.reserved_tokens = reserved_tokens
+        self.used_tokens: Optional[int] = None
+
+    def record_usage(self, usage: Optional[Any]) -> None:
+        if usage is not None and usage.total_tokens is not None:
+            self.used_tokens = usage.total_tokens
+
+
+_limiters: Dict[str, RateLimiter] = {
+    "chat": RateLimiter("chat", settings.openai_chat_rpm, settings.openai_chat_tpm),
+    "transcription": RateLimiter("transcription", settings.openai_transcription_rpm),
+}
+
+
+@asynccontextmanager
+async def openai_rate_limit(bucket: str, tokens: int = 0) -> AsyncIterator[RateLimitSlot]:
+    """
+    OpenAI 호출 전에 분당 요청/토큰 한도를 배정받음
+
+    사용 예:
+        async with openai_rate_limit("chat", estimate_chat_tokens(messages, 2000)) as slot:
+            response = await client.chat.completions.create(...)
+            slot.record_usage(response.usage)
+    """
+    limiter = _limiters[bucket]
+    await limiter.acquire(tokens, _priority.get())
+    slot = RateLimitSlot(tokens)
+
+    failed = True
+    try:
+        yield slot
+        failed = False
+    finally:
+        if limiter.enabled:
+            if slot.used_tokens is not None:
+                await limiter.refund(slot.reserved_tokens - slot.used_tokens)
+            elif failed:
+                # 응답(usage)을 받지 못하고 실패한 호출은 토큰을 쓰지 않은 것으로 봄
+                await limiter.refund(slot.reserved_tokens)
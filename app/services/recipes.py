@@ -0,0 +1,47 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+from app.config import settings
+from app.models.recipe import Recipe
+from app.services.gpt import organize_recipe_from_text
+from app.services.ingredients import build_ingredient_entries
+from app.services.rate_limiter import batch_priority
+
+
+def build_recipe(user_id, source_audio_id: Optional[Any], organized_recipe: Dict[str, Any]) -> Recipe:
+    """GPT로 정리된 레시피 데이터로 Recipe(재료 인덱스 포함) 생성"""
+    recipe = Recipe(
+        user_id=user_id,
+        source_audio_id=source_audio_id,
+        title=organized_recipe.get("title", "정리된 레시피"),
+        description=organized_recipe.get("description"),
+        ingredients=organized_recipe.get("ingredients"),
+        steps=organized_recipe.get("steps"),
+        tips=organized_recipe.get("tips"),
+        servings=organized_recipe.get("servings"),
+        cooking_time=organized_recipe.get("cooking_time"),
+        difficulty=organized_recipe.get("difficulty"),
+        category=organized_recipe.get("category")
+    )
+    recipe.ingredient_entries = build_ingredient_entries(user_id, recipe.ingredients)
+    return recipe
+
+
+async def organize_recipes(transcripts: List[str], force_refresh: bool = False) -> List[Optional[Dict[str, Any]]]:
+    """
+    여러 변환 텍스트를 동시에 레시피로 정리 (입력 순서대로 반환, 실패한 항목은 None)
+
+    동시 GPT 호출 수는 recipe_batch_concurrency로 제한한다.
+    """
+    semaphore = asyncio.Semaphore(settings.recipe_batch_concurrency)
+
+    async def organize(transcript_text: str) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            try:
+                return await organize_recipe_from_text(transcript_text, force_refresh=force_refresh)
+            except Exception as e:
+                print(f"Batch organize error: {e}")
+                return None
+
+    # 한도가 부족하면 대화형 요청이 먼저 배정받도록 배치 우선순위로 예약
+    with batch_priority():
+        return await asyncio.gather(*(organize(text) for text in transcripts))
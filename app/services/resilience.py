@@ -0,0 +1,197 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+import openai
+from app.config import settings
+from app.services.rate_limiter import call_deadline
+from app.utils.metrics import OPENAI_CIRCUIT_EVENTS, OPENAI_HEDGED_REQUESTS, OPENAI_RETRIES
+
+T = TypeVar("T")
+
+# 잠시 후 다시 보내면 성공할 수 있는 오류 (연결 실패/타임아웃, 429, 5xx, 시도 제한 시간 초과)
+RETRYABLE_ERRORS = (
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+    asyncio.TimeoutError,
+)
+
+
+class CircuitOpenError(Exception):
+    """연속 실패로 차단기가 열려 있어 호출을 보내지 않은 경우"""
+
+
+class CircuitBreaker:
+    """
+    업스트림 장애 시 호출을 바로 실패시키는 차단기 (프로세스 단위)
+
+    재시도 가능한 오류가 연속으로 threshold번 나면 열리고, reset_seconds가 지나면
+    시험 호출 하나만 통과시켜 성공하면 닫고 실패하면 다시 연다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_started: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self._probe_started is not None:
+            return "half_open"
+        return "open"
+
+    def before_call(self) -> None:
+        """
+        Raises:
+            CircuitOpenError: 차단기가 열려 있음
+        """
+        if self.opened_at is None:
+            return
+
+        now = time.monotonic()
+        reset_seconds = settings.openai_circuit_reset_seconds
+        # 시험 호출이 끝나지 않고 사라진 경우(취소 등)에도 다음 시험 호출은 허용
+        probing = self._probe_started is not None and now - self._probe_started < reset_seconds
+        if now - self.opened_at < reset_seconds or probing:
+            OPENAI_CIRCUIT_EVENTS.labels(self.name, "rejected").inc()
+            raise CircuitOpenError(f"OpenAI {self.name} circuit is open")
+
+        self._probe_started = now
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probe_started = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.opened_at is None and self.failures < settings.openai_circuit_failure_threshold:
+            return
+
+        if self.opened_at is None:
+            OPENAI_CIRCUIT_EVENTS.labels(self.name, "opened").inc()
+        self.opened_at = time.monotonic()
+        self._probe_started = None
+
+
+_breakers: Dict[str, CircuitBreaker] = {
+    "chat": CircuitBreaker("chat"),
+    "transcription": CircuitBreaker("transcription"),
+}
+
+
+def _call_policy(bucket: str) -> Tuple[float, float]:
+    """(시도 한 번의 제한 시간, 재시도를 포함한 전체 제한 시간)"""
+    if bucket == "transcription":
+        return settings.openai_transcription_timeout_seconds, settings.openai_transcription_deadline_seconds
+    return settings.openai_chat_timeout_seconds, settings.openai_chat_deadline_seconds
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """429/503 응답의 Retry-After 헤더 (없거나 해석할 수 없으면 None)"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+
+    for header, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = response.headers.get(header)
+        if value is None:
+            continue
+        try:
+            return max(float(value) * scale, 0.0)
+        except ValueError:
+            continue
+    return None
+
+
+def _backoff_delay(attempt: int, error: Exception) -> float:
+    """지수 백오프 + full jitter (서버가 Retry-After를 주면 그 값을 따름)"""
+    retry_after = _retry_after_seconds(error)
+    if retry_after is not None:
+        return min(retry_after, settings.openai_retry_max_seconds)
+
+    cap = min(settings.openai_retry_max_seconds, settings.openai_retry_base_seconds * 2 ** attempt)
+    return random.uniform(0, cap)
+
+
+async def hedged(operation: str, call: Callable[[], Awaitable[T]], hedge_after: float) -> T:
+    """
+    첫 요청이 hedge_after초 안에 끝나지 않으면 같은 요청을 하나 더 보내 먼저 성공한 응답을 사용
+
+    응답이 짧고 같은 요청을 두 번 보내도 문제없는 호출에만 쓴다.
+    둘 다 실패하면 첫 요청의 오류를 올린다.
+    """
+    if hedge_after <= 0:
+        return await call()
+
+    first = asyncio.ensure_future(call())
+    done, _ = await asyncio.wait({first}, timeout=hedge_after)
+    if done:
+        return first.result()
+
+    OPENAI_HEDGED_REQUESTS.labels(operation, "launched").inc()
+    second = asyncio.ensure_future(call())
+    pending = {first, second}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is second:
+                        OPENAI_HEDGED_REQUESTS.labels(operation, "won").inc()
+                    return task.result()
+        raise first.exception()
+    finally:
+        for task in (first, second):
+            task.cancel()
+
+
+async def call_openai(
+    operation: str,
+    bucket: str,
+    attempt: Callable[[float], Awaitable[T]],
+    hedge_after: float = 0.0
+) -> T:
+    """
+    제한 시간, 재시도, 차단기를 적용해 OpenAI 호출 실행
+
+    attempt(timeout)은 요청 한 번을 보내고 timeout초 안에 끝내야 한다.
+    재시도 가능한 오류면 백오프 후 다시 시도하고, 재시도 횟수나 전체 제한 시간을
+    넘기면 마지막 오류를 그대로 올린다. 4xx 같은 요청 자체의 오류는 재시도하지 않는다.
+    attempt 안의 요청 한도 대기도 전체 제한 시간을 넘지 않는다.
+
+    Raises:
+        CircuitOpenError: 차단기가 열려 있음
+        RateLimitTimeoutError: 제한 시간 안에 요청 한도를 배정받지 못함
+    """
+    breaker = _breakers[bucket]
+    timeout, deadline = _call_policy(bucket)
+    give_up_at = time.monotonic() + deadline
+    retries = 0
+
+    while True:
+        breaker.before_call()
+        attempt_timeout = min(timeout, give_up_at - time.monotonic())
+        try:
+            with call_deadline(give_up_at):
+                result = await hedged(operation, lambda: attempt(attempt_timeout), hedge_after)
+        except RETRYABLE_ERRORS as e:
+            breaker.record_failure()
+            delay = _backoff_delay(retries, e)
+            if retries >= settings.openai_max_retries or time.monotonic() + delay >= give_up_at:
+                raise
+            retries += 1
+            OPENAI_RETRIES.labels(operation, type(e).__name__).inc()
+            await asyncio.sleep(delay)
+            continue
+        except openai.APIStatusError:
+            # 4xx: 업스트림은 응답하고 있으므로 차단기는 닫힌 것으로 봄
+            breaker.record_success()
+            raise
+
+        breaker.record_success()
+        return result
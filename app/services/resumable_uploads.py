@@ -0,0 +1,253 @@
+import asyncio
+import base64
+import binascii
+import hashlib
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import BinaryIO, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models.audio import AudioFile, UploadSession
+from app.services.object_storage import get_storage
+from app.services.storage import STAGING_DIR
+from app.services.stt import estimate_audio_duration
+from app.utils.metrics import UPLOAD_BYTES
+
+
+class UploadOffsetMismatchError(Exception):
+    """PATCH의 Upload-Offset이 서버가 받은 크기와 다른 경우"""
+
+    def __init__(self, expected: int):
+        super().__init__(f"Expected offset {expected}")
+        self.expected = expected
+
+
+class UploadChecksumError(Exception):
+    """청크 체크섬이 맞지 않거나 지원하지 않는 알고리즘인 경우"""
+
+
+class UploadIncompleteError(Exception):
+    """아직 전체 크기를 받지 못한 세션을 완료하려는 경우"""
+
+
+def part_key(session_id, offset: int) -> str:
+    """
+    청크 하나의 저장소 키 (시작 위치로 이름 붙임)
+
+    어느 서버가 PATCH를 받든 같은 저장소에 쌓이고, 기록 후 커밋 전에 끊긴 청크는
+    같은 offset으로 다시 보내면 덮어쓴다.
+    """
+    return f"sessions/{session_id}/{offset:012d}.part"
+
+
+def final_key(upload: UploadSession) -> str:
+    """
+    완성된 파일의 저장소 키 (세션마다 고정)
+
+    완료를 다시 시도해도 같은 키를 쓰므로 이전 시도가 올려 둔 파일을 재사용할 수 있다.
+    """
+    file_extension = Path(upload.file_name).suffix or ".wav"
+    return f"audio/{upload.user_id}_{upload.id.hex}{file_extension}"
+
+
+def verify_checksum(header: Optional[str], data: bytes) -> None:
+    """
+    tus Upload-Checksum 헤더("sha256 <base64>") 검증
+
+    Raises:
+        UploadChecksumError: 형식 오류, 지원하지 않는 알고리즘, 불일치
+    """
+    if header is None:
+        return
+
+    algorithm, _, encoded = header.strip().partition(" ")
+    if algorithm.lower() != "sha256":
+        raise UploadChecksumError(f"Unsupported checksum algorithm: {algorithm}")
+
+    try:
+        expected = base64.b64decode(encoded.strip(), validate=True)
+    except binascii.Error:
+        raise UploadChecksumError("Malformed checksum")
+
+    if hashlib.sha256(data).digest() != expected:
+        raise UploadChecksumError("Checksum mismatch")
+
+
+def _open_staging_file() -> BinaryIO:
+    STAGING_DIR.mkdir(parents=True, exist_ok=True)
+    return tempfile.NamedTemporaryFile(dir=STAGING_DIR, suffix=".upload", delete=False)
+
+
+def _append_part(buffer: BinaryIO, hasher, data: bytes) -> None:
+    # 해시 계산과 디스크 쓰기를 함께 스레드에서 수행
+    hasher.update(data)
+    buffer.write(data)
+
+
+async def _assemble_parts(upload: UploadSession) -> Tuple[Path, str]:
+    """
+    저장소의 청크들을 순서대로 이어 임시 파일로 조립
+
+    Returns:
+        (임시 파일 경로, SHA-256)
+    """
+    storage = get_storage()
+    hasher = hashlib.sha256()
+    buffer = await asyncio.to_thread(_open_staging_file)
+    path = Path(buffer.name)
+    try:
+        with buffer:
+            for offset in upload.part_offsets:
+                data = await storage.get_bytes(part_key(upload.id, offset))
+                await asyncio.to_thread(_append_part, buffer, hasher, data)
+    except Exception:
+        await asyncio.to_thread(path.unlink, missing_ok=True)
+        raise
+    return path, hasher.hexdigest()
+
+
+async def _delete_parts(upload: UploadSession) -> None:
+    storage = get_storage()
+    for offset in upload.part_offsets or []:
+        await storage.delete(part_key(upload.id, offset))
+
+
+async def create_upload_session(
+    db: AsyncSession,
+    user_id,
+    file_name: str,
+    content_type: Optional[str],
+    upload_length: int
+) -> UploadSession:
+    """업로드 세션 생성 (청크는 PATCH마다 저장소에 객체로 쌓임)"""
+    upload = UploadSession(
+        user_id=user_id,
+        file_name=file_name,
+        content_type=content_type,
+        upload_length=upload_length,
+        upload_offset=0,
+        part_offsets=[],
+        status="uploading",
+        expires_at=datetime.now(timezone.utc) + timedelta(seconds=settings.resumable_session_ttl_seconds)
+    )
+    db.add(upload)
+    await db.commit()
+    return upload
+
+
+async def get_upload_session(
+    db: AsyncSession,
+    upload_id: str,
+    user_id,
+    for_update: bool = False
+) -> Optional[UploadSession]:
+    """사용자의 만료되지 않은 업로드 세션 조회"""
+    query = select(UploadSession).where(
+        UploadSession.id == upload_id,
+        UploadSession.user_id == user_id,
+        UploadSession.expires_at > datetime.now(timezone.utc)
+    )
+    if for_update:
+        query = query.with_for_update()
+
+    result = await db.execute(query)
+    return result.scalar_one_or_none()
+
+
+async def append_chunk(db: AsyncSession, upload: UploadSession, offset: int, data: bytes) -> int:
+    """
+    청크를 저장소에 객체로 올리고 새 offset 반환
+
+    upload는 FOR UPDATE로 잠근 상태여야 한다 (같은 세션의 동시 PATCH 방지).
+
+    Raises:
+        UploadOffsetMismatchError: offset이 지금까지 받은 크기와 다름
+    """
+    if offset != upload.upload_offset:
+        raise UploadOffsetMismatchError(upload.upload_offset)
+
+    await get_storage().put_bytes(part_key(upload.id, offset), data, upload.content_type)
+    UPLOAD_BYTES.labels("audio").inc(len(data))
+
+    # JSON 컬럼은 새 리스트를 할당해야 변경으로 기록됨
+    upload.part_offsets = [*(upload.part_offsets or []), offset]
+    upload.upload_offset = offset + len(data)
+    await db.commit()
+    return upload.upload_offset
+
+
+async def finalize_upload(db: AsyncSession, upload: UploadSession) -> AudioFile:
+    """
+    청크들을 이어 붙여 저장소에 올리고 AudioFile 생성
+
+    이미 완료된 세션이면 만들어 둔 AudioFile을 그대로 반환한다.
+    파일은 세션마다 고정된 키에 올리고 청크는 커밋한 뒤에 지우므로, 파일을 올린 뒤
+    커밋이 실패했다면 다시 호출했을 때 올려 둔 파일을 재사용한다.
+    upload는 FOR UPDATE로 잠근 상태여야 한다.
+
+    Raises:
+        UploadIncompleteError: 아직 전체 크기를 받지 못함
+    """
+    if upload.status == "completed" and upload.audio_file_id is not None:
+        return await db.get(AudioFile, upload.audio_file_id)
+
+    if upload.upload_offset != upload.upload_length:
+        raise UploadIncompleteError(f"Received {upload.upload_offset} of {upload.upload_length} bytes")
+
+    storage = get_storage()
+    key = final_key(upload)
+    if await storage.size(key) == upload.upload_length:
+        content_hash = await storage.sha256(key)
+    else:
+        path, content_hash = await _assemble_parts(upload)
+        await storage.put_file(key, path, upload.content_type)
+
+    audio_file = AudioFile(
+        user_id=upload.user_id,
+        file_path=key,
+        file_name=upload.file_name,
+        file_size=upload.upload_length,
+        content_hash=content_hash,
+        duration=estimate_audio_duration(upload.upload_length),
+        processing_status="uploaded"
+    )
+    db.add(audio_file)
+    await db.flush()
+
+    upload.status = "completed"
+    upload.audio_file_id = audio_file.id
+    await db.commit()
+    await db.refresh(audio_file)
+
+    try:
+        await _delete_parts(upload)
+    except Exception as e:
+        # 남은 청크는 세션이 만료될 때 다시 정리됨
+        print(f"Upload part cleanup error ({upload.id}): {e}")
+    return audio_file
+
+
+async def delete_upload_session(db: AsyncSession, upload: UploadSession) -> None:
+    """업로드 취소 (받아 둔 청크 삭제)"""
+    await _delete_parts(upload)
+    await db.delete(upload)
+    await db.commit()
+
+
+async def cleanup_expired_sessions(db: AsyncSession, limit: int = 100) -> int:
+    """만료된 세션과 남은 청크 정리 (삭제한 세션 수 반환)"""
+    result = await db.execute(
+        select(UploadSession)
+        .where(UploadSession.expires_at <= datetime.now(timezone.utc))
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    expired = result.scalars().all()
+
+    for upload in expired:
+        await _delete_parts(upload)
+        await db.delete(upload)
+    await db.commit()
+    return len(expired)
@@ -0,0 +1,51 @@
+import re
+from typing import Optional
+from sqlalchemy import Select, func, literal, or_, select, text
+from sqlalchemy.orm import load_only
+from app.models.recipe import Recipe
+
+_TERM_RE = re.compile(r"\w+")
+
+# ix_recipes_search_tsv 인덱스와 같은 식을 써야 인덱스를 탄다
+SEARCH_CONFIG = text("'simple'::regconfig")
+
+
+def build_prefix_tsquery(query_text: str) -> Optional[str]:
+    """
+    검색어를 접두어 tsquery 문자열로 변환 ("양파 볶음" -> "양파:* & 볶음:*")
+
+    한국어는 조사가 붙어 저장되므로("양파를") 단어 접두어로 일치시킨다.
+    """
+    terms = _TERM_RE.findall(query_text)
+    if not terms:
+        return None
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def recipe_search_query(user_id, query_text: str, limit: int, offset: int) -> Select:
+    """
+    사용자 레시피 전문 검색 쿼리
+
+    tsvector 접두어 일치 또는 trigram 단어 유사도(오타, 부분 일치)로 찾고,
+    두 점수의 합으로 정렬한다. 다음 페이지 확인을 위해 limit + 1개를 조회한다.
+    """
+    search_vector = func.to_tsvector(SEARCH_CONFIG, Recipe.search_text)
+    conditions = [literal(query_text).op("<%")(Recipe.search_text)]
+    score = func.word_similarity(query_text, Recipe.search_text)
+
+    tsquery_text = build_prefix_tsquery(query_text)
+    if tsquery_text:
+        ts_query = func.to_tsquery(SEARCH_CONFIG, tsquery_text)
+        conditions.append(search_vector.op("@@")(ts_query))
+        score = score + func.ts_rank(search_vector, ts_query)
+
+    score = score.label("score")
+
+    return (
+        select(Recipe, score)
+        .options(load_only(Recipe.id, Recipe.title, Recipe.category, Recipe.image_url, Recipe.created_at))
+        .where(Recipe.user_id == user_id, or_(*conditions))
+        .order_by(score.desc(), Recipe.created_at.desc(), Recipe.id.desc())
+        .offset(offset)
+        .limit(limit + 1)
+    )
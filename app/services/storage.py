@@ -1,50 +1,135 @@
-import os
+import asyncio
+import hashlib
 import uuid
 from pathlib import Path
 from fastapi import UploadFile
-from typing import Tuple
+from typing import Optional, Tuple
+from app.config import settings
+from app.services.object_storage import LOCAL_ROOT, get_storage
+from app.utils.metrics import UPLOAD_BYTES
 
 UPLOAD_DIR = Path("uploads/audio")
+# 저장소로 옮기기 전 업로드를 받아두는 임시 디렉토리
+STAGING_DIR = LOCAL_ROOT / "tmp"
+
+
+class FileTooLargeError(Exception):
+    """업로드 파일이 허용된 최대 크기를 초과한 경우"""
 
 
 def ensure_upload_dir():
     """업로드 디렉토리가 존재하는지 확인하고 없으면 생성"""
     UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    STAGING_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def audio_key(user_id: str, file_name: Optional[str]) -> str:
+    """새 오디오 파일의 저장소 키"""
+    file_extension = Path(file_name).suffix if file_name else ".wav"
+    return f"audio/{user_id}_{uuid.uuid4().hex}{file_extension}"
+
+
+def is_user_audio_key(key: str, user_id: str) -> bool:
+    """클라이언트가 보낸 키가 해당 사용자에게 발급된 오디오 키인지 확인"""
+    return key.startswith(f"audio/{user_id}_") and "/" not in key[len("audio/"):]
 
 
-async def save_uploaded_file(file: UploadFile, user_id: str) -> Tuple[str, str, int]:
+def _hash_file(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(settings.upload_chunk_size):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+async def stage_uploaded_file(file: UploadFile) -> Tuple[Path, int]:
     """
-    업로드된 파일을 저장하고 파일 정보를 반환
+    클라이언트가 보낸 본문을 청크 단위로 임시 파일(.part)에 받아둠
+    
+    최대 크기를 넘으면 중간에 중단하고 임시 파일을 삭제한다.
     
     Returns:
-        Tuple[file_path, file_name, file_size]
+        Tuple[임시 파일 경로, file_size]
+    
+    Raises:
+        FileTooLargeError: 최대 업로드 크기 초과
     """
+    max_size = settings.max_audio_upload_bytes
+    if file.size is not None and file.size > max_size:
+        raise FileTooLargeError(f"File exceeds {max_size} bytes")
+    
     ensure_upload_dir()
+    temp_path = STAGING_DIR / f"{uuid.uuid4().hex}.part"
+    file_size = 0
+    
+    buffer = await asyncio.to_thread(open, temp_path, "wb")
+    try:
+        while True:
+            chunk = await file.read(settings.upload_chunk_size)
+            if not chunk:
+                break
+            
+            file_size += len(chunk)
+            if file_size > max_size:
+                raise FileTooLargeError(f"File exceeds {max_size} bytes")
+            
+            await asyncio.to_thread(buffer.write, chunk)
+        
+        await asyncio.to_thread(buffer.close)
+    except BaseException:
+        buffer.close()
+        temp_path.unlink(missing_ok=True)
+        raise
+    finally:
+        UPLOAD_BYTES.labels("audio").inc(file_size)
     
-    # 고유한 파일명 생성
-    file_extension = Path(file.filename).suffix if file.filename else ".wav"
-    unique_filename = f"{user_id}_{uuid.uuid4().hex}{file_extension}"
-    file_path = UPLOAD_DIR / unique_filename
+    return temp_path, file_size
+
+
+async def store_staged_file(
+    temp_path: Path,
+    user_id: str,
+    file_name: Optional[str],
+    content_type: Optional[str]
+) -> Tuple[str, str, str]:
+    """
+    받아둔 임시 파일의 해시를 계산하고 저장소로 옮김
     
-    # 파일 저장
-    content = await file.read()
-    file_size = len(content)
+    실패하면 임시 파일을 삭제한다.
     
-    with open(file_path, "wb") as buffer:
-        buffer.write(content)
+    Returns:
+        Tuple[storage key, file_name, sha256 hex digest]
+    """
+    key = audio_key(user_id, file_name)
+    try:
+        content_hash = await asyncio.to_thread(_hash_file, temp_path)
+        await get_storage().put_file(key, temp_path, content_type)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
     
-    return str(file_path), file.filename or unique_filename, file_size
+    return key, file_name or Path(key).name, content_hash
 
 
-def get_file_path(file_path: str) -> Path:
-    """저장된 파일의 전체 경로 반환"""
-    return Path(file_path)
+async def save_uploaded_file(file: UploadFile, user_id: str) -> Tuple[str, str, int, str]:
+    """
+    업로드된 파일을 임시 파일로 받은 뒤 저장소로 옮기고 파일 정보를 반환
+    
+    Returns:
+        Tuple[storage key, file_name, file_size, sha256 hex digest]
+    
+    Raises:
+        FileTooLargeError: 최대 업로드 크기 초과
+    """
+    temp_path, file_size = await stage_uploaded_file(file)
+    key, file_name, content_hash = await store_staged_file(temp_path, user_id, file.filename, file.content_type)
+    return key, file_name, file_size, content_hash
 
 
-def delete_file(file_path: str) -> bool:
-    """파일 삭제"""
+async def delete_file(file_path: str) -> bool:
+    """파일 삭제 (저장소 키 또는 예전 로컬 경로)"""
     try:
-        Path(file_path).unlink(missing_ok=True)
+        await get_storage().delete(file_path)
         return True
     except Exception:
-        return False
\ No newline at end of file
+        return False
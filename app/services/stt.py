@@ -1,54 +1,261 @@
-from openai import OpenAI
+import asyncio
 from pathlib import Path
 from typing import Optional
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
 from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.audio import AudioChunk
+from app.models.cache import TranscriptCache
+from app.services.audio_chunks import (
+    probe_duration,
+    detect_silences,
+    plan_chunks,
+    extract_chunk,
+    remove_chunk_files,
+    stitch_transcripts
+)
+from app.services.cache import LRUCache
+from app.services.events import publish_event
+from app.services.stt_backends import STTBackend, get_stt_backend
 
-# OpenAI 클라이언트 초기화 (lazy initialization)
-def get_openai_client():
-    return OpenAI(api_key=settings.openai_api_key)
+STT_LANGUAGE = "ko"
 
+# (content_hash, model, language) -> transcript
+transcript_cache = LRUCache("transcript", settings.transcript_cache_size)
 
-async def transcribe_audio(file_path: str) -> Optional[str]:
+
+async def get_cached_transcript(content_hash: str, model: str, language: str) -> Optional[str]:
+    """메모리 LRU -> Postgres 순으로 캐시된 변환 텍스트 조회"""
+    key = (content_hash, model, language)
+    cached = transcript_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(TranscriptCache.transcript_text).where(
+                    TranscriptCache.content_hash == content_hash,
+                    TranscriptCache.model == model,
+                    TranscriptCache.language == language
+                )
+            )
+            cached = result.scalar_one_or_none()
+    except Exception as e:
+        print(f"Transcript cache lookup error: {e}")
+        return None
+    
+    if cached is not None:
+        transcript_cache.record_durable_hit()
+        transcript_cache.set(key, cached)
+    return cached
+
+
+async def store_cached_transcript(content_hash: str, model: str, language: str, transcript_text: str) -> None:
+    """변환 텍스트를 메모리 LRU와 Postgres에 저장"""
+    transcript_cache.set((content_hash, model, language), transcript_text)
+    
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                insert(TranscriptCache)
+                .values(
+                    content_hash=content_hash,
+                    model=model,
+                    language=language,
+                    transcript_text=transcript_text
+                )
+                .on_conflict_do_nothing()
+            )
+            await db.commit()
+    except Exception as e:
+        print(f"Transcript cache store error: {e}")
+
+
+async def transcribe_audio(
+    file_path: str,
+    content_hash: Optional[str] = None,
+    audio_id: Optional[str] = None,
+    backend_name: Optional[str] = None
+) -> Optional[str]:
     """
-    OpenAI Whisper API를 사용하여 오디오 파일을 텍스트로 변환
+    STT 엔진(기본: OpenAI Whisper API)을 사용하여 오디오 파일을 텍스트로 변환
+    
+    content_hash가 주어지면 같은 내용의 파일에 대해 캐시된 결과를 재사용한다.
+    audio_id가 주어지고 녹음이 길면 구간별로 나눠 병렬 변환한다.
     
     Args:
         file_path: 오디오 파일 경로
+        content_hash: 파일의 SHA-256 (선택)
+        audio_id: 구간 처리 기록을 남길 AudioFile ID (선택)
+        backend_name: STT 엔진 이름 (선택, 없으면 설정값)
         
     Returns:
         변환된 텍스트 또는 None (실패시)
     """
+    try:
+        backend = get_stt_backend(backend_name)
+    except ValueError as e:
+        print(f"STT Error: {e}")
+        return None
+    
+    if content_hash:
+        cached = await get_cached_transcript(content_hash, backend.model, STT_LANGUAGE)
+        if cached is not None:
+            return cached
+    
     try:
         audio_file_path = Path(file_path)
         
         if not audio_file_path.exists():
             raise FileNotFoundError(f"Audio file not found: {file_path}")
         
-        with open(audio_file_path, "rb") as audio_file:
-            client = get_openai_client()
-            transcript = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                language="ko"  # 한국어 지정
-            )
+        if audio_id is not None and backend.needs_chunking and await _is_long_audio(audio_file_path):
+            transcript_text = await transcribe_long_audio(audio_id, audio_file_path, backend)
+        else:
+            transcript_text = await backend.transcribe(audio_file_path, STT_LANGUAGE)
+        
+        if content_hash and transcript_text:
+            await store_cached_transcript(content_hash, backend.model, STT_LANGUAGE, transcript_text)
         
-        return transcript.text
+        return transcript_text
         
     except Exception as e:
         print(f"STT Error: {e}")
         return None
 
 
+async def _is_long_audio(audio_file_path: Path) -> bool:
+    """업로드 한도나 길이 기준을 넘어 분할 변환이 필요한지 판단"""
+    if audio_file_path.stat().st_size > settings.stt_long_audio_threshold_bytes:
+        return True
+    duration = await probe_duration(str(audio_file_path))
+    return duration is not None and duration > settings.stt_long_audio_threshold_seconds
+
+
+async def transcribe_long_audio(audio_id: str, audio_file_path: Path, backend: STTBackend) -> Optional[str]:
+    """
+    긴 녹음을 무음 경계로 나눠 병렬로 변환한 뒤 순서대로 이어붙임
+    
+    구간별 상태는 audio_chunks 테이블에 기록되며, 다시 처리하면
+    완료된 구간은 건너뛰고 실패했거나 남은 구간만 변환한다.
+    batches_chunks인 엔진(로컬 Whisper)에는 남은 구간을 transcribe_batch로 한 번에 넘긴다.
+    
+    Returns:
+        변환된 텍스트 또는 None (일부 구간 실패시)
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(AudioChunk)
+            .where(AudioChunk.audio_file_id == audio_id)
+            .order_by(AudioChunk.chunk_index)
+        )
+        chunks = list(result.scalars().all())
+        
+        if not chunks:
+            duration = await probe_duration(str(audio_file_path))
+            if duration is None:
+                raise RuntimeError("Could not read audio duration for chunking")
+            
+            silences = await detect_silences(str(audio_file_path))
+            spans = plan_chunks(
+                duration,
+                silences,
+                settings.stt_chunk_target_seconds,
+                settings.stt_chunk_max_seconds,
+                settings.stt_chunk_overlap_seconds
+            )
+            chunks = [
+                AudioChunk(
+                    audio_file_id=audio_id,
+                    chunk_index=index,
+                    start_ms=int(start * 1000),
+                    end_ms=int(end * 1000),
+                    status="pending"
+                )
+                for index, (start, end) in enumerate(spans)
+            ]
+            db.add_all(chunks)
+            await db.commit()
+    
+    semaphore = asyncio.Semaphore(settings.stt_chunk_concurrency)
+    pending = [chunk for chunk in chunks if chunk.status != "completed"]
+    
+    async def extract(chunk: AudioChunk) -> Path:
+        async with semaphore:
+            return await extract_chunk(
+                str(audio_file_path),
+                audio_id,
+                chunk.chunk_index,
+                chunk.start_ms / 1000,
+                chunk.end_ms / 1000
+            )
+    
+    async def record(chunk: AudioChunk):
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(AudioChunk)
+                .where(AudioChunk.id == chunk.id)
+                .values(status=chunk.status, transcript_text=chunk.transcript_text)
+            )
+            await publish_event(
+                db,
+                audio_id,
+                "progress",
+                completed_chunks=sum(1 for c in chunks if c.status == "completed"),
+                total_chunks=len(chunks)
+            )
+            await db.commit()
+    
+    async def run_chunk(chunk: AudioChunk):
+        try:
+            path = await extract(chunk)
+            async with semaphore:
+                chunk.transcript_text = await backend.transcribe(path, STT_LANGUAGE)
+            chunk.status = "completed"
+        except Exception as e:
+            print(f"STT chunk error ({audio_id}#{chunk.chunk_index}): {e}")
+            chunk.status = "failed"
+        await record(chunk)
+    
+    if backend.batches_chunks:
+        # 남은 구간을 한 번에 넘겨 엔진이 워커 프로세스별로 묶어 배치 변환
+        try:
+            paths = await asyncio.gather(*(extract(chunk) for chunk in pending))
+            texts = await backend.transcribe_batch(list(paths), STT_LANGUAGE)
+            for chunk, text in zip(pending, texts):
+                chunk.transcript_text = text
+                chunk.status = "completed"
+        except Exception as e:
+            print(f"STT batch error ({audio_id}): {e}")
+            for chunk in pending:
+                chunk.status = "failed"
+        for chunk in pending:
+            await record(chunk)
+    else:
+        await asyncio.gather(*(run_chunk(chunk) for chunk in pending))
+    
+    if any(chunk.status != "completed" for chunk in chunks):
+        return None
+    
+    remove_chunk_files(audio_id)
+    return stitch_transcripts([chunk.transcript_text or "" for chunk in chunks])
+
+
 def get_audio_duration(file_path: str) -> Optional[int]:
     """
     오디오 파일의 길이를 초 단위로 반환
     실제 구현시에는 librosa, mutagen 등의 라이브러리 사용 권장
     """
     try:
-        # 임시로 파일 크기 기반 추정 (실제로는 오디오 라이브러리 사용)
-        file_size = Path(file_path).stat().st_size
-        # 대략적인 추정: 1MB당 60초 (실제 값과 다를 수 있음)
-        estimated_duration = int(file_size / (1024 * 1024) * 60)
-        return max(1, estimated_duration)  # 최소 1초
+        return estimate_audio_duration(Path(file_path).stat().st_size)
     except Exception:
-        return None
\ No newline at end of file
+        return None
+
+
+def estimate_audio_duration(file_size: int) -> int:
+    """파일 크기로 오디오 길이(초) 추정 (저장소에 직접 올라온 파일용)"""
+    # 대략적인 추정: 1MB당 60초 (실제 값과 다를 수 있음)
+    estimated_duration = int(file_size / (1024 * 1024) * 60)
+    return max(1, estimated_duration)  # 최소 1초
@@ -0,0 +1,168 @@
+import asyncio
+import importlib.util
+from abc import ABC, abstractmethod
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+from app.config import settings
+from app.services import local_stt_worker
+from app.services.openai_client import get_openai_client
+from app.services.rate_limiter import openai_rate_limit
+from app.services.resilience import call_openai
+from app.utils.metrics import track_openai_call
+
+
+class STTBackend(ABC):
+    """STT 엔진 인터페이스"""
+
+    name: str = ""
+    # 긴 녹음을 구간으로 나눠 변환할지 (업로드 한도가 있거나 구간을 병렬로 돌릴 수 있는 엔진)
+    needs_chunking: bool = False
+    # 구간들을 transcribe_batch 한 번으로 넘길지 (False면 구간마다 transcribe를 동시에 호출)
+    batches_chunks: bool = False
+
+    @property
+    @abstractmethod
+    def model(self) -> str:
+        """캐시 키에 쓰이는 모델 식별자"""
+
+    def is_available(self) -> bool:
+        return True
+
+    @abstractmethod
+    async def transcribe(self, audio_file_path: Path, language: str) -> str:
+        """파일 하나를 텍스트로 변환"""
+
+    async def transcribe_batch(self, audio_file_paths: List[Path], language: str) -> List[str]:
+        return list(await asyncio.gather(
+            *(self.transcribe(path, language) for path in audio_file_paths)
+        ))
+
+    async def close(self):
+        pass
+
+
+class OpenAIWhisperBackend(STTBackend):
+    """OpenAI Whisper API"""
+
+    name = "openai"
+    needs_chunking = True
+
+    @property
+    def model(self) -> str:
+        return "whisper-1"
+
+    async def transcribe(self, audio_file_path: Path, language: str) -> str:
+        # 파일 읽기는 스레드에서 수행해 이벤트 루프를 막지 않음
+        content = await asyncio.to_thread(audio_file_path.read_bytes)
+
+        client = get_openai_client()
+
+        async def attempt(timeout: float):
+            async with openai_rate_limit("transcription"):
+                async with track_openai_call("transcription", self.model):
+                    return await asyncio.wait_for(
+                        client.audio.transcriptions.create(
+                            model=self.model,
+                            file=(audio_file_path.name, content),
+                            language=language
+                        ),
+                        timeout
+                    )
+
+        transcript = await call_openai("transcription", "transcription", attempt)
+        return transcript.text
+
+
+class LocalWhisperBackend(STTBackend):
+    """
+    faster-whisper(CTranslate2) 기반 로컬 CPU 엔진
+
+    모델은 워커 프로세스마다 한 번만 로드되고, 변환은 프로세스 풀에서 실행된다.
+    faster-whisper 패키지가 설치된 경우에만 사용할 수 있다.
+    """
+
+    name = "local"
+    # 긴 녹음은 구간으로 나눠 워커 프로세스들이 나눠서 배치 변환
+    needs_chunking = True
+    batches_chunks = True
+
+    def __init__(self):
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def model(self) -> str:
+        return f"faster-whisper-{settings.local_stt_model}-{settings.local_stt_compute_type}"
+
+    def is_available(self) -> bool:
+        return importlib.util.find_spec("faster_whisper") is not None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=settings.local_stt_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=local_stt_worker.init_worker,
+                initargs=(
+                    settings.local_stt_model,
+                    settings.local_stt_compute_type,
+                    settings.local_stt_cpu_threads,
+                    settings.local_stt_batch_size
+                )
+            )
+        return self._pool
+
+    async def transcribe(self, audio_file_path: Path, language: str) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_pool(), local_stt_worker.transcribe_file, str(audio_file_path), language
+        )
+
+    async def transcribe_batch(self, audio_file_paths: List[Path], language: str) -> List[str]:
+        # 워커 수만큼 묶어서 각 프로세스가 한 묶음씩 처리
+        loop = asyncio.get_running_loop()
+        workers = settings.local_stt_workers
+        groups = [audio_file_paths[i::workers] for i in range(workers)]
+        results = await asyncio.gather(*(
+            loop.run_in_executor(
+                self._get_pool(), local_stt_worker.transcribe_files, [str(p) for p in group], language
+            )
+            for group in groups if group
+        ))
+
+        texts: List[str] = [""] * len(audio_file_paths)
+        for group_index, group_texts in enumerate(results):
+            for offset, text in enumerate(group_texts):
+                texts[group_index + offset * workers] = text
+        return texts
+
+    async def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+_backends: Dict[str, STTBackend] = {
+    backend.name: backend
+    for backend in (OpenAIWhisperBackend(), LocalWhisperBackend())
+}
+
+
+def get_stt_backend(name: Optional[str] = None) -> STTBackend:
+    """
+    이름으로 STT 엔진 조회 (없으면 배포 기본값)
+
+    Raises:
+        ValueError: 알 수 없거나 사용할 수 없는 엔진
+    """
+    backend = _backends.get(name or settings.stt_backend)
+    if backend is None or not backend.is_available():
+        raise ValueError(f"STT backend not available: {name or settings.stt_backend}")
+    return backend
+
+
+async def close_stt_backends():
+    """엔진 리소스(프로세스 풀 등) 정리"""
+    for backend in _backends.values():
+        await backend.close()
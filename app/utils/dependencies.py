@@ -1,18 +1,59 @@
+import uuid
+from dataclasses import dataclass
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, event
+from app.config import settings
 from app.database import get_db
 from app.models.user import User
+from app.services.cache import TTLCache
 from app.utils.security import verify_token
 
 security = HTTPBearer()
 
 
+@dataclass(frozen=True)
+class CurrentUser:
+    """
+    인증된 사용자 (요청 간에 공유되는 읽기 전용 스냅샷)
+
+    ORM 객체가 아니므로 수정이 필요하면 id로 다시 조회해야 한다.
+    """
+    id: uuid.UUID
+    email: str
+    full_name: Optional[str]
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "CurrentUser":
+        return cls(id=user.id, email=user.email, full_name=user.full_name, is_active=user.is_active)
+
+
+# user_id -> CurrentUser
+# 비활성화/삭제는 같은 프로세스에서는 즉시, 다른 워커 프로세스에서는
+# 최대 auth_cache_ttl_seconds 뒤에 반영된다.
+user_cache = TTLCache("auth_user", settings.auth_cache_size, settings.auth_cache_ttl_seconds)
+
+
+def invalidate_user(user_id) -> None:
+    """사용자 정보가 바뀌면 캐시에서 제거"""
+    user_cache.invalidate(str(user_id))
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    # 비활성화/수정/삭제 시 이 프로세스의 캐시를 즉시 무효화
+    # (다른 프로세스는 TTL 안에 갱신됨)
+    invalidate_user(target.id)
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db)
-) -> User:
+) -> CurrentUser:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -23,16 +64,24 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
     
+    cached_user = user_cache.get(user_id)
+    if cached_user is not None:
+        return cached_user
+    
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     
     if user is None:
         raise credentials_exception
     
-    return user
+    # 요청 간에 공유되므로 ORM 객체 대신 바뀌지 않는 스냅샷을 캐시
+    current_user = CurrentUser.from_user(user)
+    user_cache.set(user_id, current_user)
+    
+    return current_user
 
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
\ No newline at end of file
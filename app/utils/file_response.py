@@ -0,0 +1,140 @@
+import asyncio
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Optional, Tuple
+from fastapi import Request
+from fastapi.responses import Response
+
+
+def stat_etag(stat: os.stat_result) -> str:
+    """내용 해시를 모르는 파일용 ETag (수정 시각 + 크기)"""
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match 값에 ETag가 포함되는지 확인 (약한 비교)"""
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def is_not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """
+    조건부 요청이 캐시된 사본으로 충분한지 판단
+
+    If-None-Match가 있으면 그것만 보고, 없을 때만 If-Modified-Since를 비교한다.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # Last-Modified는 초 단위로 내려가므로 초 단위로 비교
+        return int(mtime) <= since
+
+    return False
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    단일 바이트 범위 헤더를 (시작, 끝) 포함 구간으로 변환
+
+    Returns:
+        (start, end) 또는 None (지원하지 않는 형식 / 다중 범위 → 전체 응답)
+
+    Raises:
+        ValueError: 파일 범위를 벗어난 요청 (416)
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    start_text, sep, end_text = spec.strip().partition("-")
+    if not sep:
+        return None
+
+    start_text, end_text = start_text.strip(), end_text.strip()
+    if not (start_text or end_text):
+        return None
+    if (start_text and not start_text.isdigit()) or (end_text and not end_text.isdigit()):
+        return None
+
+    if start_text == "":
+        # bytes=-N : 마지막 N바이트
+        length = int(end_text)
+        if length == 0 or size == 0:
+            raise ValueError("range not satisfiable")
+        return max(size - length, 0), size - 1
+
+    start = int(start_text)
+    end = int(end_text) if end_text else size - 1
+    if start >= size or start > end:
+        raise ValueError("range not satisfiable")
+    return start, min(end, size - 1)
+
+
+def _read_range(path: Path, start: int, length: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(length)
+
+
+async def serve_file(
+    request: Request,
+    path: Path,
+    media_type: str,
+    etag: str,
+    cache_control: str,
+    offload_header: Optional[str] = None,
+    offload_path: Optional[str] = None
+) -> Response:
+    """
+    조건부 요청(304)과 단일 Range 요청(206/416)을 처리하는 파일 응답
+
+    offload_header가 주어지면 본문 대신 X-Accel-Redirect / X-Sendfile 헤더만
+    내려 실제 전송(Range 포함)은 앞단 프록시가 맡는다.
+    """
+    stat = await asyncio.to_thread(path.stat)
+    size = stat.st_size
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes"
+    }
+
+    if is_not_modified(request, etag, stat.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    if offload_header and offload_path:
+        headers[offload_header] = offload_path
+        return Response(media_type=media_type, headers=headers)
+
+    byte_range = None
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    # If-Range가 현재 ETag와 다르면 범위를 무시하고 전체를 보냄
+    if range_header and (if_range is None or if_range.strip() == etag):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=headers)
+
+    if byte_range is None:
+        start, end, status_code = 0, size - 1, 200
+    else:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    length = end - start + 1
+    content = await asyncio.to_thread(_read_range, path, start, length) if length > 0 else b""
+    return Response(content=content, status_code=status_code, media_type=media_type, headers=headers)
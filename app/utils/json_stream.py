@@ -0,0 +1,148 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+# (종류, 키, 배열 인덱스, 값) - 종류는 "field"(최상위 값 완료) 또는 "item"(최상위 배열 원소 완료)
+JSONStreamEvent = Tuple[str, str, Optional[int], Any]
+
+
+class IncrementalJSONObjectParser:
+    """
+    조각으로 도착하는 JSON 객체를 읽으며 완성된 부분을 바로 알려주는 파서
+
+    최상위 필드의 값이 끝나면 ("field", key, None, value)를,
+    최상위 필드가 배열이면 원소 하나가 끝날 때마다 ("item", key, index, value)를 낸다.
+    첫 '{' 이전의 텍스트(```json 같은 코드 펜스)는 무시한다.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.done = False
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._expect = "key"
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self._item_start: Optional[int] = None
+        self._item_counts: Dict[str, int] = {}
+
+    def feed(self, text: str) -> List[JSONStreamEvent]:
+        """새 조각을 읽고 이번에 완성된 값들을 반환"""
+        self.buffer += text
+        events: List[JSONStreamEvent] = []
+
+        while self._pos < len(self.buffer) and not self.done:
+            self._step(self.buffer[self._pos], self._pos, events)
+            self._pos += 1
+
+        return events
+
+    def _in_top_level_array(self) -> bool:
+        return len(self._stack) == 2 and self._stack[1] == "["
+
+    def _emit_field(self, end: int, events: List[JSONStreamEvent]) -> None:
+        raw = self.buffer[self._value_start:end]
+        self._value_start = None
+        try:
+            events.append(("field", self._key, None, json.loads(raw)))
+        except ValueError:
+            pass
+
+    def _emit_item(self, end: int, events: List[JSONStreamEvent]) -> None:
+        raw = self.buffer[self._item_start:end]
+        self._item_start = None
+        index = self._item_counts.get(self._key, 0)
+        self._item_counts[self._key] = index + 1
+        try:
+            events.append(("item", self._key, index, json.loads(raw)))
+        except ValueError:
+            pass
+
+    def _step(self, c: str, i: int, events: List[JSONStreamEvent]) -> None:
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif c == "\\":
+                self._escape = True
+            elif c == '"':
+                self._in_string = False
+                self._end_string(i, events)
+            return
+
+        if not self._stack:
+            if c == "{":
+                self._stack.append(c)
+                self._expect = "key"
+            return
+
+        depth = len(self._stack)
+
+        if c == '"':
+            self._in_string = True
+            if depth == 1:
+                if self._expect == "key":
+                    self._key_start = i
+                else:
+                    self._value_start = i
+            elif self._in_top_level_array():
+                self._item_start = i
+            return
+
+        if c in "{[":
+            if depth == 1 and self._expect == "value":
+                self._value_start = i
+            elif self._in_top_level_array():
+                self._item_start = i
+            self._stack.append(c)
+            return
+
+        if c in "}]":
+            # 닫히기 전에 끝나지 않은 숫자/true/null 같은 값 처리
+            if depth == 1 and self._value_start is not None:
+                self._emit_field(i, events)
+            elif self._in_top_level_array() and self._item_start is not None:
+                self._emit_item(i, events)
+
+            self._stack.pop()
+            depth = len(self._stack)
+            if depth == 0:
+                self.done = True
+            elif depth == 1 and self._value_start is not None:
+                self._emit_field(i + 1, events)
+            elif self._in_top_level_array() and self._item_start is not None:
+                self._emit_item(i + 1, events)
+            return
+
+        if c == ":" and depth == 1:
+            self._expect = "value"
+            return
+
+        if c == ",":
+            if depth == 1:
+                if self._value_start is not None:
+                    self._emit_field(i, events)
+                self._expect = "key"
+            elif self._in_top_level_array() and self._item_start is not None:
+                self._emit_item(i, events)
+            return
+
+        if not c.isspace():
+            if depth == 1 and self._expect == "value" and self._value_start is None:
+                self._value_start = i
+            elif self._in_top_level_array() and self._item_start is None:
+                self._item_start = i
+
+    def _end_string(self, i: int, events: List[JSONStreamEvent]) -> None:
+        depth = len(self._stack)
+        if depth == 1:
+            if self._expect == "key":
+                try:
+                    self._key = json.loads(self.buffer[self._key_start:i + 1])
+                except ValueError:
+                    self._key = None
+            else:
+                self._emit_field(i + 1, events)
+        elif self._in_top_level_array():
+            self._emit_item(i + 1, events)
@@ -0,0 +1,204 @@
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Optional
+from prometheus_client import Counter, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, REGISTRY
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.services.cache import get_cache_stats
+
+# 오래 걸리는 STT/GPT 호출까지 담을 수 있도록 버킷을 넓게 설정
+SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "momento_http_request_duration_seconds",
+    "HTTP request latency by route template and status",
+    ["method", "route", "status"],
+    buckets=SLOW_BUCKETS
+)
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "momento_db_pool_checkout_seconds",
+    "Time spent waiting for a connection from the SQLAlchemy pool",
+    buckets=FAST_BUCKETS
+)
+DB_QUERY_SECONDS = Histogram(
+    "momento_db_query_duration_seconds",
+    "SQL statement execution time by statement type",
+    ["operation"],
+    buckets=FAST_BUCKETS
+)
+DB_QUERY_ERRORS = Counter(
+    "momento_db_query_errors_total",
+    "SQL statements that raised an error",
+    ["operation"]
+)
+OPENAI_REQUEST_SECONDS = Histogram(
+    "momento_openai_request_duration_seconds",
+    "OpenAI API call latency",
+    ["operation", "model", "outcome"],
+    buckets=SLOW_BUCKETS
+)
+OPENAI_TOKENS = Counter(
+    "momento_openai_tokens_total",
+    "OpenAI tokens consumed",
+    ["operation", "model", "kind"]
+)
+OPENAI_ERRORS = Counter(
+    "momento_openai_errors_total",
+    "OpenAI API call failures by exception type",
+    ["operation", "error"]
+)
+OPENAI_RETRIES = Counter(
+    "momento_openai_retries_total",
+    "OpenAI calls retried after a retryable error",
+    ["operation", "error"]
+)
+OPENAI_CIRCUIT_EVENTS = Counter(
+    "momento_openai_circuit_events_total",
+    "Circuit breaker transitions to open and calls rejected while open",
+    ["breaker", "event"]
+)
+OPENAI_HEDGED_REQUESTS = Counter(
+    "momento_openai_hedged_requests_total",
+    "Hedged OpenAI requests launched and how often the hedge answered first",
+    ["operation", "outcome"]
+)
+OPENAI_QUEUE_SECONDS = Histogram(
+    "momento_openai_queue_seconds",
+    "Time OpenAI calls waited for rate limit capacity",
+    ["bucket", "priority"],
+    buckets=SLOW_BUCKETS
+)
+PIPELINE_STAGE_SECONDS = Histogram(
+    "momento_pipeline_stage_seconds",
+    "Upload-to-recipe pipeline time per stage, split into receive, queue wait and run time",
+    ["stage", "phase"],
+    buckets=SLOW_BUCKETS
+)
+UPLOAD_BYTES = Counter(
+    "momento_upload_bytes_total",
+    "Bytes received through upload endpoints",
+    ["kind"]
+)
+
+
+class MetricsMiddleware:
+    """요청별 지연 시간을 라우트 템플릿 단위로 기록하는 ASGI 미들웨어"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # 라우팅 후 scope에 매칭된 라우트가 기록됨 (미매칭은 하나로 묶어 라벨 폭증 방지)
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            HTTP_REQUEST_SECONDS.labels(
+                scope["method"], route_path, str(status_code)
+            ).observe(time.perf_counter() - start)
+
+
+def _statement_operation(statement: str) -> str:
+    parts = statement.lstrip().split(None, 1)
+    return parts[0].upper() if parts else "UNKNOWN"
+
+
+class _DBPoolCollector:
+    """스크랩 시점의 커넥션 풀 사용량"""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+
+    def collect(self):
+        pool = self.engine.sync_engine.pool
+        for name, method, doc in (
+            ("momento_db_pool_size", "size", "Configured pool size"),
+            ("momento_db_pool_checked_out", "checkedout", "Connections currently checked out"),
+            ("momento_db_pool_checked_in", "checkedin", "Idle connections in the pool"),
+            ("momento_db_pool_overflow", "overflow", "Connections opened beyond pool size"),
+        ):
+            if hasattr(pool, method):
+                yield GaugeMetricFamily(name, doc, value=getattr(pool, method)())
+
+
+class _CacheCollector:
+    """app.services.cache에 등록된 캐시들의 적중 통계"""
+
+    def collect(self):
+        hits = CounterMetricFamily("momento_cache_hits", "Cache hits", labels=["cache", "tier"])
+        misses = CounterMetricFamily("momento_cache_misses", "Cache misses", labels=["cache"])
+        size = GaugeMetricFamily("momento_cache_entries", "Entries held in memory", labels=["cache"])
+        for name, stats in get_cache_stats().items():
+            hits.add_metric([name, "memory"], stats["memory_hits"])
+            hits.add_metric([name, "durable"], stats["durable_hits"])
+            misses.add_metric([name], stats["misses"])
+            size.add_metric([name], stats["size"])
+        yield hits
+        yield misses
+        yield size
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """비동기 엔진에 쿼리 시간 측정 이벤트와 풀 사용량 수집기를 연결"""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info["query_start"].pop()
+        DB_QUERY_SECONDS.labels(_statement_operation(statement)).observe(time.perf_counter() - start)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+        if starts:
+            starts.pop()
+        DB_QUERY_ERRORS.labels(_statement_operation(exception_context.statement or "")).inc()
+
+    REGISTRY.register(_DBPoolCollector(engine))
+
+
+REGISTRY.register(_CacheCollector())
+
+
+@asynccontextmanager
+async def track_openai_call(operation: str, model: str):
+    """OpenAI 호출 지연 시간과 실패를 기록"""
+    start = time.perf_counter()
+    outcome = "success"
+    try:
+        yield
+    except BaseException as e:
+        outcome = "error"
+        OPENAI_ERRORS.labels(operation, type(e).__name__).inc()
+        raise
+    finally:
+        OPENAI_REQUEST_SECONDS.labels(operation, model, outcome).observe(time.perf_counter() - start)
+
+
+def record_openai_usage(operation: str, model: str, usage: Optional[Any]) -> None:
+    """응답의 usage 정보로 토큰 사용량 기록"""
+    if usage is None:
+        return
+    OPENAI_TOKENS.labels(operation, model, "prompt").inc(usage.prompt_tokens or 0)
+    OPENAI_TOKENS.labels(operation, model, "completion").inc(usage.completion_tokens or 0)
@@ -0,0 +1,59 @@
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from fastapi import HTTPException, Response, status
+from sqlalchemy import Select, tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+NEXT_OFFSET_HEADER = "X-Next-Offset"
+MAX_SEARCH_OFFSET = 1000
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    """(created_at, id)를 불투명한 커서 문자열로 인코딩"""
+    payload = json.dumps([created_at.isoformat(), str(row_id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """커서 문자열을 (created_at, id)로 디코딩"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def keyset_page(query: Select, model: Any, cursor: Optional[str], limit: int) -> Select:
+    """
+    created_at, id 내림차순 키셋 페이지 쿼리 생성
+
+    다음 페이지 존재 여부를 알기 위해 limit + 1개를 조회한다.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+
+    return (
+        query
+        .order_by(model.created_at.desc(), model.id.desc())
+        .limit(limit + 1)
+    )
+
+
+def split_page(rows: Sequence[Any], limit: int, response: Response) -> List[Any]:
+    """조회 결과를 현재 페이지로 자르고 다음 커서를 응답 헤더에 설정"""
+    page = list(rows[:limit])
+    if len(rows) > limit:
+        last = page[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+    return page
@@ -1,11 +1,34 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import partial
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from app.config import settings
+from app.services.cache import TTLCache
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 허용 cost 범위를 설정값 하나로 고정해, cost가 다른 기존 해시는
+# 로그인 시 verify_and_update가 새 cost로 다시 해시하도록 함
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.bcrypt_rounds,
+    bcrypt__min_rounds=settings.bcrypt_rounds,
+    bcrypt__max_rounds=settings.bcrypt_rounds
+)
+
+# bcrypt는 CPU 작업이므로 이벤트 루프 밖 전용 스레드 풀에서 실행
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers,
+    thread_name_prefix="bcrypt"
+)
+# 실행 중 + 대기 중인 해시 작업 수 상한 (로그인 폭주 시 API 전체가 밀리지 않도록)
+_hash_slots = asyncio.Semaphore(settings.password_hash_max_pending)
+
+# 검증된 토큰 -> user_id (토큰의 exp 또는 설정된 TTL 중 빠른 시각에 만료)
+token_cache = TTLCache("auth_token", settings.auth_cache_size, settings.auth_cache_ttl_seconds)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -16,6 +39,42 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHashBusyError(Exception):
+    """해시 작업 대기열이 가득 차 제한 시간 안에 처리하지 못한 경우"""
+
+
+async def _run_hash_job(func, *args):
+    try:
+        await asyncio.wait_for(
+            _hash_slots.acquire(),
+            timeout=settings.password_hash_queue_timeout_seconds
+        )
+    except asyncio.TimeoutError:
+        raise PasswordHashBusyError()
+    
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, partial(func, *args))
+    finally:
+        _hash_slots.release()
+
+
+async def get_password_hash_async(password: str) -> str:
+    """비밀번호 해시 (스레드 풀에서 실행)"""
+    return await _run_hash_job(pwd_context.hash, password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    비밀번호 검증 (스레드 풀에서 실행)
+    
+    Returns:
+        Tuple[일치 여부, 새 해시 또는 None]
+        저장된 해시의 work factor(cost)가 bcrypt_rounds와 다르면 새 해시를 함께 반환
+    """
+    return await _run_hash_job(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -28,11 +87,16 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 
 def verify_token(token: str) -> Optional[str]:
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+    
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         user_id: str = payload.get("sub")
         if user_id is None:
             return None
+        token_cache.set(token, user_id, expires_at=payload.get("exp"))
         return user_id
     except JWTError:
         return None
\ No newline at end of file
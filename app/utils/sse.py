@@ -0,0 +1,11 @@
+import json
+from typing import Any, Dict
+
+# 프록시(nginx)가 이벤트를 모아서 보내지 않도록 하는 응답 헤더
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+SSE_HEARTBEAT = ": heartbeat\n\n"
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Server-Sent Events 메시지 한 개"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
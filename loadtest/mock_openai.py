@@ -0,0 +1,300 @@
+"""
+부하 테스트용 OpenAI API 대역 서버
+
+app/services/gpt.py, app/services/stt_backends.py가 쓰는 엔드포인트만 흉내 낸다.
+    POST /v1/chat/completions       (stream 포함)
+    POST /v1/audio/transcriptions
+    GET  /stats                     (받은 요청/주입한 오류 수)
+
+응답 지연 분포, 오류 주입, 분당 요청/토큰 한도(429)를 설정할 수 있다.
+
+실행:
+    python -m loadtest.mock_openai --port 9000 \\
+        --chat-latency lognormal:1500:0.5 --transcription-latency lognormal:3000:0.4 \\
+        --error-rate 0.02 --rpm 3500 --tpm 90000
+
+API 서버는 OPENAI_BASE_URL=http://localhost:9000/v1 로 실행한다.
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from collections import Counter
+from typing import Any, AsyncIterator, Dict, List, Optional
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+MOCK_TRANSCRIPT = (
+    "오늘은 김치찌개를 만들어 볼게. 잘 익은 김치 반 포기랑 돼지고기 목살 200그램을 준비하고, "
+    "냄비에 돼지고기를 먼저 볶다가 김치를 넣고 같이 5분 정도 볶아. 물을 자작하게 붓고 "
+    "고춧가루 한 숟가락, 다진 마늘 반 숟가락 넣고 20분 끓이면 돼. 마지막에 두부랑 대파 넣고 한소끔 더 끓여."
+)
+
+MOCK_RECIPE = {
+    "title": "김치찌개",
+    "description": "잘 익은 김치와 돼지고기로 끓인 집밥 김치찌개",
+    "ingredients": [
+        {"name": "김치", "amount": "반 포기", "notes": "잘 익은 것"},
+        {"name": "돼지고기 목살", "amount": "200g", "notes": ""},
+        {"name": "두부", "amount": "반 모", "notes": ""},
+        {"name": "대파", "amount": "1대", "notes": ""},
+        {"name": "고춧가루", "amount": "1큰술", "notes": ""},
+        {"name": "다진 마늘", "amount": "0.5큰술", "notes": ""}
+    ],
+    "steps": [
+        {"step": 1, "instruction": "냄비에 돼지고기를 볶는다", "time": "3분"},
+        {"step": 2, "instruction": "김치를 넣고 함께 볶는다", "time": "5분"},
+        {"step": 3, "instruction": "물, 고춧가루, 다진 마늘을 넣고 끓인다", "time": "20분"},
+        {"step": 4, "instruction": "두부와 대파를 넣고 한소끔 더 끓인다", "time": "3분"}
+    ],
+    "tips": "김치를 충분히 볶아야 국물 맛이 깊어진다",
+    "servings": "2-3인분",
+    "cooking_time": "30분",
+    "difficulty": "쉬움",
+    "category": "한식"
+}
+
+MOCK_DESCRIPTION = "엄마가 추운 날마다 끓여 주시던, 잘 익은 김치 향이 가득한 따뜻한 찌개입니다."
+
+
+class LatencyDistribution:
+    """
+    응답 지연 분포 (밀리초 단위 문자열로 지정)
+
+        fixed:800               항상 800ms
+        uniform:200:1200        200~1200ms 균등 분포
+        lognormal:1500:0.5      중앙값 1500ms, sigma 0.5 (꼬리가 긴 실제 API에 가까움)
+    """
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        kind, *params = spec.split(":")
+        self.kind = kind
+        self.params = [float(param) for param in params]
+        expected = {"fixed": 1, "uniform": 2, "lognormal": 2}
+        if kind not in expected or len(self.params) != expected[kind]:
+            raise ValueError(f"Invalid latency spec: {spec}")
+
+    def sample(self) -> float:
+        """지연 시간(초) 하나를 뽑음"""
+        if self.kind == "fixed":
+            ms = self.params[0]
+        elif self.kind == "uniform":
+            ms = random.uniform(*self.params)
+        else:
+            median, sigma = self.params
+            ms = random.lognormvariate(math.log(median), sigma)
+        return max(ms, 0.0) / 1000
+
+
+class MockRateLimiter:
+    """실제 API처럼 분당 요청/토큰 한도를 넘으면 429를 돌려주는 토큰 버킷"""
+
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.requests = float(rpm)
+        self.tokens = float(tpm)
+        self.updated = time.monotonic()
+
+    def try_acquire(self, tokens: int) -> Optional[float]:
+        """한도 안이면 차감 후 None, 아니면 다시 시도할 때까지의 시간(초)"""
+        now = time.monotonic()
+        elapsed = now - self.updated
+        self.updated = now
+
+        wait = 0.0
+        if self.rpm > 0:
+            self.requests = min(float(self.rpm), self.requests + elapsed * self.rpm / 60)
+            if self.requests < 1:
+                wait = max(wait, (1 - self.requests) * 60 / self.rpm)
+        if self.tpm > 0:
+            tokens = min(tokens, self.tpm)
+            self.tokens = min(float(self.tpm), self.tokens + elapsed * self.tpm / 60)
+            if self.tokens < tokens:
+                wait = max(wait, (tokens - self.tokens) * 60 / self.tpm)
+
+        if wait > 0:
+            return wait
+        if self.rpm > 0:
+            self.requests -= 1
+        if self.tpm > 0:
+            self.tokens -= tokens
+        return None
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text.encode("utf-8")) // 3 + 1
+
+
+def _error_response(status_code: int, message: str, retry_after: Optional[float] = None) -> JSONResponse:
+    headers = {}
+    if retry_after is not None:
+        headers["retry-after-ms"] = str(int(retry_after * 1000))
+    error_type = "rate_limit_exceeded" if status_code == 429 else "server_error"
+    return JSONResponse(
+        status_code=status_code,
+        content={"error": {"message": message, "type": error_type, "code": error_type}},
+        headers=headers
+    )
+
+
+def create_app(args: argparse.Namespace) -> FastAPI:
+    app = FastAPI(title="Mock OpenAI API")
+
+    chat_latency = LatencyDistribution(args.chat_latency)
+    transcription_latency = LatencyDistribution(args.transcription_latency)
+    limiters = {
+        "chat": MockRateLimiter(args.rpm, args.tpm),
+        "transcription": MockRateLimiter(args.transcription_rpm, 0),
+    }
+    error_statuses = [int(code) for code in args.error_statuses.split(",")]
+    stats: Counter = Counter()
+
+    def inject_failure(kind: str, tokens: int) -> Optional[JSONResponse]:
+        """한도 초과(429) 또는 설정한 확률로 오류 응답"""
+        stats[f"{kind}_requests"] += 1
+
+        retry_after = limiters[kind].try_acquire(tokens)
+        if retry_after is not None:
+            stats[f"{kind}_rate_limited"] += 1
+            return _error_response(429, "Rate limit reached", retry_after)
+
+        if random.random() < args.error_rate:
+            status_code = random.choice(error_statuses)
+            stats[f"{kind}_error_{status_code}"] += 1
+            return _error_response(status_code, "Injected failure", 1.0 if status_code == 429 else None)
+        return None
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages: List[Dict[str, Any]] = body.get("messages", [])
+        max_tokens = body.get("max_tokens") or 1000
+        prompt_tokens = sum(_estimate_tokens(str(message.get("content", ""))) for message in messages)
+
+        failure = inject_failure("chat", prompt_tokens + max_tokens)
+        if failure is not None:
+            return failure
+
+        # 레시피 정리 요청은 JSON 레시피, 그 외(설명 생성)는 짧은 문장
+        is_recipe = any(message.get("role") == "system" for message in messages)
+        content = json.dumps(MOCK_RECIPE, ensure_ascii=False, indent=2) if is_recipe else MOCK_DESCRIPTION
+        completion_tokens = _estimate_tokens(content)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        model = body.get("model", "gpt-3.5-turbo")
+        latency = chat_latency.sample()
+
+        if not body.get("stream"):
+            await asyncio.sleep(latency)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop"
+                }],
+                "usage": usage
+            }
+
+        include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+
+        async def stream() -> AsyncIterator[str]:
+            # 첫 토큰까지 지연의 20%, 나머지는 조각마다 고르게 나눔
+            pieces = [content[i:i + args.stream_chunk_chars] for i in range(0, len(content), args.stream_chunk_chars)]
+            await asyncio.sleep(latency * 0.2)
+            for index, piece in enumerate(pieces):
+                chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{
+                        "index": 0,
+                        "delta": {"role": "assistant", "content": piece} if index == 0 else {"content": piece},
+                        "finish_reason": "stop" if index == len(pieces) - 1 else None
+                    }]
+                }
+                yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                await asyncio.sleep(latency * 0.8 / len(pieces))
+            if include_usage:
+                chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [],
+                    "usage": usage
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    @app.post("/v1/audio/transcriptions")
+    async def audio_transcriptions(request: Request):
+        form = await request.form()
+        upload = form.get("file")
+        size = len(await upload.read()) if upload is not None else 0
+
+        failure = inject_failure("transcription", 0)
+        if failure is not None:
+            return failure
+
+        # 파일이 클수록 오래 걸리도록 MB당 지연을 더함
+        await asyncio.sleep(transcription_latency.sample() + size / (1024 * 1024) * args.transcription_ms_per_mb / 1000)
+        stats["transcription_bytes"] += size
+        if args.fixed_transcript:
+            return {"text": MOCK_TRANSCRIPT}
+        # 요청마다 다른 텍스트를 돌려줘야 레시피 캐시(전사 텍스트 기준)가 적중하지 않음
+        return {"text": f"{MOCK_TRANSCRIPT} (녹음 {uuid.uuid4().hex[:8]})"}
+
+    @app.get("/stats")
+    async def get_stats():
+        return dict(stats)
+
+    return app
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Mock OpenAI API server for load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--chat-latency", default="lognormal:1500:0.5",
+                        help="fixed:MS | uniform:MIN:MAX | lognormal:MEDIAN:SIGMA (ms)")
+    parser.add_argument("--transcription-latency", default="lognormal:3000:0.4")
+    parser.add_argument("--transcription-ms-per-mb", type=float, default=500.0,
+                        help="extra transcription latency per MB of audio")
+    parser.add_argument("--stream-chunk-chars", type=int, default=8)
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="probability of an injected error response")
+    parser.add_argument("--error-statuses", default="500,502,503",
+                        help="comma-separated status codes to inject")
+    parser.add_argument("--rpm", type=int, default=0, help="chat requests per minute (0 = unlimited)")
+    parser.add_argument("--tpm", type=int, default=0, help="chat tokens per minute (0 = unlimited)")
+    parser.add_argument("--transcription-rpm", type=int, default=0)
+    parser.add_argument("--fixed-transcript", action="store_true",
+                        help="return the same transcript for every request (exercises the recipe cache)")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    uvicorn.run(create_app(args), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
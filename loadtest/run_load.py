@@ -0,0 +1,309 @@
+"""
+가입 -> 업로드 -> STT -> 레시피 생성 전체 흐름 부하 테스트
+
+가상 사용자마다 가입/로그인 후 녹음 업로드부터 레시피 조회까지를 반복하고,
+엔드포인트별 처리량과 p50/p95/p99 지연 시간, 전체 흐름 소요 시간을 보고한다.
+업로드마다 내용을 다르게 만들어 전사/레시피 캐시가 아닌 실제 STT/GPT 경로를 재고,
+실행 전후 /metrics의 캐시 적중/미스 카운터 차이를 함께 보고한다.
+
+실행 (API 서버는 loadtest/mock_openai.py를 OPENAI_BASE_URL로 지정해 둔 상태):
+    python -m loadtest.run_load --base-url http://localhost:8000 --users 20 --iterations 5
+    python -m loadtest.run_load --flow pipeline --users 50 --json-out result.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import re
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+
+FLOW_LABEL = "flow upload->recipe"
+
+# momento_cache_hits_total{cache="transcript",tier="memory"} 12.0
+_CACHE_METRIC_RE = re.compile(r'^momento_cache_(hits|misses)_total\{(.*)\} (\S+)$')
+_LABEL_RE = re.compile(r'(\w+)="([^"]*)"')
+
+
+class Stats:
+    """엔드포인트별 지연 시간과 오류 수 집계"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.status_codes: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, label: str, seconds: float, ok: bool, status_code: Optional[int] = None):
+        self.latencies[label].append(seconds)
+        if not ok:
+            self.errors[label] += 1
+        if status_code is not None:
+            self.status_codes[label][status_code] += 1
+
+    def summary(self, elapsed: float) -> List[Dict[str, Any]]:
+        rows = []
+        for label in sorted(self.latencies):
+            values = sorted(self.latencies[label])
+            rows.append({
+                "endpoint": label,
+                "count": len(values),
+                "errors": self.errors[label],
+                "rps": round(len(values) / elapsed, 2) if elapsed > 0 else 0.0,
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p95_ms": round(percentile(values, 95) * 1000, 1),
+                "p99_ms": round(percentile(values, 99) * 1000, 1),
+                "max_ms": round(values[-1] * 1000, 1),
+                "status_codes": dict(self.status_codes[label])
+            })
+        return rows
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """nearest-rank 백분위수"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class LoadTestError(Exception):
+    """흐름을 더 진행할 수 없는 응답 (해당 반복은 실패로 집계)"""
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, stats: Stats, args: argparse.Namespace, audio: bytes, index: int):
+        self.client = client
+        self.stats = stats
+        self.args = args
+        self.audio = audio
+        self.index = index
+        self.headers: Dict[str, str] = {}
+
+    async def request(self, method: str, url: str, label: str, expected=(200,), **kwargs) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=self.headers, **kwargs)
+        except httpx.HTTPError as e:
+            self.stats.record(label, time.perf_counter() - start, False)
+            raise LoadTestError(f"{label}: {type(e).__name__}")
+
+        ok = response.status_code in expected
+        self.stats.record(label, time.perf_counter() - start, ok, response.status_code)
+        if not ok:
+            raise LoadTestError(f"{label}: HTTP {response.status_code} {response.text[:200]}")
+        return response
+
+    async def sign_in(self):
+        email = f"loadtest-{self.args.run_id}-{self.index}@example.com"
+        password = "loadtest-password"
+        await self.request(
+            "POST", "/auth/signup", "POST /auth/signup",
+            json={"email": email, "password": password, "full_name": f"Load Test {self.index}"}
+        )
+        response = await self.request(
+            "POST", "/auth/login", "POST /auth/login",
+            json={"email": email, "password": password}
+        )
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def wait_until(self, url: str, label: str, done) -> Dict[str, Any]:
+        """done(body)가 참이 될 때까지 폴링"""
+        give_up_at = time.monotonic() + self.args.process_timeout
+        while time.monotonic() < give_up_at:
+            body = (await self.request("GET", url, label)).json()
+            if done(body):
+                return body
+            await asyncio.sleep(self.args.poll_interval)
+        raise LoadTestError(f"{label}: timed out")
+
+    def unique_audio(self) -> bytes:
+        """업로드마다 content hash가 달라지도록 끝에 임의 바이트를 붙인 녹음"""
+        return self.audio + uuid.uuid4().bytes
+
+    async def run_classic_flow(self):
+        """업로드 -> STT 요청 -> 변환 완료 대기 -> 레시피 생성 -> 조회"""
+        files = {"file": ("recording.m4a", self.unique_audio(), "audio/mp4")}
+        audio = (await self.request("POST", "/audio/upload", "POST /audio/upload", files=files)).json()
+        audio_id = audio["id"]
+
+        await self.request(
+            "POST", "/audio/process", "POST /audio/process",
+            expected=(202,), json={"audio_id": audio_id}
+        )
+        transcript = await self.wait_until(
+            f"/audio/{audio_id}/transcript", "GET /audio/{id}/transcript",
+            lambda body: body["processing_status"] in ("completed", "failed")
+        )
+        if transcript["processing_status"] != "completed":
+            raise LoadTestError("transcription failed")
+
+        recipe = (await self.request(
+            "POST", "/recipes/", "POST /recipes/",
+            json={"source_audio_id": audio_id}
+        )).json()
+        await self.request("GET", f"/recipes/{recipe['id']}", "GET /recipes/{id}")
+
+    async def run_pipeline_flow(self):
+        """POST /pipeline 한 번으로 업로드 후 완료 대기 -> 레시피 조회"""
+        files = {"file": ("recording.m4a", self.unique_audio(), "audio/mp4")}
+        job = (await self.request(
+            "POST", "/pipeline/", "POST /pipeline/", expected=(202,), files=files
+        )).json()
+        job = await self.wait_until(
+            f"/pipeline/{job['id']}", "GET /pipeline/{id}",
+            lambda body: body["status"] == "failed" or body["stage"] == "done"
+        )
+        if job["status"] != "completed":
+            raise LoadTestError(f"pipeline failed: {job.get('error')}")
+        await self.request("GET", f"/recipes/{job['recipe_id']}", "GET /recipes/{id}")
+
+    async def run(self):
+        try:
+            await self.sign_in()
+        except LoadTestError as e:
+            print(f"user {self.index}: {e}")
+            return
+
+        flow = self.run_pipeline_flow if self.args.flow == "pipeline" else self.run_classic_flow
+        for _ in range(self.args.iterations):
+            start = time.perf_counter()
+            try:
+                await flow()
+                self.stats.record(FLOW_LABEL, time.perf_counter() - start, True)
+            except LoadTestError as e:
+                self.stats.record(FLOW_LABEL, time.perf_counter() - start, False)
+                print(f"user {self.index}: {e}")
+
+
+async def fetch_cache_counters(client: httpx.AsyncClient) -> Dict[Tuple[str, str], float]:
+    """
+    /metrics의 캐시 적중/미스 카운터 ((캐시, 종류) -> 값)
+
+    종류는 "memory", "durable" 적중 또는 "miss". 카운터는 응답한 서버 프로세스
+    하나의 값이므로 워커가 여러 개면 그중 하나의 표본이다. 읽지 못하면 빈 값.
+    """
+    try:
+        response = await client.get("/metrics")
+    except httpx.HTTPError:
+        return {}
+    if response.status_code != 200:
+        return {}
+
+    counters = {}
+    for line in response.text.splitlines():
+        match = _CACHE_METRIC_RE.match(line)
+        if not match:
+            continue
+        kind, labels, value = match.groups()
+        labels = dict(_LABEL_RE.findall(labels))
+        counters[(labels.get("cache", ""), labels.get("tier", "miss") if kind == "hits" else "miss")] = float(value)
+    return counters
+
+
+def cache_summary(before: Dict[Tuple[str, str], float], after: Dict[Tuple[str, str], float]) -> List[Dict[str, Any]]:
+    """실행 전후 카운터 차이를 캐시별로 정리"""
+    rows: Dict[str, Dict[str, Any]] = {}
+    for (cache, kind), value in after.items():
+        row = rows.setdefault(cache, {"cache": cache, "memory": 0, "durable": 0, "miss": 0})
+        row[kind] = int(value - before.get((cache, kind), 0.0))
+    for row in rows.values():
+        lookups = row["memory"] + row["durable"] + row["miss"]
+        row["hit_rate"] = round((row["memory"] + row["durable"]) / lookups, 4) if lookups else 0.0
+    return [rows[cache] for cache in sorted(rows)]
+
+
+def print_report(rows: List[Dict[str, Any]], elapsed: float):
+    print(f"\nelapsed {elapsed:.1f}s")
+    header = f"{'endpoint':<32} {'count':>7} {'errors':>7} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(
+            f"{row['endpoint']:<32} {row['count']:>7} {row['errors']:>7} {row['rps']:>8} "
+            f"{row['p50_ms']:>9} {row['p95_ms']:>9} {row['p99_ms']:>9} {row['max_ms']:>9}"
+        )
+
+
+def print_cache_report(rows: List[Dict[str, Any]]):
+    if not rows:
+        print("\ncache counters unavailable (GET /metrics failed)")
+        return
+    header = f"{'cache':<32} {'memory hits':>12} {'durable hits':>13} {'misses':>8} {'hit rate':>9}"
+    print()
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(f"{row['cache']:<32} {row['memory']:>12} {row['durable']:>13} {row['miss']:>8} {row['hit_rate']:>9}")
+
+
+async def run_load_test(args: argparse.Namespace) -> Dict[str, Any]:
+    if args.audio_file:
+        with open(args.audio_file, "rb") as f:
+            audio = f.read()
+    else:
+        # mock 서버는 내용을 해석하지 않으므로 크기만 맞춘 임의 바이트로 충분
+        audio = os.urandom(args.audio_bytes)
+
+    stats = Stats()
+    limits = httpx.Limits(max_connections=args.users * 2, max_keepalive_connections=args.users)
+    timeout = httpx.Timeout(args.request_timeout)
+
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=timeout) as client:
+        async def start_user(index: int):
+            # 사용자를 ramp-seconds 동안 고르게 나눠 시작
+            await asyncio.sleep(args.ramp_seconds * index / max(args.users, 1))
+            await VirtualUser(client, stats, args, audio, index).run()
+
+        counters_before = await fetch_cache_counters(client)
+        start = time.perf_counter()
+        await asyncio.gather(*(start_user(index) for index in range(args.users)))
+        elapsed = time.perf_counter() - start
+        counters_after = await fetch_cache_counters(client)
+
+    rows = stats.summary(elapsed)
+    caches = cache_summary(counters_before, counters_after)
+    print_report(rows, elapsed)
+    print_cache_report(caches)
+    return {
+        "run_id": args.run_id,
+        "flow": args.flow,
+        "users": args.users,
+        "iterations": args.iterations,
+        "elapsed_seconds": round(elapsed, 2),
+        "endpoints": rows,
+        "caches": caches
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="End-to-end load test for the MOMENTO API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--flow", choices=("classic", "pipeline"), default="classic",
+                        help="classic: upload/process/recipes endpoints, pipeline: POST /pipeline")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--iterations", type=int, default=3, help="flows per user")
+    parser.add_argument("--ramp-seconds", type=float, default=5.0)
+    parser.add_argument("--audio-file", help="audio file to upload (default: random bytes)")
+    parser.add_argument("--audio-bytes", type=int, default=512 * 1024)
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--process-timeout", type=float, default=300.0)
+    parser.add_argument("--request-timeout", type=float, default=120.0)
+    parser.add_argument("--run-id", default=uuid.uuid4().hex[:8], help="suffix for generated user emails")
+    parser.add_argument("--json-out", help="write the summary as JSON (for comparing releases)")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    result = asyncio.run(run_load_test(args))
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
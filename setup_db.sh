@@ -36,6 +36,11 @@ WHERE NOT EXISTS (SELECT FROM pg_database WHERE datname = 'momento')\gexec
 GRANT ALL PRIVILEGES ON DATABASE momento TO momento_user;
 ALTER DATABASE momento OWNER TO momento_user;
 
+-- 레시피 검색용 trigram 확장 (슈퍼유저 권한 필요)
+\c momento
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+\c postgres
+
 -- Display results
 \echo '✅ 데이터베이스 설정 완료!'
 \echo '📋 설정 정보:'
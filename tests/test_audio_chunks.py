@@ -0,0 +1,110 @@
+import pytest
+from app.services.audio_chunks import plan_chunks, stitch_transcripts
+
+
+def assert_covers(spans, duration, max_seconds):
+    assert spans[0][0] == 0.0
+    assert spans[-1][1] == duration
+    for (start, end), (next_start, next_end) in zip(spans, spans[1:]):
+        # 다음 구간은 앞 구간 끝 이전(겹침)에서 시작하되 앞으로 나아감
+        assert start < next_start <= end
+        assert next_end > end
+    assert all(end - start <= max_seconds for start, end in spans)
+
+
+def test_short_audio_is_a_single_chunk():
+    assert plan_chunks(500.0, [], 600.0, 900.0, 2.0) == [(0.0, 500.0)]
+
+
+def test_no_silence_forces_cuts_at_max_seconds():
+    spans = plan_chunks(2000.0, [], 600.0, 900.0, 0.0)
+
+    assert spans == [(0.0, 900.0), (900.0, 1800.0), (1800.0, 2000.0)]
+
+
+def test_forced_cuts_start_next_chunk_inside_overlap():
+    spans = plan_chunks(2000.0, [], 600.0, 900.0, 2.0)
+
+    assert spans[:2] == [(0.0, 900.0), (898.0, 1798.0)]
+    assert_covers(spans, 2000.0, 900.0)
+
+
+def test_cuts_at_silence_just_past_target():
+    spans = plan_chunks(1500.0, [(608.0, 612.0)], 600.0, 900.0, 2.0)
+
+    assert spans == [(0.0, 610.0), (608.0, 1500.0)]
+
+
+def test_prefers_silence_closest_to_target():
+    silences = [(400.0, 402.0), (590.0, 592.0), (700.0, 704.0)]
+
+    spans = plan_chunks(1200.0, silences, 600.0, 900.0, 0.0)
+
+    assert spans[0] == (0.0, 591.0)
+
+
+def test_ignores_silence_too_early_or_past_max():
+    # target/2(300초) 이전이나 max(900초) 이후의 무음은 후보가 아님
+    silences = [(100.0, 110.0), (950.0, 960.0)]
+
+    spans = plan_chunks(2000.0, silences, 600.0, 900.0, 0.0)
+
+    assert spans[0] == (0.0, 900.0)
+
+
+def test_many_silences_cover_whole_recording():
+    silences = [(t, t + 1.0) for t in range(37, 7200, 53)]
+
+    spans = plan_chunks(7200.0, silences, 600.0, 900.0, 2.0)
+
+    assert_covers(spans, 7200.0, 900.0)
+    assert len(spans) >= 8
+
+
+@pytest.mark.parametrize("overlap", [10.0, 30.0, 1000.0])
+def test_overlap_not_shorter_than_chunk_still_progresses(overlap):
+    spans = plan_chunks(100.0, [], 5.0, 10.0, overlap)
+
+    # 겹침이 구간 길이 이상이어도 매번 최소 1초씩 나아가 끝남
+    assert_covers(spans, 100.0, 10.0)
+    assert all(next_start - start >= 1.0 for (start, _), (next_start, _) in zip(spans, spans[1:]))
+
+
+def test_stitch_removes_duplicated_boundary_words():
+    texts = [
+        "김치를 넣고 같이 5분 정도 볶아",
+        "5분 정도 볶아. 물을 자작하게 붓고",
+        "붓고 고춧가루 한 숟가락"
+    ]
+
+    assert stitch_transcripts(texts) == "김치를 넣고 같이 5분 정도 볶아 물을 자작하게 붓고 고춧가루 한 숟가락"
+
+
+def test_stitch_keeps_text_without_overlap():
+    assert stitch_transcripts(["물을 붓고", "두부를 넣어"]) == "물을 붓고 두부를 넣어"
+
+
+def test_stitch_matches_ignoring_case_and_punctuation():
+    assert stitch_transcripts(["Add the Kimchi,", "kimchi and pork"]) == "Add the Kimchi, and pork"
+
+
+def test_stitch_skips_empty_chunk_texts():
+    texts = ["", "대파를 넣고", "   ", "", "넣고 한소끔 끓여", ""]
+
+    assert stitch_transcripts(texts) == "대파를 넣고 한소끔 끓여"
+
+
+def test_stitch_all_empty():
+    assert stitch_transcripts([]) == ""
+    assert stitch_transcripts(["", " "]) == ""
+
+
+def test_stitch_ignores_punctuation_only_overlap():
+    # 문장부호만 겹치는 경우는 중복으로 보지 않음
+    assert stitch_transcripts(["끓여 ...", "... 완성"]) == "끓여 ... ... 완성"
+
+
+def test_stitch_limits_overlap_search():
+    repeated = " ".join(["a"] * 5)
+
+    assert stitch_transcripts([repeated, repeated + " b"], max_overlap_words=3) == " ".join(["a"] * 7 + ["b"])
@@ -0,0 +1,60 @@
+import asyncio
+import dataclasses
+import uuid
+from types import SimpleNamespace
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from app.models import audio, cache, pipeline, rate_limit, recipe  # noqa: F401  (User 관계 대상 매퍼 등록)
+from app.models.user import User
+from app.utils.dependencies import CurrentUser, get_current_user, invalidate_user, user_cache
+from app.utils.security import create_access_token
+
+
+class FakeSession:
+    def __init__(self, user):
+        self.user = user
+        self.queries = 0
+
+    async def execute(self, query):
+        self.queries += 1
+        return SimpleNamespace(scalar_one_or_none=lambda: self.user)
+
+
+def _credentials(user_id) -> HTTPAuthorizationCredentials:
+    token = create_access_token({"sub": str(user_id)})
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def test_current_user_is_cached_as_immutable_snapshot():
+    user = User(id=uuid.uuid4(), email="cook@example.com", full_name="Cook", is_active=True)
+    db = FakeSession(user)
+    credentials = _credentials(user.id)
+
+    first = asyncio.run(get_current_user(credentials, db))
+    second = asyncio.run(get_current_user(credentials, db))
+
+    assert isinstance(first, CurrentUser)
+    assert first == CurrentUser(id=user.id, email="cook@example.com", full_name="Cook", is_active=True)
+    assert second is first
+    assert db.queries == 1
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first.is_active = False
+
+    # 캐시된 값은 ORM 객체와 분리되어 이후 변경의 영향을 받지 않음
+    user.is_active = False
+    assert second.is_active
+
+
+def test_invalidated_user_is_reloaded():
+    user = User(id=uuid.uuid4(), email="cook@example.com", full_name=None, is_active=True)
+    db = FakeSession(user)
+    credentials = _credentials(user.id)
+
+    asyncio.run(get_current_user(credentials, db))
+    user.is_active = False
+    invalidate_user(user.id)
+    reloaded = asyncio.run(get_current_user(credentials, db))
+
+    assert db.queries == 2
+    assert not reloaded.is_active
+    user_cache.invalidate(str(user.id))
@@ -0,0 +1,155 @@
+import asyncio
+import os
+from email.utils import formatdate
+import pytest
+from starlette.requests import Request
+from app.utils.file_response import is_not_modified, parse_range, serve_file, stat_etag
+
+ETAG = '"abc-10"'
+
+
+def make_request(**headers) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-99", (0, 99)),
+    ("bytes=100-", (100, 999)),
+    ("bytes=-500", (500, 999)),
+    ("bytes=-5000", (0, 999)),
+    ("bytes=900-5000", (900, 999)),
+    ("bytes=999-999", (999, 999)),
+    (" BYTES = 10 - 20 ", (10, 20)),
+])
+def test_parse_range_single(header, expected):
+    assert parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", [
+    "bytes=0-99,200-299",
+    "bytes=-100, 500-",
+    "items=0-10",
+    "bytes=abc-def",
+    "bytes=10",
+    "bytes=-",
+])
+def test_parse_range_ignores_multi_and_malformed(header):
+    assert parse_range(header, 1000) is None
+
+
+@pytest.mark.parametrize("header, size", [
+    ("bytes=1000-", 1000),
+    ("bytes=1000-2000", 1000),
+    ("bytes=50-10", 1000),
+    ("bytes=-0", 1000),
+    ("bytes=-10", 0),
+    ("bytes=0-", 0),
+])
+def test_parse_range_unsatisfiable(header, size):
+    with pytest.raises(ValueError):
+        parse_range(header, size)
+
+
+@pytest.mark.parametrize("header, expected", [
+    (ETAG, True),
+    (f"W/{ETAG}", True),
+    (f'"other", W/{ETAG}', True),
+    ("*", True),
+    ('"other"', False),
+    ('W/"other"', False),
+])
+def test_is_not_modified_if_none_match(header, expected):
+    assert is_not_modified(make_request(if_none_match=header), ETAG, 1_700_000_000) is expected
+
+
+def test_is_not_modified_if_modified_since():
+    mtime = 1_700_000_000.5
+
+    assert is_not_modified(make_request(if_modified_since=formatdate(mtime, usegmt=True)), ETAG, mtime)
+    assert not is_not_modified(make_request(if_modified_since=formatdate(mtime - 60, usegmt=True)), ETAG, mtime)
+    assert not is_not_modified(make_request(if_modified_since="not a date"), ETAG, mtime)
+    assert not is_not_modified(make_request(), ETAG, mtime)
+
+
+def test_is_not_modified_prefers_if_none_match():
+    mtime = 1_700_000_000
+    request = make_request(if_none_match='"other"', if_modified_since=formatdate(mtime + 60, usegmt=True))
+
+    assert not is_not_modified(request, ETAG, mtime)
+
+
+@pytest.fixture
+def audio_file(tmp_path):
+    path = tmp_path / "audio.mp3"
+    path.write_bytes(bytes(range(256)) * 4)
+    return path
+
+
+def serve(path, **headers):
+    etag = stat_etag(os.stat(path))
+    response = asyncio.run(serve_file(make_request(**headers), path, "audio/mpeg", etag, "private, max-age=60"))
+    return response, etag
+
+
+def test_serve_file_full(audio_file):
+    response, etag = serve(audio_file)
+
+    assert response.status_code == 200
+    assert response.body == audio_file.read_bytes()
+    assert response.headers["etag"] == etag
+    assert response.headers["accept-ranges"] == "bytes"
+    assert "content-range" not in response.headers
+
+
+def test_serve_file_suffix_range(audio_file):
+    response, _ = serve(audio_file, range="bytes=-500")
+
+    assert response.status_code == 206
+    assert response.headers["content-range"] == "bytes 524-1023/1024"
+    assert response.body == audio_file.read_bytes()[-500:]
+
+
+def test_serve_file_open_ended_range(audio_file):
+    response, _ = serve(audio_file, range="bytes=1000-")
+
+    assert response.status_code == 206
+    assert response.headers["content-range"] == "bytes 1000-1023/1024"
+    assert response.body == audio_file.read_bytes()[1000:]
+
+
+def test_serve_file_unsatisfiable_range(audio_file):
+    response, _ = serve(audio_file, range="bytes=2048-")
+
+    assert response.status_code == 416
+    assert response.headers["content-range"] == "bytes */1024"
+    assert response.body == b""
+
+
+def test_serve_file_multi_range_sends_full(audio_file):
+    response, _ = serve(audio_file, range="bytes=0-9,20-29")
+
+    assert response.status_code == 200
+    assert response.body == audio_file.read_bytes()
+
+
+def test_serve_file_if_range(audio_file):
+    etag = stat_etag(os.stat(audio_file))
+
+    matched, _ = serve(audio_file, range="bytes=0-9", if_range=etag)
+    assert matched.status_code == 206
+    assert matched.body == audio_file.read_bytes()[:10]
+
+    for stale in ('"stale"', f"W/{etag}"):
+        response, _ = serve(audio_file, range="bytes=0-9", if_range=stale)
+        assert response.status_code == 200
+        assert response.body == audio_file.read_bytes()
+
+
+def test_serve_file_not_modified(audio_file):
+    etag = stat_etag(os.stat(audio_file))
+
+    response, _ = serve(audio_file, if_none_match=f"W/{etag}", range="bytes=0-9")
+
+    assert response.status_code == 304
+    assert response.body == b""
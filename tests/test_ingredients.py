@@ -0,0 +1,161 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+import pytest
+from sqlalchemy import Column, DateTime, MetaData, String, Table, Uuid, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.models import audio, cache, pipeline, rate_limit, user  # noqa: F401  (관계 대상 매퍼 등록)
+from app.routers.recipes import find_recipes_by_ingredients
+from app.services.ingredients import (
+    build_ingredient_entries,
+    canonicalize_ingredient_name,
+    canonicalize_ingredient_names
+)
+from app.utils.dependencies import CurrentUser
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("마늘", "마늘"),
+    ("다진 마늘", "마늘"),
+    ("다진 마늘 (국산)", "마늘"),
+    ("삶은 데친 시금치", "시금치"),
+    ("돼지고기[목살] 200g", "돼지고기200g"),
+    ("Green  Onion", "greenonion"),
+    ("ＴＯＦＵ!", "tofu"),
+    ("다진", "다진"),  # 손질 방법만 있으면 그대로 둠
+    ("(선택)", None),
+    ("", None),
+])
+def test_canonicalize_ingredient_name(name, expected):
+    assert canonicalize_ingredient_name(name) == expected
+
+
+def test_canonicalize_ingredient_names_dedupes_in_order():
+    assert canonicalize_ingredient_names(["양파", "다진 마늘", "마늘 (국산)", "", "양파"]) == ["양파", "마늘"]
+
+
+def test_build_entries_dedupes_within_recipe():
+    user_id = uuid.uuid4()
+
+    entries = build_ingredient_entries(user_id, [
+        {"name": "다진 마늘", "amount": "1큰술"},
+        {"name": "마늘", "amount": "3쪽"},
+        {"name": "양파"}
+    ])
+
+    assert [(entry.canonical_name, entry.name, entry.amount) for entry in entries] == [
+        ("마늘", "다진 마늘", "1큰술"),
+        ("양파", "양파", None)
+    ]
+    assert all(entry.user_id == user_id for entry in entries)
+
+
+@pytest.mark.parametrize("amount, expected", [
+    ("200g", "200g"),
+    ("  1개 ", "1개"),
+    (200, "200"),
+    (0.5, "0.5"),
+    ("", None),
+    ("   ", None),
+    (None, None),
+])
+def test_build_entries_coerces_amount(amount, expected):
+    entries = build_ingredient_entries(uuid.uuid4(), [{"name": "두부", "amount": amount}])
+
+    assert entries[0].amount == expected
+
+
+def test_build_entries_skips_unusable_entries():
+    entries = build_ingredient_entries(uuid.uuid4(), [
+        "소금",
+        None,
+        {"amount": "1개"},
+        {"name": None},
+        {"name": 3},
+        {"name": "   "},
+        {"name": "(선택)"},
+        {"name": " 대파 ", "amount": "1대"}
+    ])
+
+    assert [(entry.name, entry.amount) for entry in entries] == [("대파", "1대")]
+
+
+def test_build_entries_handles_missing_ingredients():
+    assert build_ingredient_entries(uuid.uuid4(), None) == []
+    assert build_ingredient_entries(uuid.uuid4(), []) == []
+
+
+# 검색에 필요한 컬럼만 둔 SQLite 테이블 (recipes의 검색 컬럼/GIN 인덱스는 Postgres 전용)
+_metadata = MetaData()
+_recipes = Table(
+    "recipes", _metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("user_id", Uuid, nullable=False),
+    Column("title", String, nullable=False),
+    Column("category", String),
+    Column("image_url", String),
+    Column("created_at", DateTime(timezone=True))
+)
+Table(
+    "recipe_ingredients", _metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("recipe_id", Uuid, nullable=False),
+    Column("user_id", Uuid, nullable=False),
+    Column("canonical_name", String, nullable=False),
+    Column("name", String, nullable=False),
+    Column("amount", String)
+)
+
+
+def _search(recipes, other_user_recipes, query):
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(_metadata.create_all)
+
+            user_id, other_user_id = uuid.uuid4(), uuid.uuid4()
+            session_factory = async_sessionmaker(engine, expire_on_commit=False)
+            async with session_factory() as db:
+                for owner, owned in ((user_id, recipes), (other_user_id, other_user_recipes)):
+                    for title, names in owned.items():
+                        recipe_id = uuid.uuid4()
+                        await db.execute(insert(_recipes).values(
+                            id=recipe_id, user_id=owner, title=title, created_at=datetime.now(timezone.utc)
+                        ))
+                        for entry in build_ingredient_entries(owner, [{"name": name} for name in names]):
+                            entry.id = uuid.uuid4()
+                            entry.recipe_id = recipe_id
+                            db.add(entry)
+                await db.commit()
+
+                current_user = CurrentUser(id=user_id, email="cook@example.com", full_name=None, is_active=True)
+                return await find_recipes_by_ingredients(ingredients=query, limit=20, current_user=current_user, db=db)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(scenario())
+
+
+def test_find_by_ingredients_ranks_by_matched_then_missing():
+    recipes = {
+        "된장찌개": ["마늘", "양파", "대파"],  # 2개 일치, 1개 부족
+        "양파볶음": ["다진 마늘", "양파"],  # 2개 일치, 부족 없음
+        "불고기": ["마늘", "간장", "설탕", "소금"],  # 1개 일치, 3개 부족
+        "마늘구이": ["마늘", "소금"],  # 1개 일치, 1개 부족
+        "계란찜": ["계란", "소금"]  # 일치 없음
+    }
+    other_user_recipes = {"남의 양파마늘볶음": ["마늘", "양파"]}
+
+    matches = _search(recipes, other_user_recipes, ["마늘 (국산)", "양파"])
+
+    assert [match.title for match in matches] == ["양파볶음", "된장찌개", "마늘구이", "불고기"]
+    assert [(match.matched_count, match.total_count) for match in matches] == [(2, 2), (2, 3), (1, 2), (1, 4)]
+
+    stew = matches[1]
+    assert sorted(stew.matched_ingredients) == ["마늘", "양파"]
+    assert stew.missing_ingredients == ["대파"]
+
+
+def test_find_by_ingredients_without_matches_returns_empty():
+    assert _search({"계란찜": ["계란"]}, {}, ["양파"]) == []
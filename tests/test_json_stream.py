@@ -0,0 +1,146 @@
+import json
+import random
+import pytest
+from app.utils.json_stream import IncrementalJSONObjectParser
+
+RECIPE = {
+    "title": "김치찌개 \"엄마표\" {특제}",
+    "description": "역슬래시 \\ 와 줄바꿈\n, 유니코드 가 이스케이프",
+    "ingredients": [
+        {"name": "김치", "amount": "반 포기", "notes": "잘 익은 것 [중요]"},
+        {"name": "돼지고기", "amount": 200, "extra": {"cut": "목살", "tags": ["국산", "냉장"]}}
+    ],
+    "steps": [
+        {"step": 1, "instruction": "볶는다, 5분", "time": "5분"},
+        {"step": 2, "instruction": "끓인다 }]", "time": None}
+    ],
+    "tips": "",
+    "servings": 2,
+    "ratio": -0.5e1,
+    "spicy": True,
+    "difficulty": None
+}
+
+
+def expected_events(obj):
+    events = []
+    for key, value in obj.items():
+        if isinstance(value, list):
+            events.extend(("item", key, index, item) for index, item in enumerate(value))
+        events.append(("field", key, None, value))
+    return events
+
+
+def feed_all(pieces):
+    parser = IncrementalJSONObjectParser()
+    events = []
+    for piece in pieces:
+        events.extend(parser.feed(piece))
+    return parser, events
+
+
+def test_whole_document_in_one_feed():
+    parser, events = feed_all([json.dumps(RECIPE, ensure_ascii=False, indent=2)])
+
+    assert events == expected_events(RECIPE)
+    assert parser.done
+
+
+@pytest.mark.parametrize("ensure_ascii", [False, True])
+def test_split_at_every_offset(ensure_ascii):
+    # ensure_ascii=True면 한글이 \uXXXX 이스케이프가 되어 이스케이프 중간에서도 잘림
+    text = json.dumps(RECIPE, ensure_ascii=ensure_ascii)
+    expected = expected_events(RECIPE)
+
+    for offset in range(len(text) + 1):
+        _, events = feed_all([text[:offset], text[offset:]])
+        assert events == expected, f"split at {offset}: {text[max(offset - 5, 0):offset + 5]!r}"
+
+
+def test_one_character_at_a_time():
+    text = json.dumps(RECIPE, ensure_ascii=False, indent=2)
+
+    _, events = feed_all(list(text))
+
+    assert events == expected_events(RECIPE)
+
+
+def test_random_splits():
+    text = json.dumps(RECIPE, ensure_ascii=False)
+    rng = random.Random(20)
+
+    for _ in range(200):
+        cuts = sorted(rng.sample(range(1, len(text)), 8))
+        pieces = [text[start:end] for start, end in zip([0, *cuts], [*cuts, len(text)])]
+        _, events = feed_all(pieces)
+        assert events == expected_events(RECIPE)
+
+
+def test_events_are_emitted_as_soon_as_values_complete():
+    parser = IncrementalJSONObjectParser()
+
+    assert parser.feed('{"title": "김치') == []
+    assert parser.feed('찌개", "ingredients": [{"name": "김치"}') == [
+        ("field", "title", None, "김치찌개"),
+        ("item", "ingredients", 0, {"name": "김치"})
+    ]
+    assert parser.feed(', {"name": "두부"}') == [("item", "ingredients", 1, {"name": "두부"})]
+
+
+def test_escaped_quotes_and_braces_inside_strings():
+    text = r'{"title": "a \"quoted\" {brace} [bracket] \\", "steps": ["x } y", "\"]\""]}'
+
+    _, events = feed_all([text])
+
+    assert events == [
+        ("field", "title", None, 'a "quoted" {brace} [bracket] \\'),
+        ("item", "steps", 0, "x } y"),
+        ("item", "steps", 1, '"]"'),
+        ("field", "steps", None, ["x } y", '"]"'])
+    ]
+
+
+def test_nested_objects_inside_arrays_are_single_items():
+    value = [{"a": {"b": [1, {"c": "d"}]}}, [1, [2, 3]], "plain", 4]
+
+    _, events = feed_all([json.dumps({"items": value})])
+
+    assert events == expected_events({"items": value})
+
+
+@pytest.mark.parametrize("trailing", ["true", "false", "null", "42", "-1.5e3", '"text"'])
+def test_trailing_scalar_field(trailing):
+    text = f'{{"title": "t", "last": {trailing}   }}'
+
+    parser, events = feed_all([text[:-3], text[-3:]])
+
+    assert events == [("field", "title", None, "t"), ("field", "last", None, json.loads(trailing))]
+    assert parser.done
+
+
+def test_scalar_items_in_top_level_array():
+    text = '{"nums": [1, true, null, 2.5 ], "ok": false}'
+
+    _, events = feed_all(list(text))
+
+    assert events == expected_events({"nums": [1, True, None, 2.5], "ok": False})
+
+
+def test_leading_code_fence_is_ignored():
+    text = "```json\n" + json.dumps({"title": "찌개", "steps": ["끓인다"]}, ensure_ascii=False) + "\n```"
+
+    parser, events = feed_all([text[:4], text[4:12], text[12:]])
+
+    assert events == [
+        ("field", "title", None, "찌개"),
+        ("item", "steps", 0, "끓인다"),
+        ("field", "steps", None, ["끓인다"])
+    ]
+    assert parser.done
+
+
+def test_text_after_closing_brace_is_not_parsed():
+    parser, events = feed_all(['{"a": 1}', ' {"b": 2}'])
+
+    assert events == [("field", "a", None, 1)]
+    assert parser.done
@@ -0,0 +1,41 @@
+import io
+import re
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+from app.database import Base
+from app.models import audio, cache, pipeline, rate_limit, recipe, user  # noqa: F401  (메타데이터 등록)
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _offline_sql(*args) -> str:
+    buffer = io.StringIO()
+    config = Config(str(ROOT / "alembic.ini"), output_buffer=buffer)
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    getattr(command, args[0])(config, *args[1:], sql=True)
+    return buffer.getvalue()
+
+
+def test_migrations_create_every_model_table_and_index():
+    sql = _offline_sql("upgrade", "head")
+    created_tables = set(re.findall(r"CREATE TABLE (\w+)", sql))
+    created_indexes = set(re.findall(r"CREATE (?:UNIQUE )?INDEX (\w+)", sql))
+    added_columns = set(re.findall(r"ALTER TABLE (\w+) ADD COLUMN (\w+)", sql))
+
+    for table in Base.metadata.tables.values():
+        assert table.name in created_tables
+        for index in table.indexes:
+            assert index.name in created_indexes, index.name
+
+    assert "CREATE EXTENSION IF NOT EXISTS pg_trgm" in sql
+    assert sql.index("CREATE EXTENSION IF NOT EXISTS pg_trgm") < sql.index("gin_trgm_ops")
+    assert {("audio_files", "content_hash"), ("audio_files", "stt_backend"), ("recipes", "search_text")} <= added_columns
+    assert "part_offsets JSON NOT NULL" in sql
+
+
+def test_migrations_downgrade_to_base():
+    sql = _offline_sql("downgrade", "head:base")
+
+    for table in Base.metadata.tables.values():
+        assert f"DROP TABLE {table.name};" in sql
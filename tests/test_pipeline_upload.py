@@ -0,0 +1,138 @@
+import asyncio
+import hashlib
+import io
+import uuid
+from datetime import datetime, timezone
+import pytest
+from starlette.datastructures import Headers, UploadFile
+from app.models import audio, cache, rate_limit, recipe, user  # noqa: F401  (관계 대상 매퍼 등록)
+from app.routers import pipeline as pipeline_router
+from app.services import storage
+from app.services.object_storage import LocalStorage
+from app.utils.dependencies import CurrentUser
+
+AUDIO = b"ID3" + bytes(range(256)) * 64
+
+
+def make_upload(data: bytes = AUDIO) -> UploadFile:
+    return UploadFile(
+        file=io.BytesIO(data),
+        filename="memo.mp3",
+        headers=Headers({"content-type": "audio/mpeg"}),
+        size=len(data)
+    )
+
+
+@pytest.fixture
+def local_storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "UPLOAD_DIR", tmp_path / "audio")
+    monkeypatch.setattr(storage, "STAGING_DIR", tmp_path / "tmp")
+    backend = LocalStorage(tmp_path)
+    monkeypatch.setattr(storage, "get_storage", lambda: backend)
+    return tmp_path
+
+
+def test_save_uploaded_file_stages_hashes_and_stores(local_storage):
+    key, file_name, file_size, content_hash = asyncio.run(storage.save_uploaded_file(make_upload(), "user-1"))
+
+    assert key.startswith("audio/user-1_") and key.endswith(".mp3")
+    assert file_name == "memo.mp3"
+    assert file_size == len(AUDIO)
+    assert content_hash == hashlib.sha256(AUDIO).hexdigest()
+    assert (local_storage / key).read_bytes() == AUDIO
+    assert list((local_storage / "tmp").iterdir()) == []
+
+
+def test_stage_rejects_oversized_upload_and_cleans_up(local_storage, monkeypatch):
+    monkeypatch.setattr(storage.settings, "max_audio_upload_bytes", 100)
+    upload = make_upload()
+    upload.size = None  # 크기를 모르는 스트리밍 업로드
+
+    with pytest.raises(storage.FileTooLargeError):
+        asyncio.run(storage.stage_uploaded_file(upload))
+
+    assert list((local_storage / "tmp").iterdir()) == []
+
+
+class FakeSession:
+    """start_pipeline이 쓰는 add/flush/refresh만 흉내 낸 세션"""
+
+    def __init__(self):
+        self.added = []
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def flush(self):
+        for obj in self.added:
+            obj.id = obj.id or uuid.uuid4()
+
+    async def refresh(self, obj):
+        obj.created_at = datetime.now(timezone.utc)
+
+
+@pytest.fixture
+def pipeline_env(local_storage, monkeypatch):
+    slots = asyncio.Semaphore(1)
+    monkeypatch.setattr(pipeline_router, "upload_slots", lambda: slots)
+
+    async def enqueue(db, audio_file, stt_backend):
+        await db.flush()
+
+    monkeypatch.setattr(pipeline_router, "enqueue_transcription", enqueue)
+    return slots
+
+
+def _start(db):
+    current_user = CurrentUser(id=uuid.uuid4(), email="cook@example.com", full_name=None, is_active=True)
+    return pipeline_router.start_pipeline(
+        file=make_upload(), stt_backend=None, force_regenerate=False, current_user=current_user, db=db
+    )
+
+
+def test_start_pipeline_receives_body_without_upload_slot(pipeline_env, local_storage, monkeypatch):
+    staged = asyncio.Event()
+    real_stage = pipeline_router.stage_uploaded_file
+
+    async def stage(file):
+        result = await real_stage(file)
+        staged.set()
+        return result
+
+    monkeypatch.setattr(pipeline_router, "stage_uploaded_file", stage)
+
+    async def scenario():
+        db = FakeSession()
+        async with pipeline_env:
+            # 슬롯이 모두 차 있어도 본문 수신은 끝나고, 저장소 업로드는 슬롯을 기다림
+            task = asyncio.create_task(_start(db))
+            await asyncio.wait_for(staged.wait(), timeout=5)
+            await asyncio.sleep(0.05)
+            assert not task.done()
+            assert list((local_storage / "audio").glob("*")) == []
+        return await asyncio.wait_for(task, timeout=5), db
+
+    response, db = asyncio.run(scenario())
+
+    audio_file = db.added[0]
+    assert response.audio_id == str(audio_file.id)
+    assert audio_file.file_size == len(AUDIO)
+    assert (local_storage / audio_file.file_path).read_bytes() == AUDIO
+    assert {"upload_receive", "upload_wait", "upload"} <= set(response.timings)
+    assert response.timings["upload_wait"] >= 0.05
+
+
+def test_start_pipeline_cancelled_while_waiting_removes_staged_file(pipeline_env, local_storage):
+    async def scenario():
+        async with pipeline_env:
+            task = asyncio.create_task(_start(FakeSession()))
+            while not list((local_storage / "tmp").glob("*.part")):
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+    asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+
+    assert list((local_storage / "tmp").iterdir()) == []
@@ -0,0 +1,200 @@
+import asyncio
+import pytest
+from app.services import rate_limiter
+from app.services.rate_limiter import (
+    BATCH,
+    INTERACTIVE,
+    LocalRateStore,
+    RateLimiter,
+    _BucketState,
+    _take,
+    batch_priority,
+    openai_rate_limit
+)
+
+
+class GatedStore:
+    """열기 전까지는 한도가 없다고 답하고, 배정/반환 순서를 기록하는 저장소"""
+
+    def __init__(self):
+        self.open = False
+        self.refunds = []
+
+    async def take(self, name, rpm, tpm, cost, reserve_ratio):
+        return 0.0 if self.open else 0.01
+
+    async def refund(self, name, rpm, tpm, tokens, requests=0):
+        self.refunds.append((tokens, requests))
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = GatedStore()
+    monkeypatch.setattr(rate_limiter, "_store", store)
+    return store
+
+
+def test_take_deducts_request_and_tokens():
+    state = _BucketState(requests=10.0, tokens=1000.0, updated=0.0)
+
+    assert _take(state, 0.0, rpm=10, tpm=1000, cost=300, reserve_ratio=0.0) == 0.0
+    assert state.requests == 9.0
+    assert state.tokens == 700.0
+
+
+def test_take_waits_for_tokens_to_refill():
+    state = _BucketState(requests=10.0, tokens=100.0, updated=0.0)
+
+    wait = _take(state, 0.0, rpm=10, tpm=600, cost=400, reserve_ratio=0.0)
+
+    # 300토큰 부족, 분당 600토큰이면 30초
+    assert wait == pytest.approx(30.0)
+    assert state.tokens == 100.0
+
+
+def test_take_refills_by_elapsed_time_up_to_capacity():
+    state = _BucketState(requests=0.0, tokens=0.0, updated=0.0)
+
+    assert _take(state, 30.0, rpm=60, tpm=600, cost=100, reserve_ratio=0.0) == 0.0
+    assert state.requests == pytest.approx(29.0)
+    assert state.tokens == pytest.approx(200.0)
+
+    # 오래 지나도 버킷 크기 이상으로는 차지 않음
+    assert _take(state, 10_000.0, rpm=60, tpm=600, cost=0, reserve_ratio=0.0) == 0.0
+    assert state.requests == pytest.approx(59.0)
+    assert state.tokens == pytest.approx(600.0)
+
+
+def test_take_keeps_reserve_for_batch_priority():
+    state = _BucketState(requests=5.0, tokens=1000.0, updated=0.0)
+
+    # 요청 10개 중 50%는 대화형 몫이므로 배치는 6개 이상 남아 있어야 가져감
+    wait = _take(state, 0.0, rpm=10, tpm=1000, cost=100, reserve_ratio=0.5)
+    assert wait > 0
+    assert state.requests == 5.0
+
+    # 같은 상태에서 대화형(reserve 0)은 바로 통과
+    assert _take(state, 0.0, rpm=10, tpm=1000, cost=100, reserve_ratio=0.0) == 0.0
+
+
+def test_take_clamps_oversize_cost_to_bucket():
+    state = _BucketState(requests=10.0, tokens=1000.0, updated=0.0)
+
+    # 한도보다 큰 요청도 버킷이 가득 차면 통과 (영원히 기다리지 않음)
+    assert _take(state, 0.0, rpm=10, tpm=1000, cost=50_000, reserve_ratio=0.0) == 0.0
+    assert state.tokens == 0.0
+
+    state = _BucketState(requests=10.0, tokens=1000.0, updated=0.0)
+    assert _take(state, 0.0, rpm=10, tpm=1000, cost=50_000, reserve_ratio=0.2) == 0.0
+    assert state.tokens == pytest.approx(200.0)
+
+
+def test_local_store_refund_returns_requests_and_tokens():
+    async def scenario():
+        store = LocalRateStore()
+        await store.take("chat", 10, 1000, 400, 0.0)
+        await store.refund("chat", 10, 1000, tokens=400, requests=1)
+        return store._states["chat"]
+
+    state = asyncio.run(scenario())
+    assert state.requests == pytest.approx(10.0, abs=0.01)
+    assert state.tokens == pytest.approx(1000.0, abs=1)
+
+
+def test_interactive_waiters_are_granted_before_batch(store):
+    async def scenario():
+        limiter = RateLimiter("test", rpm=10)
+        order = []
+
+        async def wait(label, priority):
+            await limiter.acquire(1, priority)
+            order.append(label)
+
+        tasks = [asyncio.create_task(wait("batch-1", BATCH))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(wait("batch-2", BATCH)))
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(wait("interactive", INTERACTIVE)))
+        await asyncio.sleep(0.05)
+
+        store.open = True
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(scenario()) == ["interactive", "batch-1", "batch-2"]
+
+
+def test_batch_priority_context_marks_calls(store, monkeypatch):
+    async def scenario():
+        limiter = RateLimiter("chat", rpm=10)
+        monkeypatch.setitem(rate_limiter._limiters, "chat", limiter)
+        seen = []
+        original = limiter.acquire
+
+        async def acquire(cost, priority=INTERACTIVE):
+            seen.append(priority)
+            await original(cost, priority)
+
+        limiter.acquire = acquire
+        store.open = True
+        async with openai_rate_limit("chat"):
+            pass
+        with batch_priority():
+            async with openai_rate_limit("chat"):
+                pass
+        return seen
+
+    assert asyncio.run(scenario()) == [INTERACTIVE, BATCH]
+
+
+def _run_with_limiter(store, monkeypatch, body):
+    async def scenario():
+        limiter = RateLimiter("chat", rpm=10, tpm=10_000)
+        monkeypatch.setitem(rate_limiter._limiters, "chat", limiter)
+        store.open = True
+        await body()
+
+    asyncio.run(scenario())
+
+
+def test_refunds_unused_reservation_after_success(store, monkeypatch):
+    class Usage:
+        total_tokens = 300
+
+    async def body():
+        async with openai_rate_limit("chat", 1000) as slot:
+            slot.record_usage(Usage())
+
+    _run_with_limiter(store, monkeypatch, body)
+    assert store.refunds == [(700, 0)]
+
+
+def test_refunds_reservation_when_call_fails(store, monkeypatch):
+    async def body():
+        with pytest.raises(RuntimeError):
+            async with openai_rate_limit("chat", 1000):
+                raise RuntimeError("upstream failed")
+
+    _run_with_limiter(store, monkeypatch, body)
+    assert store.refunds == [(1000, 0)]
+
+
+def test_cancelled_after_grant_returns_request_and_tokens(monkeypatch):
+    class CancellingStore(GatedStore):
+        async def take(self, name, rpm, tpm, cost, reserve_ratio):
+            # 차감하는 사이에 대기하던 요청이 취소된 상황
+            future.cancel()
+            return 0.0
+
+    async def scenario():
+        nonlocal future
+        limiter = RateLimiter("test", rpm=10, tpm=1000)
+        future = asyncio.get_running_loop().create_future()
+        limiter._waiters.append((0, 0, 250, future))
+        await limiter._dispatch()
+
+    future = None
+    cancelling = CancellingStore()
+    monkeypatch.setattr(rate_limiter, "_store", cancelling)
+    asyncio.run(scenario())
+    assert cancelling.refunds == [(250, 1)]
@@ -0,0 +1,247 @@
+import asyncio
+import time
+import httpx
+import openai
+import pytest
+from app.config import settings
+from app.services import resilience
+from app.services.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    _backoff_delay,
+    call_openai,
+    hedged
+)
+
+_REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def status_error(cls, status_code: int, headers=None):
+    response = httpx.Response(status_code, request=_REQUEST, headers=headers or {})
+    return cls(f"HTTP {status_code}", response=response, body=None)
+
+
+def connection_error():
+    return openai.APIConnectionError(request=_REQUEST)
+
+
+class FakeAttempt:
+    """정해 둔 순서대로 오류를 내거나 결과를 돌려주는 attempt(timeout)"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.timeouts = []
+
+    async def __call__(self, timeout: float):
+        self.timeouts.append(timeout)
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    @property
+    def calls(self) -> int:
+        return len(self.timeouts)
+
+
+@pytest.fixture(autouse=True)
+def policy(monkeypatch):
+    monkeypatch.setattr(settings, "openai_chat_timeout_seconds", 1.0)
+    monkeypatch.setattr(settings, "openai_chat_deadline_seconds", 2.0)
+    monkeypatch.setattr(settings, "openai_max_retries", 3)
+    monkeypatch.setattr(settings, "openai_retry_base_seconds", 0.01)
+    monkeypatch.setattr(settings, "openai_retry_max_seconds", 0.05)
+    monkeypatch.setattr(settings, "openai_circuit_failure_threshold", 3)
+    monkeypatch.setattr(settings, "openai_circuit_reset_seconds", 0.1)
+    breaker = CircuitBreaker("chat")
+    monkeypatch.setitem(resilience._breakers, "chat", breaker)
+    return breaker
+
+
+@pytest.mark.parametrize("error", [
+    status_error(openai.RateLimitError, 429),
+    status_error(openai.InternalServerError, 503),
+    connection_error(),
+])
+def test_retryable_errors_are_retried(error):
+    attempt = FakeAttempt(error, "ok")
+
+    assert asyncio.run(call_openai("op", "chat", attempt)) == "ok"
+    assert attempt.calls == 2
+
+
+def test_client_errors_are_not_retried_and_close_breaker(policy):
+    policy.failures = 2
+    error = status_error(openai.BadRequestError, 400)
+    attempt = FakeAttempt(error)
+
+    with pytest.raises(openai.BadRequestError):
+        asyncio.run(call_openai("op", "chat", attempt))
+    assert attempt.calls == 1
+    assert policy.failures == 0
+
+
+def test_other_errors_propagate_without_touching_breaker(policy):
+    policy.failures = 2
+    attempt = FakeAttempt(ValueError("local bug"))
+
+    with pytest.raises(ValueError):
+        asyncio.run(call_openai("op", "chat", attempt))
+    assert attempt.calls == 1
+    assert policy.failures == 2
+
+
+def test_gives_up_after_max_retries(monkeypatch):
+    monkeypatch.setattr(settings, "openai_max_retries", 2)
+    monkeypatch.setattr(settings, "openai_circuit_failure_threshold", 100)
+    attempt = FakeAttempt(connection_error())
+
+    with pytest.raises(openai.APIConnectionError):
+        asyncio.run(call_openai("op", "chat", attempt))
+    assert attempt.calls == 3
+
+
+def test_retry_after_header_is_honoured_and_capped():
+    error = status_error(openai.RateLimitError, 429, {"retry-after-ms": "30"})
+    assert _backoff_delay(0, error) == pytest.approx(0.03)
+
+    error = status_error(openai.RateLimitError, 429, {"retry-after": "60"})
+    assert _backoff_delay(0, error) == settings.openai_retry_max_seconds
+
+
+def test_retry_after_past_deadline_raises_without_waiting(monkeypatch):
+    monkeypatch.setattr(settings, "openai_retry_max_seconds", 30.0)
+    error = status_error(openai.RateLimitError, 429, {"retry-after": "10"})
+    attempt = FakeAttempt(error, "ok")
+
+    start = time.monotonic()
+    with pytest.raises(openai.RateLimitError):
+        asyncio.run(call_openai("op", "chat", attempt))
+    assert attempt.calls == 1
+    assert time.monotonic() - start < 1.0
+
+
+def test_deadline_bounds_retries_and_attempt_timeouts(monkeypatch):
+    monkeypatch.setattr(settings, "openai_chat_deadline_seconds", 0.3)
+    monkeypatch.setattr(settings, "openai_max_retries", 1000)
+    monkeypatch.setattr(settings, "openai_circuit_failure_threshold", 1000)
+
+    async def slow_failure(timeout: float):
+        slow_failure.timeouts.append(timeout)
+        await asyncio.sleep(0.02)
+        raise connection_error()
+
+    slow_failure.timeouts = []
+
+    start = time.monotonic()
+    with pytest.raises(openai.APIConnectionError):
+        asyncio.run(call_openai("op", "chat", slow_failure))
+
+    assert time.monotonic() - start < 0.5
+    assert len(slow_failure.timeouts) > 1
+    # 각 시도의 제한 시간은 남은 전체 제한 시간을 넘지 않음
+    assert all(timeout <= 0.3 for timeout in slow_failure.timeouts)
+    assert slow_failure.timeouts == sorted(slow_failure.timeouts, reverse=True)
+
+
+def test_breaker_opening_stops_retries(policy):
+    attempt = FakeAttempt(connection_error())
+
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(call_openai("op", "chat", attempt))
+    # 임계값(3)만큼 실패하면 남은 재시도는 보내지 않음
+    assert attempt.calls == 3
+    assert policy.state == "open"
+
+
+def test_breaker_opens_after_consecutive_failures(policy):
+    attempt = FakeAttempt(connection_error())
+    for _ in range(3):
+        policy.before_call()
+        policy.record_failure()
+
+    assert policy.state == "open"
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(call_openai("op", "chat", attempt))
+    assert attempt.calls == 0
+
+
+def test_breaker_half_open_probe_success_closes(policy):
+    for _ in range(3):
+        policy.record_failure()
+    time.sleep(0.11)
+
+    policy.before_call()
+    assert policy.state == "half_open"
+    # 시험 호출이 끝나기 전의 다른 호출은 거절
+    with pytest.raises(CircuitOpenError):
+        policy.before_call()
+
+    policy.record_success()
+    assert policy.state == "closed"
+    policy.before_call()
+
+
+def test_breaker_half_open_probe_failure_reopens(policy):
+    for _ in range(3):
+        policy.record_failure()
+    time.sleep(0.11)
+
+    attempt = FakeAttempt(connection_error())
+    # 시험 호출이 실패하면 다시 열려 재시도도 거절됨
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(call_openai("op", "chat", attempt))
+
+    assert attempt.calls == 1
+    assert policy.state == "open"
+    with pytest.raises(CircuitOpenError):
+        policy.before_call()
+
+
+def test_hedge_winner_cancels_slow_primary():
+    started = []
+    cancelled = []
+
+    async def call():
+        index = len(started)
+        started.append(index)
+        try:
+            await asyncio.sleep(1.0 if index == 0 else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(index)
+            raise
+        return f"response-{index}"
+
+    async def scenario():
+        result = await hedged("op", call, hedge_after=0.05)
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(scenario()) == "response-1"
+    assert started == [0, 1]
+    assert cancelled == [0]
+
+
+def test_hedge_not_launched_when_primary_is_fast():
+    calls = []
+
+    async def call():
+        calls.append(1)
+        return "fast"
+
+    assert asyncio.run(hedged("op", call, hedge_after=0.05)) == "fast"
+    assert len(calls) == 1
+
+
+def test_hedge_both_failing_raises_primary_error():
+    started = []
+
+    async def call():
+        index = len(started)
+        started.append(index)
+        await asyncio.sleep(0.1 if index == 0 else 0.0)
+        raise ValueError(f"failure-{index}")
+
+    with pytest.raises(ValueError, match="failure-0"):
+        asyncio.run(hedged("op", call, hedge_after=0.05))
+    assert started == [0, 1]
@@ -0,0 +1,72 @@
+import asyncio
+from types import SimpleNamespace
+import bcrypt
+from app.config import settings
+from app.routers.auth import login_for_access_token
+from app.schemas.auth import UserLogin
+from app.utils.security import verify_and_update_password
+
+PASSWORD = "correct horse battery staple"
+
+
+def _bcrypt_hash(rounds: int) -> str:
+    return bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds)).decode()
+
+
+def _cost(hashed: str) -> int:
+    return int(hashed.split("$")[2])
+
+
+class FakeSession:
+    """로그인 핸들러가 쓰는 execute/commit만 흉내 낸 세션"""
+
+    def __init__(self, user):
+        self.user = user
+        self.commits = 0
+
+    async def execute(self, query):
+        return SimpleNamespace(scalar_one_or_none=lambda: self.user)
+
+    async def commit(self):
+        self.commits += 1
+
+
+def test_lower_cost_hash_is_rehashed_at_configured_cost():
+    verified, new_hash = asyncio.run(verify_and_update_password(PASSWORD, _bcrypt_hash(4)))
+
+    assert verified
+    assert new_hash is not None
+    assert _cost(new_hash) == settings.bcrypt_rounds
+
+
+def test_higher_cost_hash_is_rehashed_at_configured_cost():
+    verified, new_hash = asyncio.run(verify_and_update_password(PASSWORD, _bcrypt_hash(settings.bcrypt_rounds + 1)))
+
+    assert verified
+    assert _cost(new_hash) == settings.bcrypt_rounds
+
+
+def test_current_cost_hash_is_kept():
+    verified, new_hash = asyncio.run(verify_and_update_password(PASSWORD, _bcrypt_hash(settings.bcrypt_rounds)))
+
+    assert verified
+    assert new_hash is None
+
+
+def test_wrong_password_is_not_rehashed():
+    verified, new_hash = asyncio.run(verify_and_update_password("wrong", _bcrypt_hash(4)))
+
+    assert not verified
+    assert new_hash is None
+
+
+def test_login_stores_hash_at_configured_cost():
+    user = SimpleNamespace(id="user-1", password_hash=_bcrypt_hash(4))
+    db = FakeSession(user)
+
+    token = asyncio.run(login_for_access_token(UserLogin(email="cook@example.com", password=PASSWORD), db))
+
+    assert token["access_token"]
+    assert db.commits == 1
+    assert _cost(user.password_hash) == settings.bcrypt_rounds
+    assert bcrypt.checkpw(PASSWORD.encode(), user.password_hash.encode())